@@ -7,6 +7,9 @@ class Serializable(ABC):
         in Tournament Manager Project
     """
 
+    # subclasses may declare __slots__ (with '_dirty') to save memory
+    __slots__ = ()
+
     @abstractmethod
     def serialize(self):
         """This method return a serialized instance of the object
@@ -20,7 +23,16 @@ class Serializable(ABC):
 
                 ::param serialized_instance (a dict of string)
                 ::param player_list to pick players instances
-                        (using id_in_db attributes)
+                        (using player_id attributes)
                         instead of recreate them
                 ::return a new instance of the object"""
         pass
+
+    def is_dirty(self) -> bool:
+        """:return True if the object has been modified since last save
+        (a new object is always dirty)"""
+        return self._dirty
+
+    def set_dirty(self, dirty: bool = True):
+        """flag the object as modified (or saved if dirty is False)"""
+        self._dirty = dirty
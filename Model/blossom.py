@@ -0,0 +1,418 @@
+"""Maximum weight matching in a general graph
+
+Edmonds' blossom algorithm with dual variables in O(n^3), after the
+classic implementation by Joris van Rantwijk (mwmatching). Weights must
+be integers so that every computation stays exact.
+"""
+
+
+def max_weight_matching(edges: list, max_cardinality: bool = False):
+    """Compute a maximum weight matching of an undirected graph
+
+    :param edges: a list of (i, j, weight) tuples, vertices are the
+                  integers 0..n-1 and weight an int
+    :param max_cardinality: if True, only maximum cardinality matchings
+                            are considered (heaviest of the largest)
+
+    :return a list mate where mate[i] is the vertex matched with i,
+            or -1 if i is single
+    """
+    if not edges:
+        return []
+
+    nb_edges = len(edges)
+    nb_vertices = 0
+    for (i, j, weight) in edges:
+        nb_vertices = max(nb_vertices, i + 1, j + 1)
+
+    max_weight = max(0, max(weight for (i, j, weight) in edges))
+
+    # endpoint[p] is the vertex to which endpoint p is attached,
+    # edge k has endpoints 2k (vertex i) and 2k+1 (vertex j)
+    endpoint = [edges[p // 2][p % 2] for p in range(2 * nb_edges)]
+
+    # neighbend[v] is the list of remote endpoints of the edges of v
+    neighbend = [[] for _ in range(nb_vertices)]
+    for k, (i, j, weight) in enumerate(edges):
+        neighbend[i].append(2 * k + 1)
+        neighbend[j].append(2 * k)
+
+    # mate[v] is the remote endpoint of the matched edge of v, or -1
+    mate = nb_vertices * [-1]
+
+    # label of top-level blossoms: 0 free, 1 S-vertex, 2 T-vertex
+    label = (2 * nb_vertices) * [0]
+    # endpoint through which the (blossom of the) vertex got its label
+    labelend = (2 * nb_vertices) * [-1]
+    # top-level blossom of each vertex
+    inblossom = list(range(nb_vertices))
+    blossomparent = (2 * nb_vertices) * [-1]
+    blossomchilds = (2 * nb_vertices) * [None]
+    blossombase = list(range(nb_vertices)) + nb_vertices * [-1]
+    blossomendps = (2 * nb_vertices) * [None]
+    # least-slack edge to a different S-blossom
+    bestedge = (2 * nb_vertices) * [-1]
+    blossombestedges = (2 * nb_vertices) * [None]
+    unusedblossoms = list(range(nb_vertices, 2 * nb_vertices))
+
+    # dual variables of vertices then of non-trivial blossoms
+    dualvar = nb_vertices * [max_weight] + nb_vertices * [0]
+    # allowedge[k] is True if edge k has zero slack
+    allowedge = nb_edges * [False]
+    queue = []
+
+    def slack(k):
+        (i, j, weight) = edges[k]
+        return dualvar[i] + dualvar[j] - 2 * weight
+
+    def blossom_leaves(b):
+        if b < nb_vertices:
+            yield b
+        else:
+            for child in blossomchilds[b]:
+                if child < nb_vertices:
+                    yield child
+                else:
+                    yield from blossom_leaves(child)
+
+    def assign_label(w, t, p):
+        """label vertex w (and its blossom) with t through endpoint p"""
+        b = inblossom[w]
+        label[w] = label[b] = t
+        labelend[w] = labelend[b] = p
+        bestedge[w] = bestedge[b] = -1
+        if t == 1:
+            queue.extend(blossom_leaves(b))
+        elif t == 2:
+            base = blossombase[b]
+            assign_label(endpoint[mate[base]], 1, mate[base] ^ 1)
+
+    def scan_blossom(v, w):
+        """trace back from v and w to find a new blossom or an
+        augmenting path, return the base of the blossom or -1"""
+        path = []
+        base = -1
+        while v != -1 or w != -1:
+            b = inblossom[v]
+            if label[b] & 4:
+                base = blossombase[b]
+                break
+            path.append(b)
+            label[b] = 5
+            if labelend[b] == -1:
+                v = -1
+            else:
+                v = endpoint[labelend[b]]
+                b = inblossom[v]
+                v = endpoint[labelend[b]]
+            if w != -1:
+                v, w = w, v
+        for b in path:
+            label[b] = 1
+        return base
+
+    def add_blossom(base, k):
+        """create a new top-level blossom with edge k and given base"""
+        (v, w, weight) = edges[k]
+        bb = inblossom[base]
+        bv = inblossom[v]
+        bw = inblossom[w]
+        b = unusedblossoms.pop()
+        blossombase[b] = base
+        blossomparent[b] = -1
+        blossomparent[bb] = b
+        blossomchilds[b] = path = []
+        blossomendps[b] = endps = []
+        while bv != bb:
+            blossomparent[bv] = b
+            path.append(bv)
+            endps.append(labelend[bv])
+            v = endpoint[labelend[bv]]
+            bv = inblossom[v]
+        path.append(bb)
+        path.reverse()
+        endps.reverse()
+        endps.append(2 * k)
+        while bw != bb:
+            blossomparent[bw] = b
+            path.append(bw)
+            endps.append(labelend[bw] ^ 1)
+            w = endpoint[labelend[bw]]
+            bw = inblossom[w]
+        label[b] = 1
+        labelend[b] = labelend[bb]
+        dualvar[b] = 0
+        for v in blossom_leaves(b):
+            if label[inblossom[v]] == 2:
+                queue.append(v)
+            inblossom[v] = b
+
+        # compute the least-slack edges to other S-blossoms
+        bestedgeto = (2 * nb_vertices) * [-1]
+        for bv in path:
+            if blossombestedges[bv] is None:
+                neighbour_lists = [[p // 2 for p in neighbend[v]]
+                                   for v in blossom_leaves(bv)]
+            else:
+                neighbour_lists = [blossombestedges[bv]]
+            for neighbour_list in neighbour_lists:
+                for k in neighbour_list:
+                    (i, j, weight) = edges[k]
+                    if inblossom[j] == b:
+                        i, j = j, i
+                    bj = inblossom[j]
+                    if bj != b and label[bj] == 1 and \
+                            (bestedgeto[bj] == -1
+                             or slack(k) < slack(bestedgeto[bj])):
+                        bestedgeto[bj] = k
+            blossombestedges[bv] = None
+            bestedge[bv] = -1
+        blossombestedges[b] = [k for k in bestedgeto if k != -1]
+        bestedge[b] = -1
+        for k in blossombestedges[b]:
+            if bestedge[b] == -1 or slack(k) < slack(bestedge[b]):
+                bestedge[b] = k
+
+    def expand_blossom(b, endstage):
+        """expand the top-level blossom b"""
+        for child in blossomchilds[b]:
+            blossomparent[child] = -1
+            if child < nb_vertices:
+                inblossom[child] = child
+            elif endstage and dualvar[child] == 0:
+                expand_blossom(child, endstage)
+            else:
+                for v in blossom_leaves(child):
+                    inblossom[v] = child
+
+        if not endstage and label[b] == 2:
+            # relabel the sub-blossoms on the even path through b
+            entrychild = inblossom[endpoint[labelend[b] ^ 1]]
+            j = blossomchilds[b].index(entrychild)
+            if j & 1:
+                j -= len(blossomchilds[b])
+                jstep = 1
+                endptrick = 0
+            else:
+                jstep = -1
+                endptrick = 1
+            p = labelend[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = 0
+                label[endpoint[blossomendps[b][j - endptrick]
+                               ^ endptrick ^ 1]] = 0
+                assign_label(endpoint[p ^ 1], 2, p)
+                allowedge[blossomendps[b][j - endptrick] // 2] = True
+                j += jstep
+                p = blossomendps[b][j - endptrick] ^ endptrick
+                allowedge[p // 2] = True
+                j += jstep
+            bv = blossomchilds[b][j]
+            label[endpoint[p ^ 1]] = label[bv] = 2
+            labelend[endpoint[p ^ 1]] = labelend[bv] = p
+            bestedge[bv] = -1
+            j += jstep
+            while blossomchilds[b][j] != entrychild:
+                bv = blossomchilds[b][j]
+                if label[bv] == 1:
+                    j += jstep
+                    continue
+                for v in blossom_leaves(bv):
+                    if label[v] != 0:
+                        break
+                if label[v] != 0:
+                    label[v] = 0
+                    label[endpoint[mate[blossombase[bv]]]] = 0
+                    assign_label(v, 2, labelend[v])
+                j += jstep
+
+        label[b] = labelend[b] = -1
+        blossomchilds[b] = blossomendps[b] = None
+        blossombase[b] = -1
+        blossombestedges[b] = None
+        bestedge[b] = -1
+        unusedblossoms.append(b)
+
+    def augment_blossom(b, v):
+        """swap matched/unmatched edges in blossom b from vertex v
+        to the base of b"""
+        t = v
+        while blossomparent[t] != b:
+            t = blossomparent[t]
+        if t >= nb_vertices:
+            augment_blossom(t, v)
+        i = j = blossomchilds[b].index(t)
+        if i & 1:
+            j -= len(blossomchilds[b])
+            jstep = 1
+            endptrick = 0
+        else:
+            jstep = -1
+            endptrick = 1
+        while j != 0:
+            j += jstep
+            t = blossomchilds[b][j]
+            p = blossomendps[b][j - endptrick] ^ endptrick
+            if t >= nb_vertices:
+                augment_blossom(t, endpoint[p])
+            j += jstep
+            t = blossomchilds[b][j]
+            if t >= nb_vertices:
+                augment_blossom(t, endpoint[p ^ 1])
+            mate[endpoint[p]] = p ^ 1
+            mate[endpoint[p ^ 1]] = p
+        blossomchilds[b] = blossomchilds[b][i:] + blossomchilds[b][:i]
+        blossomendps[b] = blossomendps[b][i:] + blossomendps[b][:i]
+        blossombase[b] = blossombase[blossomchilds[b][0]]
+
+    def augment_matching(k):
+        """swap matched/unmatched edges over the augmenting path
+        through edge k"""
+        (v, w, weight) = edges[k]
+        for (s, p) in ((v, 2 * k + 1), (w, 2 * k)):
+            while True:
+                bs = inblossom[s]
+                if bs >= nb_vertices:
+                    augment_blossom(bs, s)
+                mate[s] = p
+                if labelend[bs] == -1:
+                    break
+                t = endpoint[labelend[bs]]
+                bt = inblossom[t]
+                s = endpoint[labelend[bt]]
+                j = endpoint[labelend[bt] ^ 1]
+                if bt >= nb_vertices:
+                    augment_blossom(bt, j)
+                mate[j] = labelend[bt]
+                p = labelend[bt] ^ 1
+
+    # each stage augments the matching by one edge, or stops
+    for _ in range(nb_vertices):
+        label[:] = (2 * nb_vertices) * [0]
+        bestedge[:] = (2 * nb_vertices) * [-1]
+        blossombestedges[nb_vertices:] = nb_vertices * [None]
+        allowedge[:] = nb_edges * [False]
+        queue[:] = []
+
+        for v in range(nb_vertices):
+            if mate[v] == -1 and label[inblossom[v]] == 0:
+                assign_label(v, 1, -1)
+
+        augmented = False
+        while True:
+            # grow the alternating trees from the queue of S-vertices
+            while queue and not augmented:
+                v = queue.pop()
+                for p in neighbend[v]:
+                    k = p // 2
+                    w = endpoint[p]
+                    if inblossom[v] == inblossom[w]:
+                        continue
+                    if not allowedge[k]:
+                        kslack = slack(k)
+                        if kslack <= 0:
+                            allowedge[k] = True
+                    if allowedge[k]:
+                        if label[inblossom[w]] == 0:
+                            assign_label(w, 2, p ^ 1)
+                        elif label[inblossom[w]] == 1:
+                            base = scan_blossom(v, w)
+                            if base >= 0:
+                                add_blossom(base, k)
+                            else:
+                                augment_matching(k)
+                                augmented = True
+                                break
+                        elif label[w] == 0:
+                            label[w] = 2
+                            labelend[w] = p ^ 1
+                    elif label[inblossom[w]] == 1:
+                        b = inblossom[v]
+                        if bestedge[b] == -1 or kslack < slack(bestedge[b]):
+                            bestedge[b] = k
+                    elif label[w] == 0:
+                        if bestedge[w] == -1 or kslack < slack(bestedge[w]):
+                            bestedge[w] = k
+
+            if augmented:
+                break
+
+            # no augmenting path: update the dual variables
+            deltatype = -1
+            delta = deltaedge = deltablossom = None
+
+            if not max_cardinality:
+                deltatype = 1
+                delta = min(dualvar[:nb_vertices])
+
+            for v in range(nb_vertices):
+                if label[inblossom[v]] == 0 and bestedge[v] != -1:
+                    d = slack(bestedge[v])
+                    if deltatype == -1 or d < delta:
+                        delta = d
+                        deltatype = 2
+                        deltaedge = bestedge[v]
+
+            for b in range(2 * nb_vertices):
+                if blossomparent[b] == -1 and label[b] == 1 \
+                        and bestedge[b] != -1:
+                    d = slack(bestedge[b]) // 2
+                    if deltatype == -1 or d < delta:
+                        delta = d
+                        deltatype = 3
+                        deltaedge = bestedge[b]
+
+            for b in range(nb_vertices, 2 * nb_vertices):
+                if blossombase[b] >= 0 and blossomparent[b] == -1 \
+                        and label[b] == 2 \
+                        and (deltatype == -1 or dualvar[b] < delta):
+                    delta = dualvar[b]
+                    deltatype = 4
+                    deltablossom = b
+
+            if deltatype == -1:
+                # no further improvement possible (max cardinality)
+                deltatype = 1
+                delta = max(0, min(dualvar[:nb_vertices]))
+
+            for v in range(nb_vertices):
+                if label[inblossom[v]] == 1:
+                    dualvar[v] -= delta
+                elif label[inblossom[v]] == 2:
+                    dualvar[v] += delta
+            for b in range(nb_vertices, 2 * nb_vertices):
+                if blossombase[b] >= 0 and blossomparent[b] == -1:
+                    if label[b] == 1:
+                        dualvar[b] += delta
+                    elif label[b] == 2:
+                        dualvar[b] -= delta
+
+            if deltatype == 1:
+                break
+            elif deltatype == 2:
+                allowedge[deltaedge] = True
+                (i, j, weight) = edges[deltaedge]
+                if label[inblossom[i]] == 0:
+                    i, j = j, i
+                queue.append(i)
+            elif deltatype == 3:
+                allowedge[deltaedge] = True
+                (i, j, weight) = edges[deltaedge]
+                queue.append(i)
+            elif deltatype == 4:
+                expand_blossom(deltablossom, False)
+
+        if not augmented:
+            break
+
+        # end of stage: expand S-blossoms with zero dual
+        for b in range(nb_vertices, 2 * nb_vertices):
+            if blossomparent[b] == -1 and blossombase[b] >= 0 \
+                    and label[b] == 1 and dualvar[b] == 0:
+                expand_blossom(b, True)
+
+    for v in range(nb_vertices):
+        if mate[v] >= 0:
+            mate[v] = endpoint[mate[v]]
+
+    return mate
@@ -0,0 +1,76 @@
+class OpponentHistory:
+    """Opponents already met by each player of a tournament
+
+    Each player gets a dense integer index (in signing order) and the
+    opponents he met are stored as an int used as a bitset (bit j set
+    if he met player of index j), so "have they met" is O(1) and the
+    eligible opponents of a player among a group are a single mask.
+    """
+
+    def __init__(self):
+        self.indexes = dict()
+        self.players = []
+        self.bitsets = []
+
+    def add_player(self, player) -> int:
+        """give an index to a new player (nothing if already known)
+        :return the index of player"""
+        index = self.indexes.get(player)
+        if index is None:
+            index = len(self.players)
+            self.indexes[player] = index
+            self.players.append(player)
+            self.bitsets.append(0)
+
+        return index
+
+    def copy(self):
+        """:return an independent copy of the history"""
+        history = OpponentHistory()
+        history.indexes = dict(self.indexes)
+        history.players = list(self.players)
+        history.bitsets = list(self.bitsets)
+
+        return history
+
+    def get_index(self, player) -> int:
+        return self.indexes[player]
+
+    def add_match(self, player1, player2):
+        """record that player1 and player2 met"""
+        index1 = self.indexes[player1]
+        index2 = self.indexes[player2]
+        self.bitsets[index1] |= 1 << index2
+        self.bitsets[index2] |= 1 << index1
+
+    def have_met(self, player1, player2) -> bool:
+        return self.bitsets[self.indexes[player1]] \
+            >> self.indexes[player2] & 1 == 1
+
+    def get_mask(self, players) -> int:
+        """:return the bitset of given players"""
+        mask = 0
+        for player in players:
+            mask |= 1 << self.indexes[player]
+
+        return mask
+
+    def get_eligible_mask(self, player, mask: int) -> int:
+        """:return the bitset of players in mask that player
+        has not met yet (without player himself)"""
+        index = self.indexes[player]
+        return mask & ~self.bitsets[index] & ~(1 << index)
+
+    def get_players(self, mask: int) -> list:
+        """:return the list of players in a bitset, ordered by index"""
+        players = []
+        while mask:
+            lowest_bit = mask & -mask
+            players.append(self.players[lowest_bit.bit_length() - 1])
+            mask ^= lowest_bit
+
+        return players
+
+    def get_opponents(self, player) -> list:
+        """:return the list of players already met by player"""
+        return self.get_players(self.bitsets[self.indexes[player]])
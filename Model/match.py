@@ -3,9 +3,16 @@ from Model.player import Player
 
 
 class Match(Serializable):
-    # constants to define position in list "opponent1 and opponent2
-    PLAYER = 0
-    SCORE = 1
+    """A match between two players, with __slots__ as a tournament
+    archive holds a lot of them
+
+    version counts the scores given since the match has been created
+    (it is saved with the match), so a score can be given only if the
+    match has not been modified since it was displayed (see
+    TournamentSession)"""
+
+    __slots__ = ('player1', 'player2', 'score1', 'score2',
+                 'is_ended', 'version', '_dirty')
 
     def __init__(self,
                  player1: Player, player2: Player,
@@ -13,37 +20,41 @@ class Match(Serializable):
 
         self.is_ended = (score1 is not None or score2 is not None)
 
-        self.match = ([player1, score1], [player2, score2])
+        self.player1 = player1
+        self.player2 = player2
+        self.score1 = score1
+        self.score2 = score2
+        self.version = 0
+
+        self._dirty = True
 
     def __str__(self):
-        return f"{self.match[0][Match.PLAYER]} VS " \
-               f"{self.match[1][Match.PLAYER]}   {self.get_score()}"
+        return f"{self.player1} VS {self.player2}   {self.get_score()}"
 
     def __repr__(self):
-        return f"{self.match[0][Match.PLAYER]} VS " \
-               f"{self.match[1][Match.PLAYER]}"
+        return f"{self.player1} VS {self.player2}"
 
     def set_score(self, score1: int, score2: int):
         """record both score and set is-ended to True"""
-        self.match[0][Match.SCORE] = score1
-        self.match[1][Match.SCORE] = score2
+        self.score1 = score1
+        self.score2 = score2
         self.is_ended = True
+        self.version += 1
+        self.set_dirty()
 
     def get_infos(self):
         """return a tuple with needed information to modify this Player"""
         return ({'label': "instance de classe", 'type': self},
-                {'label': f"Score pour {self.match[0][Match.PLAYER]}",
-                 'type': int},
-                {'label': f"Score pour {self.match[1][Match.PLAYER]}",
-                 'type': int})
+                {'label': f"Score pour {self.player1}", 'type': int},
+                {'label': f"Score pour {self.player2}", 'type': int})
 
     def get_players(self):
-        return self.match[0][Match.PLAYER], self.match[1][Match.PLAYER]
+        return self.player1, self.player2
 
     def get_result(self, player):
-        if player in self.match[0]:
+        if player == self.player1:
             return self.calculate_result()
-        elif player in self.match[1]:
+        elif player == self.player2:
             return 1 - self.calculate_result()
         else:
             raise Exception("Ce joueur ne participe pas à ce match !")
@@ -53,29 +64,27 @@ class Match(Serializable):
         if not self.is_ended:
             return "En cours"
         else:
-            return f"{self.match[0][Match.SCORE]} - " \
-                   f"{self.match[1][Match.SCORE]}"
+            return f"{self.score1} - {self.score2}"
 
     def calculate_result(self):
         """return 1 if player1 wins, 0 if player2 wins, 0.5 if tied"""
         if not self.is_ended:
             return None
 
-        if self.match[0][Match.SCORE] > self.match[1][Match.SCORE]:
+        if self.score1 > self.score2:
             return 1
-        elif self.match[0][Match.SCORE] < self.match[1][Match.SCORE]:
+        elif self.score1 < self.score2:
             return 0
         else:
             return 0.5
 
     def serialize(self):
-        player1 = self.match[0][Match.PLAYER]
-        player2 = self.match[1][Match.PLAYER]
         return {
-            "player1": player1.id_in_db,
-            "player2": player2.id_in_db,
-            "score1": self.match[0][Match.SCORE],
-            "score2": self.match[1][Match.SCORE]
+            "player1": self.player1.player_id,
+            "player2": self.player2.player_id,
+            "score1": self.score1,
+            "score2": self.score2,
+            "version": self.version
         }
 
     @staticmethod
@@ -89,4 +98,10 @@ class Match(Serializable):
         score1 = serialized_instance["score1"]
         score2 = serialized_instance["score2"]
 
-        return Match(player1, player2, score1, score2)
+        match = Match(player1, player2, score1, score2)
+        # matches saved before versions count their score once
+        match.version = serialized_instance.get("version")
+        if match.version is None:
+            match.version = int(match.is_ended)
+        match.set_dirty(False)
+        return match
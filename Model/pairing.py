@@ -0,0 +1,266 @@
+from abc import ABC, abstractmethod
+from Model.blossom import max_weight_matching
+
+
+class PairingEngine(ABC):
+    """This abstract class define the method used by a Tournament
+    to pair its players for a new round"""
+
+    @abstractmethod
+    def create_pairs(self, tournament, ranked_players: list) -> list:
+        """find the opponents of the next round
+
+        :param tournament: the Tournament (points, history, rounds)
+        :param ranked_players: players ordered by rank in the tournament
+
+        :return a list of (player1, player2) tuples, player1 being the
+                better ranked, a single player left (odd number) gets no
+                opponent for this round
+        """
+        pass
+
+    @staticmethod
+    def pair_halves(ranked_players: list) -> list:
+        """pairs of the first round: 1st player plays the 1st of the
+        second half and so on"""
+        half = len(ranked_players) // 2
+        return [(ranked_players[index], ranked_players[index + half])
+                for index in range(half)]
+
+    @staticmethod
+    def count_byes(tournament) -> dict:
+        """:return a dict as player: number of played rounds
+        without match for him"""
+        byes = {player: 0 for player in tournament.players}
+        for a_round in tournament.rounds:
+            if not a_round.matches:
+                # the round being paired
+                continue
+
+            paired = {player for match in a_round.matches
+                      for player in match.get_players()}
+            for player in tournament.players:
+                if player not in paired:
+                    byes[player] += 1
+
+        return byes
+
+
+class BlossomPairing(PairingEngine):
+    """Swiss pairing as a minimum-cost perfect matching
+
+    First round: 1st player plays the 1st of the second half and so on.
+    Next rounds: each possible pair costs
+        SCORE_COST * (score-group distance)² + rank distance
+    (+ REMATCH_COST if both players already met) and the cheapest
+    perfect matching is found with the blossom algorithm.
+    With an odd number of players, a bye vertex is matched too: the bye
+    costs SCORE_COST * (score distance to the lowest score)² + rank
+    distance to the last player (+ REMATCH_COST for each previous bye of
+    the player), so it is chosen together with the pairs.
+
+    To stay fast on big opens, ranked players are cut in blocks of
+    min_block to 2 * min_block players (whole score groups when possible)
+    which are matched one after the other, a block without legal perfect
+    matching is merged with the next one.
+    Rematches (and second byes) are only allowed if no legal pairing
+    exists at all.
+
+    :param min_block: minimum number of players matched at once
+    """
+
+    SCORE_COST = 10000
+    REMATCH_COST = 100000000
+
+    def __init__(self, min_block: int = 40):
+        self.min_block = min_block
+
+    def create_pairs(self, tournament, ranked_players: list) -> list:
+        if len(tournament.rounds) <= 1:
+            return self.pair_halves(ranked_players)
+
+        # an odd number of players gives an odd last block, with the bye
+        blocks = self.create_blocks(tournament, ranked_players)
+        byes = self.count_byes(tournament)
+
+        solved_blocks = []
+        pending = []
+
+        while blocks or pending:
+            if blocks:
+                pending = pending + blocks.pop(0)
+
+            block_pairs = self.match_block(tournament, ranked_players,
+                                           pending, False, byes)
+
+            if block_pairs is None:
+                if blocks:
+                    # merge with next block
+                    continue
+                if solved_blocks:
+                    # give back the previous block to the last one
+                    previous_ranks, _ = solved_blocks.pop()
+                    pending = previous_ranks + pending
+                    continue
+                # no legal pairing at all, allow rematches
+                block_pairs = self.match_block(tournament, ranked_players,
+                                               pending, True, byes)
+
+            solved_blocks.append((pending, block_pairs))
+            pending = []
+
+        rank_pairs = sorted(pair for ranks, block_pairs in solved_blocks
+                            for pair in block_pairs)
+
+        return [(ranked_players[rank1], ranked_players[rank2])
+                for rank1, rank2 in rank_pairs]
+
+    def create_blocks(self, tournament, ranked_players: list) -> list:
+        """split ranks of players in blocks with an even size of
+        min_block to 2 * min_block players, ending at the end of a score
+        group when possible (the last block is odd if the number of
+        players is odd)"""
+        blocks = []
+        block = []
+
+        for rank, player in enumerate(ranked_players):
+            next_player = ranked_players[rank + 1] \
+                if rank + 1 < len(ranked_players) else None
+
+            block.append(rank)
+
+            end_of_group = next_player is None \
+                or tournament.points[next_player] \
+                != tournament.points[player]
+
+            if len(block) % 2 == 0 \
+                    and (end_of_group and len(block) >= self.min_block
+                         or len(block) >= 2 * self.min_block):
+                blocks.append(block)
+                block = []
+
+        if block:
+            if blocks and len(block) < self.min_block:
+                blocks[-1].extend(block)
+            else:
+                blocks.append(block)
+
+        return blocks
+
+    def match_block(self, tournament, ranked_players: list, ranks: list,
+                    allow_rematch: bool, byes: dict):
+        """find the cheapest perfect matching of a block of players
+        (and of a bye vertex if the block is odd)
+
+        :param ranks: ranks (in ranked_players) of the players to pair
+        :param allow_rematch: if False, players who already met
+                              can't be paired together and players who
+                              already had a bye can't get it again
+        :param byes: dict as player: number of previous byes
+
+        :return a list of (rank1, rank2) with rank1 < rank2 (the player
+                getting the bye is not in it) or None if there is no
+                perfect matching
+        """
+        history = tournament.history
+        players = [ranked_players[rank] for rank in ranks]
+        scores = [int(tournament.points[player] * 2) for player in players]
+        indexes = [history.get_index(player) for player in players]
+        block_mask = history.get_mask(players)
+
+        edges = []
+        costs = []
+
+        for i, rank1 in enumerate(ranks):
+            score1 = scores[i]
+            # players of the block not met yet
+            eligible = history.get_eligible_mask(players[i], block_mask)
+
+            for j in range(i + 1, len(ranks)):
+                cost = (score1 - scores[j]) ** 2 * self.SCORE_COST \
+                    + ranks[j] - rank1
+
+                if not eligible >> indexes[j] & 1:
+                    if not allow_rematch:
+                        continue
+                    cost += self.REMATCH_COST
+
+                edges.append((i, j))
+                costs.append(cost)
+
+        nb_vertices = len(ranks)
+        if len(ranks) % 2:
+            # bye vertex, the lowest score and rank get it
+            bye = len(ranks)
+            nb_vertices += 1
+            min_score = min(scores)
+            last_rank = max(ranks)
+            for i, rank in enumerate(ranks):
+                cost = (scores[i] - min_score) ** 2 * self.SCORE_COST \
+                    + last_rank - rank
+
+                nb_byes = byes.get(players[i], 0)
+                if nb_byes:
+                    if not allow_rematch:
+                        continue
+                    cost += nb_byes * self.REMATCH_COST
+
+                edges.append((i, bye))
+                costs.append(cost)
+
+        if not edges:
+            return None
+
+        # the algorithm maximizes weights: weight = max_cost - cost
+        max_cost = max(costs) + 1
+        weighted_edges = [(i, j, max_cost - cost)
+                          for (i, j), cost in zip(edges, costs)]
+
+        mate = max_weight_matching(weighted_edges, max_cardinality=True)
+
+        if len(mate) < nb_vertices or -1 in mate:
+            return None
+
+        pairs = []
+        for i, j in enumerate(mate):
+            if i < j < len(ranks):
+                pairs.append((ranks[i], ranks[j]))
+
+        return pairs
+
+
+class GreedyPairing(PairingEngine):
+    """Fast approximate Swiss pairing, used to simulate tournaments
+
+    First round as BlossomPairing. Next rounds: the lowest ranked player
+    among those with the fewest byes gets the bye (odd number), then the
+    best ranked player left plays the best ranked player left he has not
+    met yet, which are the pairs BlossomPairing finds when there is no
+    rematch to avoid. There is no backtracking: when only players he
+    already met are left, he plays the next one anyway, so pairing is
+    O(n²) at worst instead of the O(n³) of the blossom algorithm.
+    """
+
+    def create_pairs(self, tournament, ranked_players: list) -> list:
+        if len(tournament.rounds) <= 1:
+            return self.pair_halves(ranked_players)
+
+        left = list(ranked_players)
+        if len(left) % 2:
+            byes = self.count_byes(tournament)
+            fewest_byes = min(byes[player] for player in left)
+            for rank in range(len(left) - 1, -1, -1):
+                if byes[left[rank]] == fewest_byes:
+                    del left[rank]
+                    break
+
+        history = tournament.history
+        pairs = []
+        while left:
+            player = left.pop(0)
+            opponent_rank = next(
+                (rank for rank, opponent in enumerate(left)
+                 if not history.have_met(player, opponent)), 0)
+            pairs.append((player, left.pop(opponent_rank)))
+
+        return pairs
@@ -1,5 +1,6 @@
 from datetime import date, datetime
 from Model import Serializable
+from Model.rating import RatingChange
 
 
 class Player(Serializable):
@@ -7,10 +8,19 @@ class Player(Serializable):
 
         ::param family_name: str
         ::param first_name: str
-        ::param birth_date: str or date
+        ::param birth_date: str or date, None (or '') if unknown
         ::param sex: int in enumerate TUPLE_SEX (as a int index of tuple_sex)
         ::param elo: int
+        ::param player_id: permanent id given by PlayerRegistry,
+                           used for hashing, equality and serialization
+        ::param rating_history: list of RatingChange (see EloRating),
+                                oldest first
+        ::param fide_id: id of the player in the rating lists of FIDE
+                         or of his federation (see RatingListImporter)
     """
+    __slots__ = ('family_name', 'first_name', 'birth_date', 'sex', 'elo',
+                 'player_id', 'rating_history', 'fide_id', '_dirty')
+
     TUPLE_SEX = ("Homme", "Femme", "Non-renseigné")
     MALE = 0
     FEMALE = 1
@@ -36,11 +46,20 @@ class Player(Serializable):
                  first_name: str,
                  birth_date,
                  sex: int,
-                 elo: int):
+                 elo: int,
+                 player_id: int = None,
+                 rating_history: list = None,
+                 fide_id: int = None):
         self.family_name = family_name
         self.first_name = first_name
-        if isinstance(birth_date, str):
-            birth_date = datetime.strptime(birth_date, '%d/%m/%y')
+        if birth_date == '':
+            # unknown (saved as '')
+            birth_date = None
+        elif isinstance(birth_date, str):
+            # saved with 4 digits years, typed with 2
+            date_format = '%d/%m/%Y' if len(birth_date) == 10 \
+                else '%d/%m/%y'
+            birth_date = datetime.strptime(birth_date, date_format)
         self.birth_date = birth_date
 
         # check if sex is valid value
@@ -51,25 +70,59 @@ class Player(Serializable):
 
         self.elo = elo
 
+        self.player_id = player_id
+
+        self.rating_history = []
+        if rating_history is not None:
+            self.rating_history = [RatingChange(*change)
+                                   for change in rating_history]
+        self.fide_id = fide_id
+        self._dirty = True
+
     def serialize(self):
         return {
             'family_name': self.family_name,
             'first_name': self.first_name,
-            'birthdate': self.birth_date.strftime('%d/%m/%y'),
+            'birthdate': self.birth_date.strftime('%d/%m/%Y')
+            if self.birth_date is not None else '',
             'sex': self.sex,
-            'elo': self.elo
+            'elo': self.elo,
+            'rating_history': [list(change)
+                               for change in self.rating_history],
+            'fide_id': self.fide_id
         }
 
     @staticmethod
     def deserialize(serialized_player, player_list=None):
-        player = Player(*serialized_player.values())
-        player.id_in_db = serialized_player.doc_id
+        # players saved before rating history (or fide id) have no
+        # 'rating_history' (or 'fide_id')
+        player = Player(serialized_player['family_name'],
+                        serialized_player['first_name'],
+                        serialized_player['birthdate'],
+                        serialized_player['sex'],
+                        serialized_player['elo'],
+                        rating_history=serialized_player.get(
+                            'rating_history'),
+                        fide_id=serialized_player.get('fide_id'))
+        player.player_id = getattr(serialized_player, 'doc_id', None)
+        player.set_dirty(False)
         return player
 
     def get_sex(self) -> str:
         """return string corresponding to int sex attribute"""
         return Player.TUPLE_SEX[self.sex]
 
+    def get_birth_date(self) -> str:
+        """return birth date as dd/mm/yy, or Non-renseignée if unknown"""
+        if self.birth_date is None:
+            return "Non-renseignée"
+
+        return self.birth_date.strftime('%d/%m/%y')
+
+    def get_nb_rated_games(self) -> int:
+        """:return the number of games taken into account in elo"""
+        return sum(change.nb_games for change in self.rating_history)
+
     def get_infos(self):
         """return a tuple with needed information to modify this Player"""
         return ({'label': "instance de classe", 'type': self},
@@ -85,11 +138,17 @@ class Player(Serializable):
         return f"{self.first_name} {self.family_name.upper()}"
 
     def __hash__(self):
-        return hash((self.first_name, self.family_name))
+        if self.player_id is None:
+            # not registered yet
+            return object.__hash__(self)
+
+        return self.player_id
 
     def __eq__(self, other):
         if not isinstance(other, Player):
             return False
 
-        return (self.first_name, self.family_name) == \
-               (other.first_name, other.family_name)
+        if self.player_id is None or other.player_id is None:
+            return self is other
+
+        return self.player_id == other.player_id
@@ -0,0 +1,221 @@
+from typing import NamedTuple
+
+try:
+    import numpy
+except ImportError:
+    # ratings are computed in pure Python
+    numpy = None
+
+
+class RatingChange(NamedTuple):
+    """An entry of the rating history of a player: his elo before and
+    after a rated tournament, ended at date (as dd/mm/yy)"""
+    date: str
+    elo_before: int
+    elo_after: int
+    nb_games: int
+
+
+class EloRating:
+    """Elo ratings computed from the results of ended tournaments
+
+    All games of a tournament are rated at once, from the elos of players
+    at the start of the tournament (as FIDE does):
+        expected score = 1 / (1 + 10 ** ((elo of opponent - elo) / 400))
+        change = K * sum of (score - expected score)
+    where K depends on the player (see get_k_factor). The change is added
+    to the current elo of the player, which may have been updated since
+    the start (by a rating list).
+    Ratings, expected scores and K-factors are computed as NumPy arrays
+    if NumPy is installed, in pure Python otherwise.
+
+    :param use_numpy: False to compute in pure Python anyway
+    """
+
+    NEW_PLAYER_GAMES = 30
+    NEW_PLAYER_K = 40
+    K = 20
+    MASTER_ELO = 2400
+    MASTER_K = 10
+
+    def __init__(self, use_numpy: bool = True):
+        self.use_numpy = use_numpy and numpy is not None
+
+    def get_k_factor(self, elo: int, nb_games: int) -> int:
+        """:return K of a player with elo, having played nb_games rated
+        games before"""
+        if nb_games < self.NEW_PLAYER_GAMES:
+            return self.NEW_PLAYER_K
+        if elo >= self.MASTER_ELO:
+            return self.MASTER_K
+
+        return self.K
+
+    @staticmethod
+    def get_games(tournament) -> tuple:
+        """:return ended games of tournament
+        as 3 lists: index of player1, index of player2 (in
+        tournament.players) and result of player1 (1, 0.5 or 0)"""
+        positions = {player: index
+                     for index, player in enumerate(tournament.players)}
+        indexes1 = []
+        indexes2 = []
+        results1 = []
+
+        for a_round in tournament.rounds:
+            for match in a_round.matches:
+                if match.is_ended:
+                    indexes1.append(positions[match.player1])
+                    indexes2.append(positions[match.player2])
+                    results1.append(match.calculate_result())
+
+        return indexes1, indexes2, results1
+
+    def compute(self, elos: list, k_factors: list, indexes1: list,
+                indexes2: list, results1: list) -> list:
+        """:return new elos of players after games
+        (games as returned by get_games)"""
+        if self.use_numpy:
+            return self.compute_with_numpy(elos, k_factors, indexes1,
+                                           indexes2, results1)
+
+        differences = [0.0] * len(elos)
+        for index1, index2, result1 in zip(indexes1, indexes2, results1):
+            expected1 = 1 / (1 + 10 ** ((elos[index2] - elos[index1]) / 400))
+            differences[index1] += result1 - expected1
+            differences[index2] -= result1 - expected1
+
+        return [round(elo + k_factor * difference) for elo, k_factor,
+                difference in zip(elos, k_factors, differences)]
+
+    @staticmethod
+    def compute_with_numpy(elos: list, k_factors: list, indexes1: list,
+                           indexes2: list, results1: list) -> list:
+        elos = numpy.asarray(elos, dtype=float)
+        indexes1 = numpy.asarray(indexes1, dtype=numpy.intp)
+        indexes2 = numpy.asarray(indexes2, dtype=numpy.intp)
+
+        expected1 = 1 / (1 + 10 ** ((elos[indexes2] - elos[indexes1]) / 400))
+        differences1 = numpy.asarray(results1, dtype=float) - expected1
+
+        # sum of differences of each player, as player1 and as player2
+        differences = numpy.bincount(indexes1, differences1, len(elos)) \
+            - numpy.bincount(indexes2, differences1, len(elos))
+
+        return numpy.rint(elos + numpy.asarray(k_factors) * differences) \
+            .astype(int).tolist()
+
+    def rate_tournament(self, tournament, elos: dict = None,
+                        rated_players=None) -> dict:
+        """update elo and rating history of players of an ended tournament
+
+        :param elos: dict as player: elo at the start of the tournament,
+                     tournament.elos by default
+        :param rated_players: players whose elo is updated, all by default
+
+        :return a dict as player: RatingChange (updated players having
+                played)"""
+        indexes1, indexes2, results1 = self.get_games(tournament)
+        players = tournament.players
+        if elos is None:
+            elos = tournament.elos
+
+        nb_games = [0] * len(players)
+        for index in indexes1:
+            nb_games[index] += 1
+        for index in indexes2:
+            nb_games[index] += 1
+
+        start_elos = [elos[player] for player in players]
+        k_factors = [self.get_k_factor(elo, player.get_nb_rated_games())
+                     for player, elo in zip(players, start_elos)]
+        new_elos = self.compute(start_elos, k_factors, indexes1, indexes2,
+                                results1)
+
+        date = tournament.dates[-1].strftime('%d/%m/%y')
+        changes = dict()
+        for player, elo, new_elo, nb_player_games \
+                in zip(players, start_elos, new_elos, nb_games):
+            if nb_player_games == 0:
+                continue
+            if rated_players is not None and player not in rated_players:
+                continue
+
+            change = RatingChange(date, player.elo,
+                                  player.elo + new_elo - elo,
+                                  nb_player_games)
+            player.elo = change.elo_after
+            player.rating_history.append(change)
+            player.set_dirty()
+            changes[player] = change
+
+        return changes
+
+    @staticmethod
+    def get_nb_kept(player) -> int:
+        """:return the number of changes of the rating history of player
+        made before his last elo not given by a rated tournament (by a
+        rating list or a modification): the following changes lead from
+        this elo to his current elo"""
+        elo = player.elo
+        position = len(player.rating_history)
+        while position > 0 \
+                and player.rating_history[position - 1].elo_after == elo:
+            position -= 1
+            elo = player.rating_history[position].elo_before
+
+        return position
+
+    def recompute(self, tournaments: list) -> int:
+        """rate again all ended tournaments in chronological order
+        (tournaments must be loaded, see Tournament.hydrate)
+
+        Each player is rated again from his last elo not given by a
+        tournament (see get_nb_kept): his tournaments rated before it
+        stay in his history and don't change his elo (his opponents are
+        rated from his elo at their start).
+
+        :return the number of rated games"""
+        tournaments = sorted((tournament for tournament in tournaments
+                              if tournament.is_ended()),
+                             # dates may be date or datetime
+                             key=lambda x: x.dates[-1].toordinal())
+
+        players = {player for tournament in tournaments
+                   for player in tournament.players}
+        # player: number of his first rated tournaments which are kept
+        nb_kept = dict()
+        for player in players:
+            nb_kept[player] = self.get_nb_kept(player)
+            if nb_kept[player] < len(player.rating_history):
+                player.elo = \
+                    player.rating_history[nb_kept[player]].elo_before
+                del player.rating_history[nb_kept[player]:]
+                player.set_dirty()
+
+        nb_games = 0
+        for tournament in tournaments:
+            elos = dict()
+            rated_players = set()
+            for player in tournament.players:
+                if nb_kept[player]:
+                    elos[player] = tournament.elos[player]
+                else:
+                    elos[player] = player.elo
+                    rated_players.add(player)
+
+            self.rate_tournament(tournament, elos, rated_players)
+            indexes1, indexes2, _ = self.get_games(tournament)
+            nb_games += len(indexes1)
+
+            if tournament.rated:
+                # it is in the kept history of its players
+                for index in set(indexes1).union(indexes2):
+                    player = tournament.players[index]
+                    if nb_kept[player]:
+                        nb_kept[player] -= 1
+            else:
+                tournament.rated = True
+                tournament.set_dirty()
+
+        return nb_games
@@ -0,0 +1,130 @@
+from Model.player import Player
+from Model.search import PlayerIndex
+
+
+class PlayerRegistry:
+    """All known players, by permanent id and by name
+
+    register gives each new player a permanent integer id (used by
+    Player for hashing, equality and serialization), so a player keeps
+    his identity when he is renamed and two players may share a name.
+    Names are indexed separately, in lowercase, and players are indexed
+    by name and elo in a PlayerIndex for type-ahead searches, and by
+    fide_id for imports of rating lists (see RatingListImporter).
+
+    :param players: players already having an id (loaded from DB)
+    """
+
+    def __init__(self, players: list = None):
+        self.players = []
+        self.players_by_id = dict()
+        self.players_by_name = dict()
+        self.names = dict()
+        self.players_by_fide_id = dict()
+        self.index = PlayerIndex()
+        self.next_id = 1
+
+        if players is not None:
+            self.register_many(players)
+
+    def register(self, player: Player) -> Player:
+        """give a permanent id to player (if he has none) and index him,
+        must be called before player is used as a dict key
+
+        :return the registered player (the known one if same id)"""
+        known_player = self.get(player.player_id)
+        if known_player is not None:
+            return known_player
+
+        self.add(player)
+        self.index.add(player)
+
+        return player
+
+    def register_many(self, players: list) -> list:
+        """register players, indexing them at once (faster than
+        register for large batches)
+
+        :return the registered players"""
+        registered = []
+        new_players = []
+        for player in players:
+            known_player = self.get(player.player_id)
+            if known_player is None:
+                self.add(player)
+                new_players.append(player)
+                known_player = player
+            registered.append(known_player)
+
+        self.index.add_many(new_players)
+
+        return registered
+
+    def add(self, player: Player):
+        """give an id to a new player, index him except in self.index"""
+        if player.player_id is None:
+            player.player_id = self.next_id
+
+        self.next_id = max(self.next_id, player.player_id + 1)
+        self.players.append(player)
+        self.players_by_id[player.player_id] = player
+        self.index_name(player)
+        if player.fide_id is not None:
+            self.players_by_fide_id[player.fide_id] = player
+
+    @staticmethod
+    def get_name_key(family_name: str, first_name: str) -> tuple:
+        return family_name.lower(), first_name.lower()
+
+    def index_name(self, player: Player):
+        name = self.get_name_key(player.family_name, player.first_name)
+        self.names[player.player_id] = name
+        self.players_by_name.setdefault(name, []).append(player)
+
+    def update(self, player: Player):
+        """update indexes after a modification of player"""
+        self.update_name(player)
+        self.index.update(player)
+
+    def update_many(self, players: list):
+        """update indexes after a modification of players"""
+        for player in players:
+            self.update_name(player)
+        self.index.update_many(players)
+
+    def update_name(self, player: Player):
+        old_name = self.names[player.player_id]
+        if old_name != self.get_name_key(player.family_name,
+                                         player.first_name):
+            homonyms = self.players_by_name[old_name]
+            homonyms.remove(player)
+            if not homonyms:
+                del self.players_by_name[old_name]
+            self.index_name(player)
+
+    def get(self, player_id: int) -> Player:
+        """:return the player with player_id or None"""
+        return self.players_by_id.get(player_id)
+
+    def get_by_fide_id(self, fide_id: int) -> Player:
+        """:return the player with fide_id or None"""
+        return self.players_by_fide_id.get(fide_id)
+
+    def find_by_name(self, family_name: str, first_name: str) -> list:
+        """:return the list of players with this name (case-insensitive)"""
+        return list(self.players_by_name.get(
+            self.get_name_key(family_name, first_name), []))
+
+    def search(self, query: str = '', include=None, exclude=None,
+               offset: int = 0, limit: int = 20) -> tuple:
+        """find players by name and/or elo range, see PlayerIndex.search
+
+        :return (list of players of the page, total number of results)"""
+        return self.index.search(query, include, exclude, offset, limit)
+
+    def get_players(self) -> list:
+        """:return all players in registration order"""
+        return self.players
+
+    def __len__(self):
+        return len(self.players)
@@ -0,0 +1,45 @@
+from typing import NamedTuple
+
+
+class Column(NamedTuple):
+    """A column of a report: its header, the type of its values and
+    the maximum width of its values in a console table (None for no
+    maximum, longer values are cut)"""
+    name: str
+    type: type
+    max_width: int = None
+
+
+class Report:
+    """Rows of a report, generated lazily
+
+    A report is built from its columns and an iterable of tuples (values
+    in columns order), usually a generator, so nothing is computed before
+    a row is displayed or exported and memory does not depend on the
+    number of rows. Like a generator, a report can be read only once:
+    iterating it yields each row as a dict (header: value), as expected
+    by AbstractView.display_table, iter_values yields the tuples.
+
+    :param columns: a tuple of Column
+    :param rows: an iterable of tuples
+    """
+
+    def __init__(self, columns: tuple, rows):
+        self.columns = columns
+        self.rows = rows
+
+    def get_names(self) -> list:
+        """:return headers of the columns"""
+        return [column.name for column in self.columns]
+
+    def get_max_widths(self) -> list:
+        """:return maximum widths of the columns (None for no maximum)"""
+        return [column.max_width for column in self.columns]
+
+    def iter_values(self):
+        return iter(self.rows)
+
+    def __iter__(self):
+        names = self.get_names()
+        for values in self.rows:
+            yield dict(zip(names, values))
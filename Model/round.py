@@ -4,13 +4,26 @@ from datetime import datetime
 
 
 class Round(Serializable):
+    """A round of a tournament
+
+    Matches are indexed (match: position) and not ended matches are kept
+    in an ordered pending dict, so recording a score and detecting the
+    end of the round are O(1). The index is only built when a score is
+    recorded, so loaded ended rounds stay compact.
+    """
+
+    __slots__ = ('name', 'matches', 'match_positions', 'pending_matches',
+                 'start', 'end', '_dirty')
 
     def __init__(self, name: str, matches=None, start=None, end=None):
         self.name = name
-        if matches is None:
-            self.matches = []
-        else:
-            self.matches = matches
+        self.matches = []
+        self.match_positions = None
+        self.pending_matches = dict()
+
+        if matches is not None:
+            for match in matches:
+                self.index_match(match)
 
         if start is None:
             self.start = self.get_simpler_now()
@@ -19,13 +32,42 @@ class Round(Serializable):
 
         self.end = end
 
-    def add_match(self, match: Match):
+        self._dirty = True
+
+    def index_match(self, match: Match):
+        if self.match_positions is not None:
+            self.match_positions[match] = len(self.matches)
         self.matches.append(match)
+        if not match.is_ended:
+            self.pending_matches[match] = None
+
+    def add_match(self, match: Match):
+        self.index_match(match)
+        self.set_dirty()
+
+    def get_match_positions(self) -> dict:
+        """:return a dict as match: position in matches list"""
+        if self.match_positions is None:
+            self.match_positions = dict()
+            for position, match in enumerate(self.matches):
+                self.match_positions[match] = position
+
+        return self.match_positions
+
+    def get_match_position(self, match: Match) -> int:
+        """:return the position of match in matches list"""
+        return self.get_match_positions()[match]
+
+    def get_pending_matches(self) -> list:
+        """:return the list of not ended matches, in matches order"""
+        return list(self.pending_matches)
 
     def set_score(self, match: Match, score1: int, score2: int):
         """add a new result and check if round is ended"""
-        if match in self.matches:
+        if match in self.get_match_positions():
             match.set_score(score1, score2)
+            self.pending_matches.pop(match, None)
+            self.set_dirty()
             return self.check_round_end()
         else:
             raise Exception("Ce match n'appartient pas à ce round.")
@@ -33,9 +75,7 @@ class Round(Serializable):
     def check_round_end(self) -> bool:
         """stop round if all matches are ended
         :return True if all matches are ended, False otherwise"""
-        check = True
-        for match in self.matches:
-            check = check and match.is_ended
+        check = not self.pending_matches
 
         if check:
             self.end = self.get_simpler_now()
@@ -54,6 +94,14 @@ class Round(Serializable):
 
         return value
 
+    def set_dirty(self, dirty: bool = True):
+        """flag the round as modified, a saved round means
+        all its matches are saved too"""
+        self._dirty = dirty
+        if not dirty:
+            for match in self.matches:
+                match.set_dirty(False)
+
     def is_ended(self):
         return self.end is not None
 
@@ -87,17 +135,19 @@ class Round(Serializable):
     def deserialize(serialized_instance, players_by_id: dict = None):
         name = serialized_instance['name']
         serialized_matches = serialized_instance['matches']
-        start = datetime.strptime(serialized_instance['start'],
-                                  "%Y-%m-%d %H:%M:%S")
+        # start and end may already be datetime (binary snapshot)
+        start = serialized_instance['start']
+        if isinstance(start, str):
+            start = datetime.strptime(start, "%Y-%m-%d %H:%M:%S")
 
-        if serialized_instance['end'] is not None:
-            end = datetime.strptime(serialized_instance['end'],
-                                    "%Y-%m-%d %H:%M:%S")
-        else:
-            end = None
+        end = serialized_instance['end']
+        if isinstance(end, str):
+            end = datetime.strptime(end, "%Y-%m-%d %H:%M:%S")
 
         matches = []
         for serialized_match in serialized_matches:
             matches.append(Match.deserialize(serialized_match, players_by_id))
 
-        return Round(name, matches, start, end)
+        new_round = Round(name, matches, start, end)
+        new_round.set_dirty(False)
+        return new_round
@@ -0,0 +1,267 @@
+from bisect import bisect_left, insort
+from itertools import islice
+import re
+import unicodedata
+
+
+class PlayerIndex:
+    """Type-ahead search of players by name and elo
+
+    Names (family name then first name) are normalized (lowercase,
+    without accents) and indexed three ways:
+        trigrams: trigram -> set of player_id, a word of 3 letters or more
+                  is found anywhere in names by intersecting its trigrams
+        tokens: sorted (word of a name, player_id), a shorter word is
+                found as the beginning of a word of names (bisect)
+        sorted_names: sorted (name, player_id), to list players by name
+    and elos are kept sorted (elo, player_id) for range queries.
+    The index is updated in place when a player is added or modified,
+    add_many and update_many sort the lists once for a batch of players.
+
+    A query is made of words and optionally an elo range as MIN-MAX,
+    MIN- or -MAX (like "dup je 1500-1800"), results are ordered by name.
+    """
+
+    ELO_RANGE = re.compile(r'^(\d*)-(\d*)$')
+    # below, update_many updates players one by one
+    MIN_BATCH = 100
+
+    def __init__(self):
+        self.players = dict()
+        # player_id: (normalized name, elo) as indexed
+        self.keys = dict()
+        self.sorted_names = []
+        self.tokens = []
+        self.trigrams = dict()
+        self.elos = []
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """:return text in lowercase, without accents"""
+        decomposed = unicodedata.normalize('NFKD', text.lower())
+        return "".join(character for character in decomposed
+                       if not unicodedata.combining(character))
+
+    @staticmethod
+    def get_trigrams(text: str) -> set:
+        return {text[index:index + 3] for index in range(len(text) - 2)}
+
+    def get_key(self, player) -> tuple:
+        name = self.normalize(f"{player.family_name} {player.first_name}")
+        return name, player.elo
+
+    def add(self, player):
+        key = self.get_key(player)
+        name, elo = key
+        player_id = player.player_id
+
+        self.players[player_id] = player
+        self.keys[player_id] = key
+        insort(self.sorted_names, (name, player_id))
+        insort(self.elos, (elo, player_id))
+        for token in set(name.split()):
+            insort(self.tokens, (token, player_id))
+        for trigram in self.get_trigrams(name):
+            self.trigrams.setdefault(trigram, set()).add(player_id)
+
+    def add_many(self, players: list):
+        """add players, the lists are sorted once at the end"""
+        for player in players:
+            key = self.get_key(player)
+            name, elo = key
+            player_id = player.player_id
+
+            self.players[player_id] = player
+            self.keys[player_id] = key
+            self.sorted_names.append((name, player_id))
+            self.elos.append((elo, player_id))
+            for token in set(name.split()):
+                self.tokens.append((token, player_id))
+            for trigram in self.get_trigrams(name):
+                self.trigrams.setdefault(trigram, set()).add(player_id)
+
+        # already sorted lists followed by a run: merged in linear time
+        self.sorted_names.sort()
+        self.elos.sort()
+        self.tokens.sort()
+
+    def remove(self, player_id: int):
+        name, elo = self.keys.pop(player_id)
+        del self.players[player_id]
+
+        self.remove_sorted(self.sorted_names, (name, player_id))
+        self.remove_sorted(self.elos, (elo, player_id))
+        for token in set(name.split()):
+            self.remove_sorted(self.tokens, (token, player_id))
+        for trigram in self.get_trigrams(name):
+            player_ids = self.trigrams[trigram]
+            player_ids.discard(player_id)
+            if not player_ids:
+                del self.trigrams[trigram]
+
+    @staticmethod
+    def remove_sorted(sorted_list: list, item: tuple):
+        del sorted_list[bisect_left(sorted_list, item)]
+
+    def remove_many(self, player_ids: set):
+        """remove players, the lists are filtered once"""
+        for player_id in player_ids:
+            name, _ = self.keys.pop(player_id)
+            del self.players[player_id]
+            for trigram in self.get_trigrams(name):
+                trigram_ids = self.trigrams[trigram]
+                trigram_ids.discard(player_id)
+                if not trigram_ids:
+                    del self.trigrams[trigram]
+
+        self.sorted_names = [item for item in self.sorted_names
+                             if item[1] not in player_ids]
+        self.elos = [item for item in self.elos
+                     if item[1] not in player_ids]
+        self.tokens = [item for item in self.tokens
+                       if item[1] not in player_ids]
+
+    def update(self, player):
+        """re-index player if his name or elo has been modified"""
+        if self.keys.get(player.player_id) != self.get_key(player):
+            if player.player_id in self.keys:
+                self.remove(player.player_id)
+            self.add(player)
+
+    def update_many(self, players: list):
+        """re-index players whose name or elo has been modified"""
+        modified = [player for player in players
+                    if self.keys.get(player.player_id)
+                    != self.get_key(player)]
+        if len(modified) < self.MIN_BATCH:
+            for player in modified:
+                self.update(player)
+            return
+
+        self.remove_many({player.player_id for player in modified
+                          if player.player_id in self.keys})
+        self.add_many(modified)
+
+    def parse_query(self, query: str) -> tuple:
+        """:return (list of normalized words, elo min, elo max)"""
+        words = []
+        elo_min = None
+        elo_max = None
+
+        for word in self.normalize(query).split():
+            elo_range = self.ELO_RANGE.match(word)
+            if elo_range is not None and word != '-':
+                if elo_range.group(1):
+                    elo_min = int(elo_range.group(1))
+                if elo_range.group(2):
+                    elo_max = int(elo_range.group(2))
+            else:
+                words.append(word)
+
+        return words, elo_min, elo_max
+
+    def find_word(self, word: str) -> set:
+        """:return ids of players whose name contains word
+        (or has a word beginning with word, if shorter than 3 letters)"""
+        if len(word) < 3:
+            start = bisect_left(self.tokens, (word,))
+            end = bisect_left(self.tokens, (word + '\uffff',))
+            return {player_id for _, player_id in self.tokens[start:end]}
+
+        trigram_sets = []
+        for trigram in self.get_trigrams(word):
+            player_ids = self.trigrams.get(trigram)
+            if player_ids is None:
+                return set()
+            trigram_sets.append(player_ids)
+
+        # intersect the smallest sets first, then check (trigrams may be
+        # found in the name but not in the same order)
+        trigram_sets.sort(key=len)
+        player_ids = set(trigram_sets[0])
+        for trigram_set in trigram_sets[1:]:
+            player_ids &= trigram_set
+
+        return {player_id for player_id in player_ids
+                if word in self.keys[player_id][0]}
+
+    def find_elo_range(self, elo_min, elo_max) -> set:
+        start = 0 if elo_min is None else bisect_left(self.elos, (elo_min,))
+        end = len(self.elos) if elo_max is None \
+            else bisect_left(self.elos, (elo_max + 1,))
+        return {player_id for _, player_id in self.elos[start:end]}
+
+    def search(self, query: str = '', include=None, exclude=None,
+               offset: int = 0, limit: int = 20) -> tuple:
+        """find players matching query
+
+        :param query: words and an optional elo range (see class doc)
+        :param include: if given, only players in include are returned
+        :param exclude: players in exclude are not returned
+        :param offset: number of results to skip (pagination)
+        :param limit: max number of returned players
+
+        :return (list of players of the page, total number of results)"""
+        words, elo_min, elo_max = self.parse_query(query)
+
+        player_ids = None
+        if include is not None:
+            # include is expected to be small (players of a tournament),
+            # they are checked one by one
+            player_ids = {player.player_id for player in include
+                          if player.player_id in self.keys
+                          and all(self.match_word(player.player_id, word)
+                                  for word in words)}
+        else:
+            for word in words:
+                word_ids = self.find_word(word)
+                player_ids = word_ids if player_ids is None \
+                    else player_ids & word_ids
+                if not player_ids:
+                    return [], 0
+
+        if elo_min is not None or elo_max is not None:
+            if player_ids is None:
+                player_ids = self.find_elo_range(elo_min, elo_max)
+            else:
+                player_ids = {player_id for player_id in player_ids
+                              if (elo_min is None
+                                  or self.keys[player_id][1] >= elo_min)
+                              and (elo_max is None
+                                   or self.keys[player_id][1] <= elo_max)}
+
+        if player_ids is None:
+            ordered_ids = (player_id for _, player_id in self.sorted_names)
+            nb_results = len(self.keys)
+        else:
+            ordered_ids = self.sort_by_name(player_ids)
+            nb_results = len(ordered_ids)
+
+        if exclude is not None:
+            excluded = {player.player_id for player in exclude}
+            nb_results -= len(excluded & (self.keys.keys()
+                                          if player_ids is None
+                                          else player_ids))
+            ordered_ids = (player_id for player_id in ordered_ids
+                           if player_id not in excluded)
+
+        return ([self.players[player_id] for player_id
+                 in islice(ordered_ids, offset, offset + limit)],
+                nb_results)
+
+    def match_word(self, player_id: int, word: str) -> bool:
+        """same rule as find_word, for a single player"""
+        name = self.keys[player_id][0]
+        if len(word) < 3:
+            return any(token.startswith(word) for token in name.split())
+
+        return word in name
+
+    def sort_by_name(self, player_ids: set) -> list:
+        """:return player_ids ordered by name"""
+        if len(player_ids) * 8 > len(self.sorted_names):
+            # many results : filtering the sorted names is faster
+            return [player_id for _, player_id in self.sorted_names
+                    if player_id in player_ids]
+
+        return sorted(player_ids, key=lambda x: (self.keys[x][0], x))
@@ -0,0 +1,320 @@
+import copy
+from concurrent.futures import ProcessPoolExecutor
+import os
+import random
+from Model.match import Match
+from Model.pairing import GreedyPairing, PairingEngine
+from Model.player import Player
+from Model.report import Column, Report
+from Model.round import Round
+from Model.tournament import Tournament
+
+
+class Prediction:
+    """Final places of the players of a tournament, counted over runs
+
+    :param players: players of the tournament
+    :param nb_runs: number of simulated runs
+    :param places: dict as player_id: list of the number of runs
+                   ended at each place (first place first)
+    """
+
+    COLUMNS = (Column('N°', int),
+               Column('Joueur', Player, 30),
+               Column('ELO', int),
+               Column('1er (%)', float),
+               Column('Podium (%)', float),
+               Column('Place moyenne', float))
+
+    def __init__(self, players: list, nb_runs: int, places: dict):
+        self.players = players
+        self.nb_runs = nb_runs
+        self.places = places
+
+    def get_probabilities(self, player: Player) -> list:
+        """:return probability of player to end at each place"""
+        return [count / self.nb_runs
+                for count in self.places[player.player_id]]
+
+    def get_mean_place(self, player: Player) -> float:
+        """:return the average final place of player (from 1)"""
+        return sum(place * count for place, count
+                   in enumerate(self.places[player.player_id], start=1)) \
+            / self.nb_runs
+
+    def get_distance(self, other) -> float:
+        """:return the mean over players of the total variation distance
+        between their places in self and in other (0 if same, 1 if
+        players never end at the same places)"""
+        if not self.players:
+            return 0
+
+        distance = 0
+        for player in self.players:
+            distance += sum(abs(probability - other_probability)
+                            for probability, other_probability
+                            in zip(self.get_probabilities(player),
+                                   other.get_probabilities(player))) / 2
+
+        return distance / len(self.players)
+
+    def get_report(self) -> Report:
+        """:return a Report of players, by average final place"""
+        return Report(self.COLUMNS, self.generate_rows())
+
+    def generate_rows(self):
+        ordered_players = sorted(self.players, key=self.get_mean_place)
+        for index, player in enumerate(ordered_players, start=1):
+            probabilities = self.get_probabilities(player)
+            yield (index,
+                   player,
+                   player.elo,
+                   round(100 * probabilities[0], 1),
+                   round(100 * sum(probabilities[:3]), 1),
+                   round(self.get_mean_place(player), 2))
+
+
+class SimulatedTournament:
+    """Cheap state of a tournament played by simulated runs
+
+    Only what pairing engines and the ranking read is kept: players,
+    elos and ended rounds are shared by all the runs, points, history,
+    tie-breaks and the pending round are copied for each run (see copy),
+    so the Tournament is rebuilt once per batch instead of once per run.
+    Simulated results don't change elos (no rating).
+
+    :param tournament: a loaded Tournament (not modified)
+    """
+
+    def __init__(self, tournament: Tournament):
+        self.players = tournament.players
+        self.elos = tournament.elos
+        self.nb_rounds = tournament.nb_rounds
+        self.rounds = list(tournament.rounds)
+        self.points = tournament.points
+        self.history = tournament.history
+        self.tie_breaks = tournament.tie_breaks
+
+    def copy(self):
+        """:return a copy to play a run, sharing the ended rounds"""
+        state = copy.copy(self)
+        state.rounds = list(self.rounds)
+        state.points = dict(self.points)
+        state.history = self.history.copy()
+        state.tie_breaks = self.tie_breaks.copy()
+
+        last_round = state.get_last_round()
+        if last_round is not None and not last_round.is_ended():
+            state.rounds[-1] = Round(
+                last_round.name,
+                [Match(*match.get_players(), match.score1, match.score2)
+                 for match in last_round.matches],
+                last_round.start)
+
+        return state
+
+    def get_last_round(self) -> Round:
+        if self.rounds:
+            return self.rounds[-1]
+
+        return None
+
+    def get_ranking_key(self, player) -> tuple:
+        """:return the ranking key of player (see
+        Tournament.get_ranking_key)"""
+        return (-self.points[player],
+                *self.tie_breaks.get_key(player),
+                -self.elos[player],
+                self.history.get_index(player))
+
+    def get_players_ranked(self) -> list:
+        return sorted(self.players, key=self.get_ranking_key)
+
+    def play(self, pairing_engine: PairingEngine,
+             random_generator: random.Random):
+        """play pending matches and remaining rounds"""
+        last_round = self.get_last_round()
+        if last_round is not None and not last_round.is_ended():
+            self.play_round(last_round, random_generator)
+
+        while len(self.rounds) < self.nb_rounds and len(self.players) > 1:
+            new_round = Round(f"Round n°{len(self.rounds) + 1}")
+            self.rounds.append(new_round)
+            for player1, player2 in pairing_engine.create_pairs(
+                    self, self.get_players_ranked()):
+                new_round.add_match(Match(player1, player2))
+            self.play_round(new_round, random_generator)
+
+    def play_round(self, a_round: Round, random_generator: random.Random):
+        """draw the scores of the pending matches of a_round and record
+        its results (see Tournament.record_results)"""
+        for match in a_round.get_pending_matches():
+            match.set_score(*TournamentSimulator.get_scores(
+                match, random_generator))
+
+        round_results = Tournament.get_round_results(a_round)
+        for player1, player2, result1 in round_results:
+            self.points[player1] += result1
+            self.points[player2] += 1 - result1
+            self.history.add_match(player1, player2)
+
+        self.tie_breaks.record_round(round_results, self.points, self.elos)
+
+
+class TournamentSimulator:
+    """Predict the final ranking of a tournament by Monte-Carlo
+
+    Each run starts from the current state of the tournament: pending
+    matches and remaining rounds are played on a SimulatedTournament
+    (same standings and tie-breaks as a Tournament), results being
+    drawn from the elos of players (see get_scores). Remaining rounds
+    are paired by pairing_engine, a GreedyPairing by default: a
+    BlossomPairing of 60 players costs about 20 ms per round, see
+    get_pairing_sensitivity to know how much it would change.
+    Runs are cut in batches of BATCH_SIZE spread across the processes of
+    a ProcessPoolExecutor, kept until close: a worker receives the
+    tournament and its players serialized as dicts (cheap to send),
+    rebuilds them once per batch and only sends back the counts of
+    places. Each batch has its own seed, so a seed gives the same
+    prediction with any number of workers.
+
+    :param nb_workers: number of processes (number of cpus by default),
+                       1 to run in the current process
+    """
+
+    BATCH_SIZE = 50
+    DRAW_RATE = 0.2
+
+    # engine pairing the remaining rounds of simulated runs,
+    # may be replaced on an instance
+    pairing_engine = GreedyPairing()
+
+    def __init__(self, nb_workers: int = None):
+        self.nb_workers = nb_workers
+        if self.nb_workers is None:
+            self.nb_workers = os.cpu_count() or 1
+
+        self.executor = None
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        """:return the pool of worker processes (created on first use)"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.nb_workers)
+
+        return self.executor
+
+    def close(self):
+        """stop the worker processes"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def simulate(self, tournament: Tournament, nb_runs: int = 1000,
+                 seed=None, pairing_engine: PairingEngine = None) \
+            -> Prediction:
+        """simulate nb_runs times the end of tournament
+        (which is not modified)
+
+        :param pairing_engine: engine pairing the remaining rounds
+                               (pairing_engine of the simulator by
+                               default)
+        :return a Prediction"""
+        if pairing_engine is None:
+            pairing_engine = self.pairing_engine
+
+        serialized_players = {player.player_id: player.serialize()
+                              for player in tournament.players}
+        serialized_tournament = tournament.serialize()
+
+        seeds = random.Random(seed)
+        batches = []
+        for start in range(0, nb_runs, self.BATCH_SIZE):
+            batches.append((serialized_players, serialized_tournament,
+                            pairing_engine,
+                            min(self.BATCH_SIZE, nb_runs - start),
+                            seeds.getrandbits(64)))
+
+        if self.nb_workers == 1:
+            batch_places = [self.run_batch(*batch) for batch in batches]
+        else:
+            batch_places = list(self.get_executor().map(self.run_batch,
+                                                        *zip(*batches)))
+
+        places = {player.player_id: [0] * len(tournament.players)
+                  for player in tournament.players}
+        for batch in batch_places:
+            for player_id, counts in batch.items():
+                places[player_id] = [count + batch_count for count, batch_count
+                                     in zip(places[player_id], counts)]
+
+        return Prediction(tournament.players, nb_runs, places)
+
+    def get_pairing_sensitivity(self, tournament: Tournament,
+                                nb_runs: int = 1000, seed=None,
+                                pairing_engine: PairingEngine = None,
+                                prediction: Prediction = None) -> float:
+        """compare predictions made with the pairing engine of the
+        simulator and with another pairing engine (by default, the
+        pairing engine of tournament, which is much slower), with the
+        same seed
+
+        :param prediction: prediction already made by simulate with
+                           this seed (made again if None)
+        :return the distance between both predictions
+                (see Prediction.get_distance)"""
+        if pairing_engine is None:
+            pairing_engine = tournament.pairing_engine
+
+        if prediction is None:
+            prediction = self.simulate(tournament, nb_runs, seed)
+        other_prediction = self.simulate(tournament, nb_runs, seed,
+                                         pairing_engine)
+
+        return prediction.get_distance(other_prediction)
+
+    @staticmethod
+    def run_batch(serialized_players: dict, serialized_tournament: dict,
+                  pairing_engine: PairingEngine, nb_runs: int,
+                  seed: int) -> dict:
+        """play nb_runs times the end of a serialized tournament
+        (in a worker process)
+
+        :return a dict as player_id: list of number of runs ended
+                at each place"""
+        players_by_id = dict()
+        for player_id, serialized_player in serialized_players.items():
+            player = Player.deserialize(serialized_player)
+            player.player_id = player_id
+            players_by_id[player_id] = player
+
+        state = SimulatedTournament(Tournament.deserialize(
+            serialized_tournament, players_by_id))
+
+        random_generator = random.Random(seed)
+        places = {player_id: [0] * len(serialized_players)
+                  for player_id in serialized_players}
+
+        for _ in range(nb_runs):
+            run_state = state.copy()
+            run_state.play(pairing_engine, random_generator)
+
+            for place, player in enumerate(run_state.get_players_ranked()):
+                places[player.player_id][place] += 1
+
+        return places
+
+    @staticmethod
+    def get_scores(match: Match, random_generator: random.Random) -> tuple:
+        """:return random (score1, score2) of a match, player1 wins with
+        the expected score of the elo formula minus half of DRAW_RATE"""
+        player1, player2 = match.get_players()
+        expected = 1 / (1 + 10 ** ((player2.elo - player1.elo) / 400))
+        random_number = random_generator.random()
+        draw = TournamentSimulator.DRAW_RATE / 2
+
+        if random_number < expected - draw:
+            return 1, 0
+        if random_number < expected + draw:
+            return 1, 1
+
+        return 0, 1
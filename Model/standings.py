@@ -0,0 +1,81 @@
+from bisect import bisect_left, bisect_right
+
+
+class Standings:
+    """Players of a tournament kept sorted by rank
+
+    The ranking key of each player is computed by key_function and the
+    keys are kept in a sorted list, updated in place (bisect) when the
+    points or the elo of a player change. update_many (after a round)
+    only moves the players whose key changed, or sorts the ranking
+    again at once when most of them changed (each move shifts the whole
+    list). Rank lookups are O(log n), top-N and score groups are slices.
+
+    :param key_function: function player -> sortable key, the first item
+                         of the key must be minus the points of the player
+                         (smaller key is better rank)
+    """
+
+    def __init__(self, key_function):
+        self.key_function = key_function
+        self.keys = []
+        self.players = []
+        self.player_keys = dict()
+
+    def add(self, player):
+        self.insert(player, self.key_function(player))
+
+    def insert(self, player, key):
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.players.insert(position, player)
+        self.player_keys[player] = key
+
+    def remove(self, player):
+        key = self.player_keys.pop(player)
+        position = bisect_left(self.keys, key)
+        del self.keys[position]
+        del self.players[position]
+
+    def update(self, player):
+        """move player according to his new points/elo"""
+        key = self.key_function(player)
+        if key != self.player_keys[player]:
+            self.remove(player)
+            self.insert(player, key)
+
+    def update_many(self, players):
+        """move players according to their new points/elos"""
+        changed = []
+        for player in players:
+            key = self.key_function(player)
+            if key != self.player_keys[player]:
+                changed.append((player, key))
+
+        if 2 * len(changed) > len(self.players):
+            for player, key in changed:
+                self.player_keys[player] = key
+            self.players.sort(key=self.player_keys.__getitem__)
+            self.keys = [self.player_keys[player] for player in self.players]
+        else:
+            for player, key in changed:
+                self.remove(player)
+                self.insert(player, key)
+
+    def get_ranked(self) -> list:
+        """:return a list of all players ordered by rank"""
+        return list(self.players)
+
+    def get_rank(self, player) -> int:
+        """:return the rank of player (starting at 1)"""
+        return bisect_left(self.keys, self.player_keys[player]) + 1
+
+    def get_top(self, number: int) -> list:
+        """:return the number first players"""
+        return self.players[:number]
+
+    def get_score_group(self, points) -> list:
+        """:return players with given points, ordered by rank"""
+        start = bisect_left(self.keys, (-points,))
+        end = bisect_right(self.keys, (-points, float('inf')))
+        return self.players[start:end]
@@ -0,0 +1,109 @@
+class TieBreaks:
+    """FIDE tie-breaks of the players of a tournament
+
+    Values are updated incrementally by record_round, once per ended
+    round, in O(sum of the number of games of players whose score
+    changed), instead of being recomputed from all the matches:
+        Buchholz: sum of the points of the opponents
+        Sonneborn-Berger: sum of the points of beaten opponents
+                          + half the points of drawn opponents
+        progressive: sum of the points after each round
+        performance: average elo of the opponents
+                     + 400 * (wins - losses) / games
+    Elos of opponents are the ones given to record_round (elos at the
+    start of the tournament), not the current ones.
+    """
+
+    NAMES = ("Buchholz", "S-B", "Progressif", "Perf.")
+    TYPES = (float, float, float, int)
+
+    def __init__(self):
+        # player: list of (opponent, result of player)
+        self.results = dict()
+        self.buchholz = dict()
+        self.sonneborn_berger = dict()
+        self.progressive = dict()
+        self.opponents_elo = dict()
+        self.score = dict()
+
+    def add_player(self, player):
+        if player not in self.results:
+            self.results[player] = []
+            self.buchholz[player] = 0
+            self.sonneborn_berger[player] = 0
+            self.progressive[player] = 0
+            self.opponents_elo[player] = 0
+            self.score[player] = 0
+
+    def copy(self):
+        """:return an independent copy of the tie-breaks"""
+        tie_breaks = TieBreaks()
+        tie_breaks.results = {player: list(results)
+                              for player, results in self.results.items()}
+        tie_breaks.buchholz = dict(self.buchholz)
+        tie_breaks.sonneborn_berger = dict(self.sonneborn_berger)
+        tie_breaks.progressive = dict(self.progressive)
+        tie_breaks.opponents_elo = dict(self.opponents_elo)
+        tie_breaks.score = dict(self.score)
+
+        return tie_breaks
+
+    def record_round(self, round_results: list, points: dict, elos: dict):
+        """update tie-breaks with the results of an ended round
+
+        :param round_results: a list of (player1, player2, result of
+                              player1) of the round
+        :param points: dict as player:points, including this round
+        :param elos: dict as player:elo at the start of the tournament
+        """
+        deltas = dict()
+
+        # new games are counted with the points before this round
+        for player1, player2, result1 in round_results:
+            result2 = 1 - result1
+            deltas[player1] = result1
+            deltas[player2] = result2
+
+            for player, opponent, result in ((player1, player2, result1),
+                                             (player2, player1, result2)):
+                opponent_points = points[opponent] - deltas[opponent]
+                self.buchholz[player] += opponent_points
+                self.sonneborn_berger[player] += result * opponent_points
+                self.opponents_elo[player] += elos[opponent]
+                self.score[player] += result
+                self.results[player].append((opponent, result))
+
+        # then points won this round are given to all opponents
+        for player, delta in deltas.items():
+            if delta == 0:
+                continue
+            for opponent, result in self.results[player]:
+                self.buchholz[opponent] += delta
+                self.sonneborn_berger[opponent] += (1 - result) * delta
+
+        for player, player_points in points.items():
+            self.progressive[player] += player_points
+
+    def get_performance(self, player) -> int:
+        """:return the performance rating of player (0 without game)"""
+        nb_games = len(self.results[player])
+        if nb_games == 0:
+            return 0
+
+        return round((self.opponents_elo[player]
+                      + 400 * (2 * self.score[player] - nb_games))
+                     / nb_games)
+
+    def get_key(self, player) -> tuple:
+        """:return tie-breaks of player as a sortable key
+        (smaller is better)"""
+        return (-self.buchholz[player],
+                -self.sonneborn_berger[player],
+                -self.progressive[player])
+
+    def get_values(self, player) -> tuple:
+        """:return tie-breaks of player, in NAMES order"""
+        return (self.buchholz[player],
+                self.sonneborn_berger[player],
+                self.progressive[player],
+                self.get_performance(player))
@@ -3,6 +3,12 @@ from datetime import date, datetime
 from Model.player import Player
 from Model.round import Round
 from Model.match import Match
+from Model.pairing import BlossomPairing
+from Model.rating import EloRating
+from Model.history import OpponentHistory
+from Model.standings import Standings
+from Model.tiebreaks import TieBreaks
+from Model.report import Column, Report
 
 
 class Tournament(Serializable):
@@ -19,9 +25,41 @@ class Tournament(Serializable):
             :param rounds : list of rounds
             :param points : dict as player:points
             :param already_played : dict as player:list of players
+                                    (kept as an OpponentHistory)
+            :param elos : dict as player:elo at the start of the tournament
+                          (when he signed in, current elos by default),
+                          used by tie-breaks and ranking, so they don't
+                          change when elos of players are updated
+
+        Observers (see add_observer) are called after each add_player,
+        launch_new_round and set_a_score with the data needed to replay it.
+        Elos of players are updated when the last round ends (see rate),
+        rated records it so a tournament is never rated twice.
             """
 
     time_control_types = ("bullet", "blitz", "coup rapide")
+
+    # columns of reports (see get_..._to_display)
+    RANKING_COLUMNS = (Column('N°', int),
+                       Column('Joueur', Player, 30),
+                       Column('ELO', int),
+                       Column('Points', float),
+                       *(Column(name, a_type) for name, a_type
+                         in zip(TieBreaks.NAMES, TieBreaks.TYPES)))
+    ROUNDS_COLUMNS = (Column('N°', int),
+                      Column('Round', str),
+                      Column('Durée', str),
+                      Column('Statut', str))
+    MATCHES_COLUMNS = (Column('N°', int),
+                       Column('Match', str, 60),
+                       Column('Round', str),
+                       Column('Score', str))
+
+    # engine used to pair players, may be replaced on an instance
+    pairing_engine = BlossomPairing()
+    # engine rating ended tournaments, may be replaced on an instance
+    # (None to not rate it)
+    rating = EloRating()
     # BULLET = 0
     # BLITZ = 1
     # COUPRAPIDE = 2
@@ -53,15 +91,16 @@ class Tournament(Serializable):
                  players=None,
                  rounds=None,
                  points=None,
-                 already_played=None):
+                 already_played=None,
+                 elos=None):
 
         self.name = name
         self.place = place
 
-        # if dates are str, convert them
+        # if dates are str, convert them (without modifying given list)
         if isinstance(dates[0], str):
-            for index, a_date in enumerate(dates):
-                dates[index] = datetime.strptime(a_date, '%d/%m/%y')
+            dates = [datetime.strptime(a_date, '%d/%m/%y')
+                     for a_date in dates]
         self.dates = dates
 
         # time control can be indicated as index in tuple or directly string
@@ -91,12 +130,35 @@ class Tournament(Serializable):
             for player in self.players:
                 self.points[player] = 0
 
-        self.already_played = already_played
+        self.elos = elos
+        if self.elos is None:
+            self.elos = {player: player.elo for player in self.players}
 
-        if self.already_played is None:
-            self.already_played = dict()
-            for player in self.players:
-                self.already_played[player] = []
+        self.history = self.create_history(self.players, already_played)
+        self.tie_breaks = self.create_tie_breaks()
+        self.standings = self.create_standings()
+
+        # True once elos of players are updated with the results
+        self.rated = False
+        # changes of the last rate, as player: RatingChange
+        self.rating_changes = dict()
+
+        self.id_in_db = None
+        self._dirty = True
+
+        # False while only header datas are loaded (see hydrate)
+        self.is_loaded = True
+        self.nb_players_in_db = 0
+
+        self.observers = []
+
+    def set_dirty(self, dirty: bool = True):
+        """flag the tournament as modified, a saved tournament means
+        all its rounds are saved too"""
+        self._dirty = dirty
+        if not dirty:
+            for a_round in self.rounds:
+                a_round.set_dirty(False)
 
     def serialize(self):
 
@@ -106,7 +168,7 @@ class Tournament(Serializable):
 
         serialized_players = []
         for player in self.players:
-            serialized_players.append(player.id_in_db)
+            serialized_players.append(player.player_id)
 
         serialized_rounds = []
         for a_round in self.rounds:
@@ -114,35 +176,80 @@ class Tournament(Serializable):
 
         serialized_points = dict()
         for player, point in self.points.items():
-            serialized_points[player.id_in_db] = point
+            serialized_points[player.player_id] = point
+
+        serialized_elos = dict()
+        for player, elo in self.elos.items():
+            serialized_elos[player.player_id] = elo
 
         serialized_already_played = dict()
-        for player, players in self.already_played.items():
-            serialized_already_played[player.id_in_db] = []
-            for already_played in players:
-                serialized_already_played[player.id_in_db].\
-                    append(already_played.id_in_db)
+        for player in self.players:
+            serialized_already_played[player.player_id] = []
+            for already_played in self.history.get_opponents(player):
+                serialized_already_played[player.player_id].\
+                    append(already_played.player_id)
 
         serialized_tournament = {'name': self.name, 'place': self.place,
                                  'dates': serialized_dates,
                                  'time_control': self.time_control,
                                  'nb_rounds': self.nb_rounds,
                                  'description': self.description,
+                                 'rated': self.rated,
                                  'players': serialized_players,
                                  'rounds': serialized_rounds,
                                  'points': serialized_points,
+                                 'elos': serialized_elos,
                                  'already_played': serialized_already_played}
 
         return serialized_tournament
 
     @staticmethod
     def deserialize(serialized_tournament, players_by_id: dict = None):
+        tournament = Tournament.deserialize_header(
+            serialized_tournament, len(serialized_tournament['players']))
+        tournament.hydrate(serialized_tournament, players_by_id)
+
+        return tournament
+
+    @staticmethod
+    def deserialize_header(serialized_tournament, nb_players: int):
+        """create a not loaded Tournament with only its header datas
+        (name, place, dates, time control...), players, rounds and points
+        will be added by hydrate method
+
+        :param serialized_tournament: a dict of string
+        :param nb_players: number of players signed in the tournament
+
+        :return a new Tournament instance"""
         name = serialized_tournament['name']
         place = serialized_tournament['place']
         dates = serialized_tournament['dates']
         time_control = serialized_tournament['time_control']
         nb_rounds = serialized_tournament['nb_rounds']
         description = serialized_tournament['description']
+
+        tournament = Tournament(name,
+                                place,
+                                dates,
+                                time_control,
+                                nb_rounds,
+                                description)
+        # tournaments saved before ratings have no 'rated'
+        tournament.rated = serialized_tournament.get('rated', False)
+        tournament.id_in_db = getattr(serialized_tournament, 'doc_id', None)
+        tournament.is_loaded = False
+        tournament.nb_players_in_db = nb_players
+        tournament.set_dirty(False)
+
+        return tournament
+
+    def hydrate(self, serialized_tournament, players_by_id: dict):
+        """load players, rounds, points, elos and already_played
+        of a tournament created by deserialize_header
+
+        :param serialized_tournament: a dict of string
+        :param players_by_id: a dict to pick players instances
+        """
         players_id = serialized_tournament['players']
         players = []
 
@@ -175,15 +282,89 @@ class Tournament(Serializable):
 
             already_played[players_by_id[int(player_id)]] = list_already_played
 
-        return Tournament(name,
-                          place,
-                          dates,
-                          time_control,
-                          nb_rounds,
-                          description,
-                          players,
-                          rounds,
-                          points)
+        # tournaments saved before elos (or players signed in before)
+        # have no elo, their current elo is taken
+        elos = {player: player.elo for player in players}
+        for player_id, elo in serialized_tournament.get('elos', {}).items():
+            if elo is not None:
+                elos[players_by_id[int(player_id)]] = elo
+
+        self.players = players
+        self.rounds = rounds
+        self.points = points
+        self.elos = elos
+        self.history = self.create_history(players, already_played)
+        self.tie_breaks = self.create_tie_breaks()
+        self.standings = self.create_standings()
+        self.is_loaded = True
+        self.set_dirty(False)
+
+    @staticmethod
+    def create_history(players: list, already_played: dict = None):
+        """create the OpponentHistory of a tournament
+
+        :param players: players signed in the tournament
+        :param already_played: dict as player:list of players
+
+        :return an OpponentHistory"""
+        history = OpponentHistory()
+        for player in players:
+            history.add_player(player)
+
+        if already_played is not None:
+            for player, opponents in already_played.items():
+                for opponent in opponents:
+                    history.add_match(player, opponent)
+
+        return history
+
+    def create_tie_breaks(self):
+        """create the TieBreaks of signed in players
+        by replaying results of ended rounds"""
+        tie_breaks = TieBreaks()
+        points = dict()
+        for player in self.players:
+            tie_breaks.add_player(player)
+            points[player] = 0
+
+        for a_round in self.rounds:
+            if a_round.is_ended():
+                round_results = self.get_round_results(a_round)
+                for player1, player2, result1 in round_results:
+                    points[player1] += result1
+                    points[player2] += 1 - result1
+                tie_breaks.record_round(round_results, points, self.elos)
+
+        return tie_breaks
+
+    @staticmethod
+    def get_round_results(a_round: Round) -> list:
+        """:return a list of (player1, player2, result of player1)"""
+        round_results = []
+        for match in a_round.matches:
+            player1, player2 = match.get_players()
+            round_results.append((player1, player2,
+                                  match.calculate_result()))
+
+        return round_results
+
+    def create_standings(self):
+        """create the Standings of signed in players
+        (history and tie-breaks must be created before)"""
+        standings = Standings(self.get_ranking_key)
+        for player in self.players:
+            standings.add(player)
+
+        return standings
+
+    def get_ranking_key(self, player) -> tuple:
+        """:return the key used to rank player in standings
+        (by points, then tie-breaks, then elo at the start, then signing
+        order)"""
+        return (-self.points[player],
+                *self.tie_breaks.get_key(player),
+                -self.elos[player],
+                self.history.get_index(player))
 
     def __repr__(self):
         return self.name
@@ -191,12 +372,67 @@ class Tournament(Serializable):
     def __str__(self):
         return self.name + " à " + self.place \
                + " à partir du " + self.dates[0].strftime('%d/%m/%y') \
-               + f"\n({len(self.players)} joueurs inscrits)\n"
+               + f"\n({self.get_nb_players()} joueurs inscrits)\n"
+
+    def get_nb_players(self) -> int:
+        if self.is_loaded:
+            return len(self.players)
+
+        return self.nb_players_in_db
+
+    def add_observer(self, observer):
+        """register a function called on each modification as
+        observer(tournament, action: str, datas: dict)"""
+        self.observers.append(observer)
+
+    def notify(self, action: str, datas: dict):
+        for observer in self.observers:
+            observer(self, action, datas)
+
+    def add_player(self, player: Player, elo: int = None):
+        """sign in player
+
+        :param elo: elo of player at the start of the tournament
+                    (his current elo by default)"""
+        if elo is None:
+            elo = player.elo
 
-    def add_player(self, player: Player):
         self.players.append(player)
         self.points[player] = 0
-        self.already_played[player] = []
+        self.elos[player] = elo
+        self.history.add_player(player)
+        self.tie_breaks.add_player(player)
+        self.standings.add(player)
+        self.set_dirty()
+
+        self.notify('add_player', {'player': player.player_id, 'elo': elo})
+
+    def add_round(self, new_round: Round):
+        """append an already built round (used to restore a round)"""
+        self.rounds.append(new_round)
+        new_round.set_dirty()
+        self.set_dirty()
+
+    def check_new_round(self):
+        """check if a new round can be launched
+
+        :return a message explaining why a new round can't be launched
+                or None if it can be"""
+        # check if there is no not-ended round
+        last_round = self.get_last_round()
+        if last_round is not None and not last_round.is_ended():
+            return "Vous ne pouvez pas lancer de nouveau Round, " \
+                   "tous les matchs ne sont pas terminés."
+
+        if len(self.rounds) == self.nb_rounds:
+            return "Vous ne pouvez pas lancer de nouveau Round, " \
+                   "ce tournoi est terminé."
+
+        if len(self.players) < 2:
+            return "Vous ne pouvez pas lancer de nouveau Round, " \
+                   "il n'y a pas suffisamment de joueurs."
+
+        return None
 
     def launch_new_round(self) -> Round:
         """create a new round and record results of previous round
@@ -205,91 +441,32 @@ class Tournament(Serializable):
 
         round_id = len(self.rounds) + 1
         new_round = Round(f"Round n°{round_id}")
-        self.rounds.append(new_round)
+        self.add_round(new_round)
 
         ranked_players = self.get_players_ranked()
 
-        possible_opponents = dict()
+        self.create_matches(new_round, ranked_players)
 
-        for player in ranked_players:
-            # all players not already played can be opponents
-            possible_opponents[player] = \
-                list(set(ranked_players)
-                     - set(self.already_played[player]))
+        self.notify('launch_new_round', new_round.serialize())
 
-            # but a player can't play against himself
-            possible_opponents[player].remove(player)
+        return new_round
 
-        return self.create_matches(new_round,
-                                   ranked_players,
-                                   possible_opponents)
-
-    def create_matches(self, next_round: Round,
-                       ranked_players: list,
-                       possible_opponents: dict):
-        """recursive method to find the best matches
+    def create_matches(self, next_round: Round, ranked_players: list):
+        """find the best matches with the pairing engine
         and add them to the Round given in parameters
 
             :param next_round Round containing all created matches
             :param ranked_players (a list of players,
                         ordered by rank in the tournament)
-            :param possible_opponents a dict as
-                        player: list of possible opponents
 
             :return next_round: the round with created matches
 
         """
+        for player1, player2 in self.pairing_engine.create_pairs(
+                self, ranked_players):
+            next_round.add_match(Match(player1, player2))
 
-        if len(ranked_players) < 2:
-            # if ranked_players = 0 ou 1 stop searching
-            return next_round
-
-        new_match = None
-
-        if len(ranked_players) == 2:
-            # if ranked_players = 2 associate them
-            new_match = Match(ranked_players[0],
-                              ranked_players[1])
-            next_round.add_match(new_match)
-            return next_round
-
-        # if a player as a unique possible opponent, create the match
-        for player in ranked_players:
-            if len(possible_opponents[player]) == 1:
-                opponent = possible_opponents[player][0]
-                new_match = Match(player, opponent)
-                break
-
-        if new_match is None:
-            player = ranked_players[0]
-            # for first round 1st player match with 1st of second half players
-            # for next rounds 1st player match with 2nd player (if possible)
-            if len(self.rounds) == 1:
-                nb_players = len(ranked_players)
-                opponent_ranking = round(nb_players / 2)
-                opponent = ranked_players[opponent_ranking]
-                new_match = Match(player, opponent)
-            else:
-                for opponent in ranked_players:
-                    if opponent in possible_opponents[player]:
-                        new_match = Match(player, opponent)
-                        break
-
-        if new_match is None:
-            print("Cela ne devrait pas se produire!")
-            return next_round
-        else:
-            next_round.add_match(new_match)
-            # remove player in new match from all lists
-            for player in new_match.get_players():
-                ranked_players.remove(player)
-                possible_opponents.pop(player)
-                for possible in possible_opponents.values():
-                    if player in possible:
-                        possible.remove(player)
-
-            return self.create_matches(next_round, ranked_players,
-                                       possible_opponents)
+        return next_round
 
     def get_players_ranked(self):
         """ Method to return a ordered list of players
@@ -298,9 +475,16 @@ class Tournament(Serializable):
                 ranked by points in the tournament then by elo
         """
 
-        return sorted(self.players,
-                      key=lambda x: (self.points[x], x.elo),
-                      reverse=True)
+        return self.standings.get_ranked()
+
+    def update_player(self, player: Player):
+        """update standings after a modification of player, and his elo
+        at the start of the tournament while no round is launched"""
+        if player in self.points:
+            if not self.rounds and self.elos[player] != player.elo:
+                self.elos[player] = player.elo
+                self.set_dirty()
+            self.standings.update(player)
 
     def get_players_ranked_by_name(self):
         """ Method to return a ordered list of players
@@ -312,83 +496,108 @@ class Tournament(Serializable):
         return sorted(self.players,
                       key=lambda x: (x.family_name.title()))
 
-    def get_ranking_to_display(self, b_by_points: bool = True) -> list:
-        """ Method to return dict of players in order to be displayed
+    def get_ranking_to_display(self, b_by_points: bool = True) -> Report:
+        """ Method to return the ranking of players in order to be displayed
         ordered by points or by name depending on b_by_points parameters
 
         :param b_by_points: True > players are ordered by points
                             False > players are ordered by Name
 
-        :return: a dict with keys : N° (index), Player, ELO, Points
+        :return: a Report with columns : N° (index), Player, ELO (at the
+                 start of the tournament), Points and tie-breaks
+                 (TieBreaks.NAMES)
         """
         if b_by_points:
             ordered_players = self.get_players_ranked()
         else:
             ordered_players = self.get_players_ranked_by_name()
 
-        ranking = []
+        return Report(self.RANKING_COLUMNS,
+                      self.generate_ranking(ordered_players))
 
+    def generate_ranking(self, ordered_players: list):
         for index, player in enumerate(ordered_players, start=1):
-            rank = dict()
-            rank['N°'] = index
-            rank['Joueur'] = player
-            rank['ELO'] = player.elo
-            rank['Points'] = self.points[player]
-            ranking.append(rank)
-
-        return ranking
+            yield (index, player, self.elos[player], self.points[player],
+                   *self.tie_breaks.get_values(player))
 
-    def get_all_rounds_to_display(self):
-        table = []
+    def get_all_rounds_to_display(self) -> Report:
+        return Report(self.ROUNDS_COLUMNS, self.generate_all_rounds())
 
+    def generate_all_rounds(self):
         for index, a_round in enumerate(self.rounds, start=1):
-            rank = dict()
-            rank['N°'] = index
-            rank['Round'] = a_round.name
-            rank['Durée'] = a_round.get_duration()
-            rank["Statut"] = "Terminé" if a_round.is_ended() else "En cours"
-            table.append(rank)
+            yield (index,
+                   a_round.name,
+                   a_round.get_duration(),
+                   "Terminé" if a_round.is_ended() else "En cours")
 
-        return table
+    def get_all_matches_to_display(self) -> Report:
+        return Report(self.MATCHES_COLUMNS, self.generate_all_matches())
 
-    def get_all_matches_to_display(self):
-        table = []
-        matches = []
-
-        last_index = 0
+    def generate_all_matches(self):
+        index = 0
         for a_round in self.rounds:
-            matches.extend(a_round.matches)
-            for index, match in enumerate(a_round.matches,
-                                          start=last_index + 1):
-                rank = dict()
-                rank['N°'] = index
-                rank['Match'] = repr(match)
-                rank['Round'] = a_round.name
-                rank['Score'] = match.get_score()
-                table.append(rank)
-                last_index = index
-
-        return table
+            for match in a_round.matches:
+                index += 1
+                yield index, repr(match), a_round.name, match.get_score()
 
     def set_a_score(self, match, score1, score2):
+        """record the score of a match of the last round,
+        and its results once the round is ended"""
         last_round = self.get_last_round()
 
+        # results of an ended round are already recorded
+        if last_round is None or last_round.is_ended():
+            raise Exception("Ce round est terminé, "
+                            "vous ne pouvez plus le modifier.")
+
         round_ended = last_round.set_score(match, score1, score2)
+        self.set_dirty()
+
+        position = last_round.get_match_position(match)
+        self.notify('set_a_score', {'match': position,
+                                    'score1': score1,
+                                    'score2': score2})
 
         if round_ended:
             self.record_results()
 
     def record_results(self):
         """record result of last round"""
-        for match in self.get_last_round().matches:
-            player1, player2 = match.get_players()
-            self.points[player1] += match.get_result(player1)
-            self.points[player2] += match.get_result(player2)
-            self.already_played[player1].append(player2)
-            self.already_played[player2].append(player1)
+        round_results = self.get_round_results(self.get_last_round())
+
+        for player1, player2, result1 in round_results:
+            self.points[player1] += result1
+            self.points[player2] += 1 - result1
+            self.history.add_match(player1, player2)
+
+        self.tie_breaks.record_round(round_results, self.points, self.elos)
+
+        # tie-breaks of opponents change too
+        self.standings.update_many(self.players)
+
+        if self.is_ended() and not self.rated and self.rating is not None:
+            self.rate()
+
+    def rate(self) -> dict:
+        """update elos and rating histories of players with the results
+        of the tournament (once the last round is ended)
+
+        :return a dict as player: RatingChange, kept as rating_changes"""
+        self.rating_changes = self.rating.rate_tournament(self)
+        self.rated = True
+        self.set_dirty()
+
+        return self.rating_changes
 
     def get_last_round(self) -> Round:
         if self.rounds:
             return self.rounds[-1]
 
         return None
+
+    def is_ended(self) -> bool:
+        """:return True if all the rounds of the tournament are played"""
+        last_round = self.get_last_round()
+
+        return len(self.rounds) == self.nb_rounds \
+            and last_round is not None and last_round.is_ended()
@@ -0,0 +1,44 @@
+import argparse
+from datetime import datetime
+import json
+import platform
+from benchmark.bench import Benchmark
+
+
+def parse_sizes(sizes: str) -> list:
+    """:return a list of int from a comma separated string"""
+    return [int(size) for size in sizes.split(',')]
+
+
+parser = argparse.ArgumentParser(
+    prog="python -m benchmark",
+    description="Mesure les performances du manager sur des tournois "
+                "générés (appariements, résultats, rapports, sauvegarde "
+                "et chargement)")
+parser.add_argument('--players', type=parse_sizes,
+                    default=[10, 100, 1000, 5000], metavar='N,N...',
+                    help="nombres de joueurs (défaut : 10,100,1000,5000)")
+parser.add_argument('--rounds', type=parse_sizes, default=[5, 15],
+                    metavar='N,N...',
+                    help="nombres de rounds (défaut : 5,15)")
+parser.add_argument('--seed', type=int, default=0,
+                    help="graine du générateur aléatoire (défaut : 0)")
+parser.add_argument('--output', default='benchmark.json', metavar='FICHIER',
+                    help="fichier json des résultats "
+                         "(défaut : benchmark.json)")
+arguments = parser.parse_args()
+
+sizes = [(nb_players, nb_rounds)
+         for nb_players in arguments.players
+         for nb_rounds in arguments.rounds]
+
+results = {'date': datetime.now().replace(microsecond=0).isoformat(),
+           'python': platform.python_version(),
+           'platform': platform.platform(),
+           'seed': arguments.seed,
+           'results': Benchmark(arguments.seed).run(sizes, print)}
+
+with open(arguments.output, 'w', encoding='utf-8') as output:
+    json.dump(results, output, indent=2)
+
+print(f"Résultats enregistrés dans {arguments.output}")
@@ -0,0 +1,174 @@
+from contextlib import contextmanager
+from pathlib import Path
+import tempfile
+import time
+from Model.rating import EloRating
+from Model.registry import PlayerRegistry
+from benchmark.generator import TournamentGenerator
+from controller.controller import Controller
+from controller.serializer import Serializer
+from controller.snapshotserializer import SnapshotSerializer
+from controller.sqliteserializer import SQLiteSerializer
+
+
+class Timings:
+    """Durations (in seconds) of named operations, measured with
+    perf_counter, an operation can be measured several times"""
+
+    def __init__(self):
+        self.durations = dict()
+
+    @contextmanager
+    def measure(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations.setdefault(name, []).append(
+                time.perf_counter() - start)
+
+    def summarize(self) -> dict:
+        """:return a dict as name: {count, total, mean, min, max}"""
+        summary = dict()
+        for name, durations in self.durations.items():
+            summary[name] = {'count': len(durations),
+                             'total': sum(durations),
+                             'mean': sum(durations) / len(durations),
+                             'min': min(durations),
+                             'max': max(durations)}
+
+        return summary
+
+
+class Benchmark:
+    """Time the main operations of the manager on synthetic tournaments
+
+    For each size (number of players, number of rounds), a tournament is
+    generated and played round by round, timing launch_new_round and
+    record_results, then the rating of the tournament, the report builders
+    and player searches, then a full save and load with each storage
+    backend (in a temporary directory).
+
+    :param seed: seed of the TournamentGenerator
+    """
+
+    BACKENDS = {'tinydb': (Serializer, 'db.json'),
+                'sqlite': (SQLiteSerializer, 'db.sqlite'),
+                'snapshot': (SnapshotSerializer, 'db.snapshot')}
+
+    def __init__(self, seed=None):
+        self.seed = seed
+
+    def run(self, sizes: list, log=None) -> list:
+        """run the benchmark for each (nb_players, nb_rounds) of sizes
+
+        :param log: a function called with a message after each size
+        :return a list of dict as {players, rounds, timings}"""
+        results = []
+
+        for nb_players, nb_rounds in sizes:
+            timings = self.run_size(nb_players, nb_rounds)
+            results.append({'players': nb_players,
+                            'rounds': nb_rounds,
+                            'timings': timings.summarize()})
+            if log is not None:
+                total = sum(sum(durations)
+                            for durations in timings.durations.values())
+                log(f"{nb_players} joueurs, {nb_rounds} rounds : "
+                    f"{total:.3f} s")
+
+        return results
+
+    def run_size(self, nb_players: int, nb_rounds: int) -> Timings:
+        timings = Timings()
+        generator = TournamentGenerator(self.seed)
+        registry = PlayerRegistry()
+
+        players = generator.create_players(registry, nb_players)
+        tournament = generator.create_tournament(players, nb_rounds)
+
+        for _ in range(nb_rounds):
+            with timings.measure('launch_new_round'):
+                new_round = tournament.launch_new_round()
+
+            generator.play_round(new_round)
+            tournament.set_dirty()
+
+            with timings.measure('record_results'):
+                tournament.record_results()
+
+        with timings.measure('rating.rate_tournament'):
+            EloRating().rate_tournament(tournament)
+
+        self.run_reports(timings, registry, tournament)
+
+        for name, (serializer_class, file_name) in self.BACKENDS.items():
+            self.run_backend(timings, name, serializer_class, file_name,
+                             registry, tournament)
+
+        return timings
+
+    @staticmethod
+    def run_reports(timings: Timings, registry: PlayerRegistry, tournament):
+        """reports are lazy, their rows are read to be timed"""
+        with timings.measure('report.ranking_by_points'):
+            list(tournament.get_ranking_to_display())
+        with timings.measure('report.ranking_by_name'):
+            list(tournament.get_ranking_to_display(False))
+        with timings.measure('report.all_rounds'):
+            list(tournament.get_all_rounds_to_display())
+        with timings.measure('report.all_matches'):
+            list(tournament.get_all_matches_to_display())
+        with timings.measure('report.actors_by_elo'):
+            list(Controller.create_player_dict_list(
+                sorted(registry.get_players(),
+                       key=lambda x: x.elo,
+                       reverse=True)))
+        with timings.measure('search.by_name'):
+            registry.search("ma", exclude=tournament.points)
+        with timings.measure('search.by_elo'):
+            registry.search("1500-1800", exclude=tournament.points)
+
+    @staticmethod
+    def run_backend(timings: Timings, name: str, serializer_class,
+                    file_name: str, registry: PlayerRegistry, tournament):
+        """save players and tournament in a new database, then load them
+        with a new serializer instance"""
+        players = registry.get_players()
+        for player in players:
+            player.set_dirty()
+        tournament.set_dirty()
+        tournament.id_in_db = None
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / file_name)
+
+            serializer = serializer_class(path)
+            with timings.measure(f'{name}.save_players'):
+                serializer.save_players(players)
+            with timings.measure(f'{name}.save_tournaments'):
+                serializer.save_tournaments([tournament])
+            with timings.measure(f'{name}.flush'):
+                serializer.flush()
+            Benchmark.close(serializer)
+
+            serializer = serializer_class(path)
+            with timings.measure(f'{name}.load_players'):
+                loaded_registry = PlayerRegistry(serializer.load_players())
+            with timings.measure(f'{name}.load_tournaments'):
+                loaded_tournaments = serializer.load_tournaments(
+                    loaded_registry.get_players())
+            with timings.measure(f'{name}.load_tournament_details'):
+                serializer.load_tournament_details(
+                    loaded_tournaments[0], loaded_registry.players_by_id)
+            Benchmark.close(serializer)
+
+    @staticmethod
+    def close(serializer):
+        """release the database file (needed to remove it on Windows)"""
+        if isinstance(serializer, Serializer):
+            serializer.db.close()
+        elif isinstance(serializer, SQLiteSerializer):
+            serializer.connection.close()
+        else:
+            serializer.close()
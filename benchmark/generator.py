@@ -0,0 +1,91 @@
+from datetime import date, timedelta
+import random
+from Model.player import Player
+from Model.registry import PlayerRegistry
+from Model.round import Round
+from Model.simulation import TournamentSimulator
+from Model.tournament import Tournament
+
+
+class TournamentGenerator:
+    """Build synthetic players and tournaments with the Model API
+
+    Everything is drawn from a seeded random generator, so a seed always
+    gives the same players, pairings and results (and comparable
+    benchmarks).
+    Results follow the elo of players, like the results of the
+    simulations (see TournamentSimulator.get_scores).
+
+    :param seed: seed of the random generator
+    """
+
+    FAMILY_NAMES = ("Martin", "Bernard", "Dubois", "Thomas", "Robert",
+                    "Richard", "Petit", "Durand", "Leroy", "Moreau",
+                    "Simon", "Laurent", "Lefebvre", "Michel", "Garcia")
+    FIRST_NAMES = ("Jean", "Marie", "Pierre", "Sophie", "Louis",
+                   "Camille", "Paul", "Julie", "Hugo", "Léa",
+                   "Lucas", "Emma", "Nathan", "Chloé", "Théo")
+
+    ELO_MEAN = 1600
+    ELO_DEVIATION = 300
+    ELO_MIN = 1000
+    ELO_MAX = 2800
+
+    def __init__(self, seed=None):
+        self.random = random.Random(seed)
+        self.nb_players = 0
+
+    def create_player(self) -> Player:
+        """:return a new (not registered) random Player"""
+        self.nb_players += 1
+        elo = round(self.random.gauss(self.ELO_MEAN, self.ELO_DEVIATION))
+
+        return Player(self.random.choice(self.FAMILY_NAMES),
+                      f"{self.random.choice(self.FIRST_NAMES)} "
+                      f"{self.nb_players}",
+                      date(1950, 1, 1)
+                      + timedelta(days=self.random.randrange(65 * 365)),
+                      self.random.randrange(len(Player.TUPLE_SEX)),
+                      min(max(elo, self.ELO_MIN), self.ELO_MAX))
+
+    def create_players(self, registry: PlayerRegistry,
+                       nb_players: int) -> list:
+        """create and register nb_players random players
+        :return the list of created players"""
+        players = []
+        for _ in range(nb_players):
+            players.append(registry.register(self.create_player()))
+
+        return players
+
+    def create_tournament(self, players: list,
+                          nb_rounds: int) -> Tournament:
+        """:return a new Tournament (without round) with players signed in
+        """
+        tournament = Tournament(f"Open {len(players)} joueurs",
+                                "Benchmark",
+                                [date.today()],
+                                0,
+                                nb_rounds,
+                                "Tournoi généré pour les benchmarks")
+        # random results don't change elos (rating is measured apart)
+        tournament.rating = None
+        for player in players:
+            tournament.add_player(player)
+
+        return tournament
+
+    def play_round(self, a_round: Round):
+        """give a score to each not ended match of a_round,
+        results are not recorded in the tournament
+        (see Tournament.record_results)"""
+        for match in a_round.get_pending_matches():
+            a_round.set_score(match, *TournamentSimulator.get_scores(
+                match, self.random))
+
+    def play_tournament(self, tournament: Tournament):
+        """launch and play all remaining rounds of tournament"""
+        while len(tournament.rounds) < tournament.nb_rounds:
+            self.play_round(tournament.launch_new_round())
+            tournament.set_dirty()
+            tournament.record_results()
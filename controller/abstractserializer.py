@@ -0,0 +1,84 @@
+from abc import ABC, abstractmethod
+
+
+class AbstractSerializer(ABC):
+    """
+    This abstract class define all mandatory methods of a storage backend
+    used by the tournament manager controller to save and load objects
+    Tournament and Players
+
+    Implementations only write new or modified objects (see
+    Serializable.is_dirty). Players are stored with their permanent
+    player_id, tournaments get an id_in_db when they are first saved.
+    Saved objects are only sure to be on disk after flush: save methods
+    only collect the values of new or modified objects, flush encodes
+    and writes them without reading the objects (so it can run while
+    objects are modified, see AutoSaver).
+    The sequence of the last journal record contained in saved objects
+    (see Journal) is written by the same flush, so the journal is only
+    replayed from the records which are not in the store. Each store has
+    its own journal, next to its file (see get_journal_path), so records
+    are never replayed in the tournaments of another store.
+    Implementations keep the path of their file in path.
+    """
+
+    @abstractmethod
+    def save_players(self, players: list):
+        """save new or modified players
+        :param players list of registered Player (see PlayerRegistry)
+
+        :return a list of ids recorded in db
+        """
+        pass
+
+    @abstractmethod
+    def save_tournaments(self, tournaments: list):
+        """save new or modified tournaments
+        (players must have been saved before)
+        :param tournaments list of object Tournament
+
+        :return a list of ids recorded in db
+        """
+        pass
+
+    def get_journal_path(self) -> str:
+        """:return the path of the journal of the modifications of the
+        objects of this store"""
+        return self.path + '.log'
+
+    @abstractmethod
+    def save_journal_sequence(self, sequence: int):
+        """record that saved objects contain the journal records up to
+        sequence, written by the next flush with them
+        (only after saving all modified players and tournaments)"""
+        pass
+
+    @abstractmethod
+    def load_journal_sequence(self) -> int:
+        """:return the sequence of the last journal record contained in
+        db (0 if none)"""
+        pass
+
+    def flush(self):
+        """write saved objects to disk, if the backend keeps them in memory
+        until then (nothing by default)"""
+        pass
+
+    @abstractmethod
+    def load_players(self):
+        """:return a list of all Player recorded in db"""
+        pass
+
+    @abstractmethod
+    def load_tournaments(self, players_list):
+        """load only header datas of tournaments, see load_tournament_details
+        :param players_list the list of loaded Player
+        :return a list of all not loaded Tournament recorded in db"""
+        pass
+
+    @abstractmethod
+    def load_tournament_details(self, tournament, players_by_id):
+        """load players, rounds, points... of a not loaded tournament
+        :param tournament a Tournament returned by load_tournaments
+        :param players_by_id a dict as player_id: loaded Player"""
+        pass
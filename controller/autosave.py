@@ -0,0 +1,67 @@
+import threading
+
+
+class AutoSaver:
+    """Save in a background thread, a few seconds after modifications
+
+    notify (a Tournament observer, also called after modifications of
+    players) only sets a flag and an event waking the thread up, so it
+    never waits for the disk.
+    The thread waits for a modification, then for interval seconds to
+    gather the next ones (a burst of results gives a single save), then
+    calls save_function: a save may not happen more than interval seconds
+    after a modification.
+
+    :param save_function: function saving all modifications
+                          (called in the thread)
+    :param interval: seconds between a modification and its save
+    :param log: function called with a message if a save fails
+    """
+
+    def __init__(self, save_function, interval: float = 3, log=print):
+        self.save_function = save_function
+        self.interval = interval
+        self.log = log
+
+        self.pending = False
+        self.modified = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="autosave",
+                                       daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def notify(self, *args):
+        """signal a modification, may be used as a Tournament observer"""
+        self.pending = True
+        self.modified.set()
+
+    def run(self):
+        while not self.stopping.is_set():
+            self.modified.wait()
+            # gather next modifications (stop saves at once)
+            self.stopping.wait(self.interval)
+            self.modified.clear()
+            if not self.pending:
+                # woken up by stop
+                continue
+
+            # modifications notified from now on are saved by this save
+            # or by the next one
+            self.pending = False
+            try:
+                self.save_function()
+            except Exception as error:
+                # modifications are still in the journal, retry later
+                self.log(f"La sauvegarde automatique a échoué : {error}")
+                self.notify()
+                self.stopping.wait(self.interval)
+
+    def stop(self):
+        """save pending modifications, then stop the thread"""
+        self.stopping.set()
+        # wakes the thread up
+        self.modified.set()
+        if self.thread.is_alive():
+            self.thread.join()
@@ -1,22 +1,48 @@
-from views.abstractview import AbstractView
+from views.abstractview import AbortPrompt, AbstractView
 from Model.match import Match
 from Model.player import Player
+from Model.report import Column, Report
+from Model.simulation import TournamentSimulator
 from Model.tournament import Tournament
+from controller.abstractserializer import AbstractSerializer
+from controller.autosave import AutoSaver
+from controller.importer import RatingListImporter
+from controller.profiler import Profiler
 from controller.serializer import Serializer
+from controller.store import TournamentStore
 import random
 
 
 class Controller:
     """This class control the application
 
+    run displays the current menu in a loop: actions only modify datas
+    and the navigation stack (open_menu, exit), then return to the loop,
+    so a session can last forever without growing the call stack.
+
     :param view : a view (derived from AbstractView) to interact with user
+    :param serializer : a storage backend (derived from AbstractSerializer),
+                        a TinyDB Serializer by default
+    :param autosave_interval : if given, modifications are saved in the
+                               background at most this number of seconds
+                               after they are made (see AutoSaver)
+    :param profile_path : if given, actions and hot paths are measured
+                          from the start (see Profiler) and the measures
+                          are written in this json file on quit
 
     :attributes :
-        tournaments : a list of Tournaments
-        players : a list of players
+        store : the TournamentStore of players and tournaments
+                (with its serializer, tinyDB by default, and journal)
         active_tournament : the tournament that the user is currently modifying
-        active_menu : the menu that is currently active
-        serializer : a Serializer instance to handle tinyDB
+        menus : navigation stack of menu functions, the last one is the
+                menu displayed by run (the main menu is always the first)
+        simulator : a TournamentSimulator predicting final rankings
+        autosaver : the AutoSaver, None if modifications are only saved
+                    by the user
+        profiler : the Profiler measuring PROFILED_ACTIONS and the hot
+                   paths of the view, the serializer and the opened
+                   tournaments, enabled by profile_path or by the stats
+                   command
     """
 
     GENERAL_REPORTS = ["Tous les acteurs par Nom",
@@ -26,6 +52,37 @@ class Controller:
     ACTORS_BY_ELO = 1
     ALL_TOURNAMENTS = 2
 
+    PLAYERS_COLUMNS = (Column("N°", int),
+                       Column("Nom", str, 30),
+                       Column("Date de naissance", str),
+                       Column("Sexe", str),
+                       Column("Elo", int))
+    TOURNAMENTS_COLUMNS = (Column("N°", int),
+                           Column("Tournoi", str, 80))
+
+    SEARCH_INFOS = ({'label': "Rechercher un joueur (début ou partie du nom"
+                              " et/ou elo min-max, ENTREE pour tous)",
+                     'type': str},)
+    SEARCH_PAGE_SIZE = 20
+    NEXT_PAGE = "Page suivante ->"
+
+    SIMULATION_INFOS = ({'label': "Nombre de tournois simulés",
+                         'type': 500},
+                        {'label': "Mesurer la sensibilité aux appariements",
+                         'type': ("Non", "Oui")})
+
+    PROFILED_ACTIONS = ('save', 'save_in_background', 'load',
+                        'create_tournament', 'open_tournament',
+                        'create_player', 'add_player', 'modify_player',
+                        'update_player', 'launch_new_round', 'set_a_score',
+                        'recompute_ratings', 'import_rating_list',
+                        'simulate', 'search_player',
+                        'create_tournament_report', 'create_general_report')
+
+    IMPORT_INFOS = ({'label': "Fichier de la liste de classement "
+                              "(csv ou xml)",
+                     'type': str},)
+
     TOURNAMENT_REPORTS = ["Classement par Points",
                           "Classement par Nom",
                           "Liste des rounds",
@@ -35,13 +92,31 @@ class Controller:
     ALL_ROUNDS = 2
     ALL_MATCHES = 3
 
-    def __init__(self, view: AbstractView):
+    def __init__(self, view: AbstractView,
+                 serializer: AbstractSerializer = None,
+                 autosave_interval: float = None, profile_path: str = None):
+        # before functions are bound, so they are measured
+        self.profiler = Profiler([(self, self.PROFILED_ACTIONS),
+                                  (view, Profiler.VIEW_METHODS)])
+        self.profile_path = profile_path
+        if self.profile_path is not None:
+            self.profiler.enable()
+
         self.view = view
-        self.tournaments = []
-        self.all_players = []
         self.active_tournament = None
-        self.active_menu = None
-        self.serializer = Serializer()
+        self.menus = [self.create_main_menu]
+        self.running = False
+        if serializer is None:
+            serializer = Serializer()
+        self.store = TournamentStore(serializer)
+        self.store.add_observer(self.notify_modification)
+        self.profiler.add_target(serializer, Profiler.SERIALIZER_METHODS)
+        self.simulator = TournamentSimulator()
+
+        self.autosaver = None
+        if autosave_interval:
+            self.autosaver = AutoSaver(self.save_in_background,
+                                       autosave_interval, view.log)
 
         """define commands that should be always available for user
         as a dict() given to view"""
@@ -54,54 +129,123 @@ class Controller:
              'long': "charger",
              'label': "pour charger les données de la base de données",
              'function': self.load},
+            {'short': "stats",
+             'long': "statistiques",
+             'label': "pour mesurer les performances "
+                      "(puis afficher les mesures)",
+             'function': self.display_stats},
             {'short': "exit",
              'long': "sortir",
              'label': "pour sortir du menu en cours",
-             'function': self.exit},
+             'function': self.exit,
+             'abort': True},
             {'short': "q",
              'long': "quitter",
              'label': "pour sauver et quitter le manager",
-             'function': self.quit}]
+             'function': self.quit,
+             'abort': True}]
 
         view.display_highest_level_menu(highest_level_commands)
 
-        # load datas from tinyDB
+        # load datas from DB
         self.load()
-        self.create_menu()
+
+        if self.autosaver is not None:
+            self.autosaver.start()
+
+    def run(self):
+        """display the current menu until the user quits"""
+        self.running = True
+        while self.running:
+            try:
+                self.create_menu()
+            except AbortPrompt:
+                # exit or quit during a prompt
+                pass
 
     def save(self):
-        """ Save all players and tournaments in DB"""
-        players_ids = self.serializer.save_players(self.all_players)
-        tournaments_ids = self.serializer.save_tournaments(self.tournaments)
+        """ Save new or modified players and tournaments in DB"""
+        players_ids, tournaments_ids = self.store.save()
 
         self.view.log(f"******** {len(players_ids)} "
                       f"joueurs sauvegardés *******")
         self.view.log(f"******** {len(tournaments_ids)} "
                       f"tournois sauvegardés *******")
 
+    def save_in_background(self):
+        """save modifications (called by the autosaver thread): players
+        and tournaments are only locked while they are read, not while
+        they are written to disk"""
+        self.store.save_in_background()
+
+    def notify_modification(self, *args):
+        """signal a modification to the autosaver, if any
+        (may be used as a Tournament observer)"""
+        if self.autosaver is not None:
+            self.autosaver.notify()
+
     def exit(self):
         """This method allows to go to one level up in the menu"""
-        if self.active_menu is not None:
-            self.active_menu = None
-        elif self.active_tournament is not None:
+        if len(self.menus) > 1:
+            self.menus.pop()
+
+        if self.create_tournament_menu not in self.menus:
             self.active_tournament = None
 
-        self.create_menu()
+    def open_menu(self, menu):
+        """make menu the current menu (displayed again after each action
+        until exit), nothing if it is already the current menu"""
+        if self.menus[-1] != menu:
+            self.menus.append(menu)
+
+    def close_menu(self, menu):
+        """go back to the previous menu if menu is the current menu"""
+        if self.menus[-1] == menu:
+            self.exit()
 
     def load(self):
-        """ Load all players and tournaments from DB"""
-        self.all_players = self.serializer.load_players()
-        self.tournaments = self.serializer.load_tournaments(self.all_players)
+        """ Load all players and tournaments from DB, and apply
+        modifications recorded since last save"""
+        nb_replayed = self.store.load()
 
         self.view.log(f"J'ai chargé une liste de "
-                      f"{len(self.all_players)} joueurs ")
+                      f"{len(self.store.registry)} joueurs ")
         self.view.log(f"J'ai chargé une liste de "
-                      f"{len(self.tournaments)} tournois ")
+                      f"{len(self.store.tournaments)} tournois ")
+        if nb_replayed:
+            self.view.log(f"J'ai rejoué {nb_replayed} modifications "
+                          f"non sauvegardées")
 
     def quit(self):
         """ Quit the Tournament Manager Project"""
+        if self.autosaver is not None:
+            # save pending modifications
+            self.autosaver.stop()
+        self.store.close()
+        self.simulator.close()
+
+        if self.profile_path is not None:
+            self.profiler.dump(self.profile_path)
+            self.view.log(f"Mesures de performances enregistrées dans "
+                          f"{self.profile_path}")
+        self.profiler.disable()
+
         self.view.log('Manager de tournoi vous souhaite une bonne journée !!')
-        exit()
+        self.running = False
+
+    def display_stats(self):
+        """enable the profiler, or display its measures if it is enabled
+        (and write them in the json file if any)"""
+        if not self.profiler.enabled:
+            self.profiler.enable()
+            self.view.log("Mesure des performances activée, "
+                          "/STATS pour afficher les mesures")
+            return
+
+        self.view.display_table("Mesures de performances\n",
+                                self.profiler.get_report())
+        if self.profile_path is not None:
+            self.profiler.dump(self.profile_path)
 
     def ask_for_tournament_datas(self):
         """Method to ask view to display a form with tournament needed infos,
@@ -126,22 +270,20 @@ class Controller:
         """create a new tournament instance according to received datas
         and make this Tournament active"""
         new_tournament = Tournament(*datas)
-        self.tournaments.append(new_tournament)
+        self.store.add_tournament(new_tournament)
+        self.profiler.add_target(new_tournament, Profiler.TOURNAMENT_METHODS)
 
         self.active_tournament = new_tournament
-
-        self.create_menu()
+        self.open_menu(self.create_tournament_menu)
 
     def create_player(self, datas):
         """create a new Player instance according to received datas
         and add this player to tournament if a Tournament is active"""
-        new_player = Player(*datas)
-        self.all_players.append(new_player)
+        new_player = self.store.register_player(Player(*datas))
 
         if self.active_tournament is not None:
-            self.active_tournament.add_player(new_player)
-
-        self.create_menu()
+            with self.store.lock:
+                self.active_tournament.add_player(new_player)
 
     def create_tournament_menu(self):
         """create a menu when the user is inside a tournament
@@ -154,6 +296,7 @@ class Controller:
                    "Lancer un nouveau round",
                    "Saisir un résultat",
                    "*** résultats automatiques ***",
+                   "Simuler la fin du tournoi",
                    "Afficher des rapports"]
         functions_list = [self.ask_for_player_datas,
                           self.ask_for_player_choose,
@@ -162,6 +305,7 @@ class Controller:
                           self.launch_new_round,
                           self.add_result,
                           self.automatic_result,
+                          self.ask_for_simulation,
                           self.choose_tournament_report]
 
         self.view.display_menu("Tournoi " + str(self.active_tournament),
@@ -169,16 +313,19 @@ class Controller:
                                functions_list)
 
     def add_result(self):
-        self.active_menu = self.add_result
         active_round = self.active_tournament.get_last_round()
-        if active_round.is_ended():
+        if active_round is None:
+            self.view.log("Il n'y a pas de round en cours.")
+            self.close_menu(self.add_result)
+        elif active_round.is_ended():
             self.view.log("Ce round est terminé, "
                           "vous ne pouvez plus le modifier.")
+            self.close_menu(self.add_result)
         else:
+            self.open_menu(self.add_result)
             self.view.display_item_choice("Quel résultat voulez-vous saisir ?",
                                           active_round.matches,
                                           self.ask_for_match_result)
-        self.create_menu()
 
     def modify_match(self, datas: list):
         """Modify a match with datas received in parameters
@@ -189,7 +336,60 @@ class Controller:
         match = datas[0]
         score1 = datas[1]
         score2 = datas[2]
-        self.active_tournament.set_a_score(match, score1, score2)
+        self.set_a_score(match, score1, score2)
+
+    def set_a_score(self, match: Match, score1: int, score2: int):
+        """record a score in active tournament, and update indexes and
+        standings with the new elos of players if it was the last match
+        (see Tournament.rate)"""
+        with self.store.lock:
+            rated = self.active_tournament.rated
+            self.active_tournament.set_a_score(match, score1, score2)
+
+            if rated or not self.active_tournament.rated:
+                return
+
+            changes = self.active_tournament.rating_changes
+            self.update_players(list(changes))
+
+        self.view.log("Le tournoi est terminé, "
+                      "les classements Elo sont mis à jour :")
+        for player, change in changes.items():
+            self.view.log(f"{player!r} : {change.elo_before} -> "
+                          f"{change.elo_after}")
+
+    def recompute_ratings(self):
+        """rate again all ended tournaments, in chronological order"""
+        nb_games = self.store.recompute_ratings()
+        self.notify_modification()
+
+        self.view.log(f"J'ai recalculé les classements Elo "
+                      f"à partir de {nb_games} parties")
+
+    def ask_for_rating_list(self):
+        """ask view for the file of a rating list,
+        sent to import_rating_list method"""
+        self.view.display_form(self.IMPORT_INFOS, self.import_rating_list)
+
+    def import_rating_list(self, datas: list):
+        """create or update players from a rating list (players are
+        saved at once, see RatingListImporter)
+
+        :param datas : a list as [0]-> path of a csv or xml file
+        """
+        importer = RatingListImporter(self.store.registry,
+                                      self.store.serializer,
+                                      self.update_players)
+        try:
+            with self.store.serializer_lock, self.store.lock:
+                summary = importer.import_file(datas[0])
+        except (OSError, ValueError) as error:
+            self.view.log(f"Import impossible : {error}")
+            return
+
+        self.view.log(f"Liste importée : {summary}")
+        for error in summary.errors:
+            self.view.log(f"Refusé {error}")
 
     def automatic_result(self):
         """For test purpose, that function gives random scores
@@ -198,13 +398,44 @@ class Controller:
         if active_round is None:
             self.view.log("Il n'y a pas de round en cours.")
             return
-        for match in active_round.matches:
-            if not match.is_ended:
-                self.active_tournament.set_a_score(match,
-                                                   random.randint(0, 4),
-                                                   random.randint(0, 4))
+        for match in active_round.get_pending_matches():
+            self.set_a_score(match,
+                             random.randint(0, 4),
+                             random.randint(0, 4))
+
+    def ask_for_simulation(self):
+        """ask view for simulation parameters,
+        collected datas will be send to simulate method"""
+        self.view.display_form(self.SIMULATION_INFOS, self.simulate)
+
+    def simulate(self, datas: list):
+        """display the probable final ranking of active tournament
+
+        :param datas : a list as [0]-> number of simulated tournaments
+                                 [1]-> 1 to compare with the pairing
+                                       engine of the tournament
+        """
+        nb_runs = datas[0]
+        if nb_runs < 1:
+            self.view.log("Il faut simuler au moins un tournoi.")
+            return
 
-        self.create_menu()
+        # same seed for both simulations, so they draw the same numbers
+        seed = random.getrandbits(64)
+        prediction = self.simulator.simulate(self.active_tournament, nb_runs,
+                                             seed)
+
+        description = str(self.active_tournament) + "\n"
+        description += f"Classement probable ({nb_runs} tournois simulés)\n"
+        self.view.display_table(description, prediction.get_report())
+
+        if datas[1] == 1:
+            distance = self.simulator.get_pairing_sensitivity(
+                self.active_tournament, nb_runs, seed,
+                prediction=prediction)
+            self.view.log(f"Sensibilité aux appariements : "
+                          f"{100 * distance:.1f} % des places changent "
+                          f"avec les appariements du tournoi")
 
     def list_match(self):
         """Display the list of matches of the last round
@@ -217,116 +448,151 @@ class Controller:
             self.view.log("Le tournoi n'a pas encore commencé. "
                           "Aucun match n'a été lancé.")
 
-        self.create_menu()
-
     def launch_new_round(self):
         """Check if a new round can be launched and launch it if possible"""
-        # check if there is no not-ended round
-        active_round = self.active_tournament.get_last_round()
-        if active_round is not None and not active_round.is_ended():
-            self.view.log("Vous ne pouvez pas lancer de nouveau Round, "
-                          "tous les matchs ne sont pas terminés.")
-
-        elif len(self.active_tournament.rounds) == \
-                self.active_tournament.nb_rounds:
-            self.view.log("Vous ne pouvez pas lancer de nouveau Round, "
-                          "ce tournoi est terminé.")
-
-        elif len(self.active_tournament.players) < 2:
-            self.view.log("Vous ne pouvez pas lancer de nouveau Round, "
-                          "il n'y a pas suffisamment de joueurs.")
+        error = self.active_tournament.check_new_round()
+        if error is not None:
+            self.view.log(error)
 
         else:
-            new_round = self.active_tournament.launch_new_round()
+            with self.store.lock:
+                new_round = self.active_tournament.launch_new_round()
             self.view.log(new_round)
 
-        return self.create_menu()
-
     def ask_for_player_choose(self):
-        """display a list of players in DB but not in active Tournament,
+        """search players in DB but not in active Tournament,
         to add one in the active tournament"""
-        self.active_menu = self.ask_for_player_choose
+        self.open_menu(self.ask_for_player_choose)
+
+        self.view.display_form(
+            self.SEARCH_INFOS,
+            lambda datas: self.search_player(
+                datas[0], "Quel joueur voulez-vous intégrer ?",
+                self.add_player,
+                exclude=self.active_tournament.points))
+
+    def search_player(self, query: str, title: str, return_function,
+                      include=None, exclude=None):
+        """display the players of registry matching query, page by page,
+        to choose one who is sent to return_function
+
+        :param include: if given, only players in include are displayed
+        :param exclude: players in exclude are not displayed"""
+        offset = 0
+
+        while True:
+            players, nb_results = self.store.registry.search(
+                query, include, exclude, offset, self.SEARCH_PAGE_SIZE)
 
-        possible_players = []
+            if nb_results == 0:
+                self.view.log("Aucun joueur trouvé.")
+                return
 
-        for player in self.all_players:
-            if player not in self.active_tournament.players:
-                possible_players.append(player)
+            options = list(players)
+            if offset + len(players) < nb_results:
+                options.append(self.NEXT_PAGE)
 
-        self.view.display_item_choice("Quel joueur voulez-vous intégrer ?",
-                                      possible_players,
-                                      self.add_player)
-        #     iterate
-        self.create_menu()
+            chosen = []
+            self.view.display_item_choice(
+                f"{title} ({offset + 1}-{offset + len(players)} "
+                f"sur {nb_results})",
+                options, chosen.append)
+
+            if isinstance(chosen[0], Player):
+                return_function(chosen[0])
+                return
+
+            offset += self.SEARCH_PAGE_SIZE
 
     def add_player(self, player: Player):
         """Add a player to active tournament"""
         self.view.log(f"OK, j'inscris {player} "
                       f"au tournoi {self.active_tournament}")
 
-        self.active_tournament.add_player(player)
+        with self.store.lock:
+            self.active_tournament.add_player(player)
 
     def modify_player(self, infos):
         """modify player according to received infos
 
         :param : infos -> as (Player, family_name, first_name, sex, elo)"""
         player = infos[0]
-        player.family_name = infos[1]
-        player.first_name = infos[2]
-        player.sex = infos[3]
-        player.elo = infos[4]
-
-        self.create_menu()
+        with self.store.lock:
+            player.family_name = infos[1]
+            player.first_name = infos[2]
+            player.sex = infos[3]
+            player.elo = infos[4]
+            player.set_dirty()
+            self.update_player(player)
+
+    def update_player(self, player: Player):
+        """update indexes and standings after a modification of player"""
+        self.store.update_player(player)
+        # players are not journaled, only saved
+        self.notify_modification()
+
+    def update_players(self, players: list):
+        """update indexes and standings after a modification of players
+        (faster than update_player for many players)"""
+        self.store.update_players(players)
+        self.notify_modification()
 
     def choose_tournament(self):
         """display a list of tournament, to choose one to open"""
         self.view.display_item_choice("Quel tournoi voulez-vous ouvrir ?",
-                                      self.tournaments,
+                                      self.store.tournaments,
                                       self.open_tournament)
 
     def choose_player(self):
-        """Ask view to display a list of players
-        (all or from active tournament), to choose one to be modified
+        """Search players (all or from active tournament),
+        to choose one to be modified
         """
-        self.active_menu = self.choose_player
+        self.open_menu(self.choose_player)
 
         if self.active_tournament is None:
-            players = self.all_players
+            players = None
         else:
-            players = self.active_tournament.players
+            players = self.active_tournament.points
 
-        self.view.display_item_choice("Quel joueur voulez-vous modifier ?",
-                                      players,
-                                      self.ask_for_player_datas)
+        self.view.display_form(
+            self.SEARCH_INFOS,
+            lambda datas: self.search_player(
+                datas[0], "Quel joueur voulez-vous modifier ?",
+                self.ask_for_player_datas,
+                include=players))
 
     def open_tournament(self, tournament: Tournament):
         """set tournament in parameter active and update menu"""
+        self.store.load_tournament_details(tournament)
+        self.profiler.add_target(tournament, Profiler.TOURNAMENT_METHODS)
         self.active_tournament = tournament
-
-        self.create_menu()
+        self.open_menu(self.create_tournament_menu)
 
     def create_menu(self):
-        """display menu : Main menu, Tournament Menu or Active Menu"""
-        if self.active_tournament is None and self.active_menu is None:
-            self.view.display_menu("Menu principal",
-                                   ["Créer et ouvrir un tournoi",
-                                    "Ouvrir un tournoi existant",
-                                    "Créer un joueur",
-                                    "Modifier un joueur",
-                                    "Afficher des rapports"],
-                                   [self.ask_for_tournament_datas,
-                                    self.choose_tournament,
-                                    self.ask_for_player_datas,
-                                    self.choose_player,
-                                    self.choose_general_report])
-        elif self.active_menu is None:
-            self.create_tournament_menu()
-        else:
-            self.active_menu()
+        """display the current menu (last of navigation stack)"""
+        self.menus[-1]()
+
+    def create_main_menu(self):
+        """create the menu displayed when no tournament is open"""
+        self.view.display_menu("Menu principal",
+                               ["Créer et ouvrir un tournoi",
+                                "Ouvrir un tournoi existant",
+                                "Créer un joueur",
+                                "Modifier un joueur",
+                                "Afficher des rapports",
+                                "Recalculer tous les classements Elo",
+                                "Importer une liste de classement (FIDE)"],
+                               [self.ask_for_tournament_datas,
+                                self.choose_tournament,
+                                self.ask_for_player_datas,
+                                self.choose_player,
+                                self.choose_general_report,
+                                self.recompute_ratings,
+                                self.ask_for_rating_list])
 
     def choose_tournament_report(self):
         """display available tournament reports"""
-        self.active_menu = self.choose_tournament_report
+        self.open_menu(self.choose_tournament_report)
         self.view.display_item_choice("Les rapports disponibles :",
                                       Controller.TOURNAMENT_REPORTS,
                                       self.create_tournament_report)
@@ -363,11 +629,9 @@ class Controller:
             matches_dict = self.active_tournament.get_all_matches_to_display()
             self.view.display_table(description, matches_dict)
 
-        self.choose_tournament_report()
-
     def choose_general_report(self):
         """display available general reports"""
-        self.active_menu = self.choose_general_report
+        self.open_menu(self.choose_general_report)
         self.view.display_item_choice("Les rapports disponibles :",
                                       Controller.GENERAL_REPORTS,
                                       self.create_general_report)
@@ -384,46 +648,42 @@ class Controller:
         description += choice + "\n"
 
         if choice == Controller.GENERAL_REPORTS[Controller.ACTORS_BY_ELO]:
-            players = sorted(self.all_players,
+            players = sorted(self.store.registry.get_players(),
                              key=lambda x: x.elo,
                              reverse=True)
             players_dict = self.create_player_dict_list(players)
             self.view.display_table(description, players_dict)
         elif choice == Controller.GENERAL_REPORTS[Controller.ACTORS_BY_NAME]:
-            players = sorted(self.all_players,
+            players = sorted(self.store.registry.get_players(),
                              key=lambda x: x.family_name.title(),
                              reverse=False)
             players_dict = self.create_player_dict_list(players)
             self.view.display_table(description, players_dict)
         elif choice == Controller.GENERAL_REPORTS[Controller.ALL_TOURNAMENTS]:
-            tournaments_to_display = []
-
-            for index, tournament in enumerate(self.tournaments):
-                string_tournament = str(tournament)
-                string_tournament = string_tournament.replace("\n", " ")
-
-                tournament_to_display = {"N°": index + 1,
-                                         "Tournoi": string_tournament
-                                         }
-                tournaments_to_display.append(tournament_to_display)
+            tournaments_report = self.create_tournament_list(
+                self.store.tournaments)
+            self.view.display_table(description, tournaments_report)
 
-            self.view.display_table(description, tournaments_to_display)
+    @staticmethod
+    def create_player_dict_list(players_list) -> Report:
+        """create a Report with displayable datas on all players
+        (rows are generated while the report is read)"""
+        return Report(Controller.PLAYERS_COLUMNS,
+                      Controller.generate_players(players_list))
 
-        self.choose_general_report()
+    @staticmethod
+    def generate_players(players_list):
+        for index, player in enumerate(players_list, start=1):
+            yield (index,
+                   repr(player),
+                   player.get_birth_date(),
+                   player.get_sex(),
+                   player.elo)
 
     @staticmethod
-    def create_player_dict_list(players_list) -> list:
-        """create a list of dict with displayable datas on all players"""
-        players_to_display = []
-
-        for index, player in enumerate(players_list):
-            player_to_display = {
-                "N°": index + 1,
-                "Nom": repr(player),
-                "Date de naissance": player.birth_date.strftime('%d/%m/%y'),
-                "Sexe": player.get_sex(),
-                "Elo": player.elo
-            }
-            players_to_display.append(player_to_display)
-
-        return players_to_display
+    def create_tournament_list(tournaments) -> Report:
+        """create a Report with one line by tournament"""
+        return Report(Controller.TOURNAMENTS_COLUMNS,
+                      ((index, str(tournament).replace("\n", " "))
+                       for index, tournament in enumerate(tournaments,
+                                                          start=1)))
@@ -0,0 +1,278 @@
+import csv
+from datetime import date
+from functools import lru_cache
+from xml.etree import ElementTree
+from Model.player import Player
+from Model.registry import PlayerRegistry
+from controller.abstractserializer import AbstractSerializer
+
+
+class ImportSummary:
+    """Counts of an import of a rating list, and the first errors"""
+
+    MAX_ERRORS = 10
+
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.rejected = 0
+        self.errors = []
+
+    def reject(self, row_number: int, error: Exception):
+        self.rejected += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append(f"joueur n°{row_number} : {error}")
+
+    def __str__(self):
+        return f"{self.created} joueurs créés, {self.updated} mis à jour, " \
+               f"{self.unchanged} inchangés, {self.rejected} refusés"
+
+
+class RatingListImporter:
+    """Create or update players from a rating list of FIDE or of a
+    federation, as csv or xml (like the xml lists of FIDE)
+
+    Files are read row by row (csv.reader, or ElementTree.iterparse
+    clearing each parsed player), so memory used by the import does not
+    depend on the size of the file. Columns (or xml tags) are recognized
+    by their name, see FIELDS, a player is identified by his fide_id:
+    the player with the same fide_id is updated if he is known (names,
+    sex, elo and birth date), a new player is created otherwise.
+    Rows that would not give a valid Player (no fide id, no name or no
+    elo) are rejected, a birth date may be unknown (blank or 0000 in
+    FIDE lists).
+    Players are registered and saved by batches of batch_size (new and
+    modified players only), the serializer is flushed at the end.
+
+    :param registry: the PlayerRegistry of all players
+    :param serializer: a storage backend (derived from AbstractSerializer)
+    :param update_players: function called with each batch of modified
+                           players, to update indexes and standings
+                           (registry.update_many by default)
+    :param batch_size: number of players registered and saved at once
+    """
+
+    # lowercase column name or xml tag: Player attribute
+    FIELDS = {'fideid': 'fide_id',
+              'fide_id': 'fide_id',
+              'id_number': 'fide_id',
+              'id': 'fide_id',
+              'name': 'name',
+              'family_name': 'family_name',
+              'nom': 'family_name',
+              'first_name': 'first_name',
+              'prénom': 'first_name',
+              'prenom': 'first_name',
+              'sex': 'sex',
+              'sexe': 'sex',
+              'rating': 'elo',
+              'srtng': 'elo',
+              'elo': 'elo',
+              'birthday': 'birth_date',
+              'b-day': 'birth_date',
+              'birthdate': 'birth_date',
+              'naissance': 'birth_date'}
+    XML_PLAYER = 'player'
+    SEXES = {'m': Player.MALE, 'h': Player.MALE,
+             'f': Player.FEMALE, 'w': Player.FEMALE}
+
+    def __init__(self, registry: PlayerRegistry,
+                 serializer: AbstractSerializer, update_players=None,
+                 batch_size: int = 10000):
+        self.registry = registry
+        self.serializer = serializer
+        self.update_players = update_players
+        if self.update_players is None:
+            self.update_players = registry.update_many
+        self.batch_size = batch_size
+
+    def import_file(self, path: str) -> ImportSummary:
+        """import a .csv or .xml rating list
+
+        :return an ImportSummary
+        :raise ValueError if the file can't be read (players of the rows
+               read before are imported)"""
+        extension = path.rsplit('.', 1)[-1].lower()
+        if extension == 'xml':
+            with open(path, 'rb') as file:
+                try:
+                    return self.import_rows(self.read_xml(file))
+                except ElementTree.ParseError as error:
+                    raise ValueError(f"xml invalide ({error})") from error
+        if extension in ('csv', 'txt'):
+            with open(path, encoding='utf-8-sig', newline='') as file:
+                return self.import_rows(self.read_csv(file))
+
+        raise ValueError(f"format inconnu pour {path}, choisir parmi "
+                         f"csv, xml")
+
+    def read_csv(self, file):
+        """yield rows of a csv file (delimiter guessed from its beginning)
+        as dicts Player attribute: text"""
+        try:
+            dialect = csv.Sniffer().sniff(file.read(4096), ',;\t|')
+        except csv.Error:
+            dialect = csv.excel
+        file.seek(0)
+
+        reader = csv.reader(file, dialect)
+        fields = [self.FIELDS.get(name.strip().lower().replace(' ', '_'))
+                  for name in next(reader, [])]
+        for values in reader:
+            yield {field: value for field, value in zip(fields, values)
+                   if field is not None}
+
+    def read_xml(self, file):
+        """yield players of an xml file as dicts Player attribute: text"""
+        events = ElementTree.iterparse(file, events=('start', 'end'))
+        _, root = next(events)
+
+        for event, element in events:
+            if event == 'end' and element.tag == self.XML_PLAYER:
+                row = dict()
+                for child in element:
+                    field = self.FIELDS.get(child.tag.lower())
+                    if field is not None:
+                        row[field] = child.text or ''
+                yield row
+
+                # forget parsed players
+                element.clear()
+                root.clear()
+
+    def import_rows(self, rows) -> ImportSummary:
+        """create or update a player for each row (a dict as returned by
+        read_csv or read_xml)"""
+        summary = ImportSummary()
+        new_players = []
+        # new players of the batch, not registered yet
+        new_by_fide_id = dict()
+        # registered players modified in the batch, by player_id
+        modified_players = dict()
+
+        for row_number, row in enumerate(rows, start=1):
+            try:
+                values = self.parse_row(row)
+            except ValueError as error:
+                summary.reject(row_number, error)
+                continue
+
+            fide_id = values['fide_id']
+            player = self.registry.get_by_fide_id(fide_id)
+            if player is None:
+                player = new_by_fide_id.get(fide_id)
+
+            if player is None:
+                player = Player(values['family_name'], values['first_name'],
+                                values['birth_date'], values['sex'],
+                                values['elo'], fide_id=fide_id)
+                new_by_fide_id[fide_id] = player
+                new_players.append(player)
+                summary.created += 1
+            elif self.update_player(player, values):
+                player.set_dirty()
+                if player.player_id is not None:
+                    modified_players[player.player_id] = player
+                summary.updated += 1
+            else:
+                summary.unchanged += 1
+
+            if len(new_players) + len(modified_players) >= self.batch_size:
+                self.save_batch(new_players, list(modified_players.values()))
+                new_players = []
+                new_by_fide_id = dict()
+                modified_players = dict()
+
+        self.save_batch(new_players, list(modified_players.values()))
+        self.serializer.flush()
+
+        return summary
+
+    @staticmethod
+    def update_player(player: Player, values: dict) -> bool:
+        """copy values in player
+
+        :return True if player has been modified"""
+        modified = False
+        for attribute in ('family_name', 'first_name', 'sex', 'elo'):
+            if getattr(player, attribute) != values[attribute]:
+                setattr(player, attribute, values[attribute])
+                modified = True
+
+        # birth_date may be a datetime, or None if unknown
+        birth_date = values['birth_date']
+        if (player.birth_date is None) != (birth_date is None) \
+                or birth_date is not None \
+                and player.birth_date.toordinal() != birth_date.toordinal():
+            player.birth_date = birth_date
+            modified = True
+
+        return modified
+
+    def save_batch(self, new_players: list, modified_players: list):
+        self.registry.register_many(new_players)
+        if modified_players:
+            self.update_players(modified_players)
+        self.serializer.save_players(new_players + modified_players)
+
+    def parse_row(self, row: dict) -> dict:
+        """check a row against the constraints of Player
+
+        :return a dict as Player attribute: value
+        :raise ValueError if the row can't give a valid Player"""
+        fide_id = row.get('fide_id', '').strip()
+        if not fide_id.isdigit() or int(fide_id) == 0:
+            raise ValueError(f"identifiant FIDE invalide '{fide_id}'")
+
+        if 'name' in row:
+            # FIDE lists: "Family name, First name"
+            family_name, _, first_name = row['name'].partition(',')
+        else:
+            family_name = row.get('family_name', '')
+            first_name = row.get('first_name', '')
+        family_name = family_name.strip()
+        if not family_name:
+            raise ValueError("nom manquant")
+
+        elo = row.get('elo', '').strip()
+        if not elo.isdigit() or int(elo) == 0:
+            raise ValueError(f"classement Elo invalide '{elo}'")
+
+        return {'fide_id': int(fide_id),
+                'family_name': family_name,
+                'first_name': first_name.strip(),
+                'sex': self.SEXES.get(row.get('sex', '').strip().lower(),
+                                      Player.DK),
+                'elo': int(elo),
+                'birth_date': self.parse_date(row.get('birth_date', ''))}
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def parse_date(text: str) -> date:
+        """:return the date of text as YYYY (FIDE lists only give the
+        year, the 1st of January is taken), YYYY-MM-DD, YYYY/MM/DD,
+        DD/MM/YYYY or DD.MM.YYYY, without strptime (birth dates are
+        repeated in big lists, so they are cached too), None for an
+        unknown date (blank or 0000)
+
+        :raise ValueError if text is not a date"""
+        text = text.strip()
+        if text in ('', '0000'):
+            return None
+
+        if len(text) == 4 and text.isdigit() and int(text) > 0:
+            return date(int(text), 1, 1)
+
+        if len(text) == 10:
+            if text[4] == text[7] and text[4] in '-/':
+                year, month, day = text[:4], text[5:7], text[8:]
+            elif text[2] == text[5] and text[2] in '/.':
+                day, month, year = text[:2], text[3:5], text[6:]
+            else:
+                year = month = day = ''
+
+            if year.isdigit() and month.isdigit() and day.isdigit():
+                return date(int(year), int(month), int(day))
+
+        raise ValueError(f"date de naissance invalide '{text}'")
@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+from Model.round import Round
+
+
+class Journal:
+    """Append-only journal (write-ahead log) of tournaments modifications
+
+    Each add_player, launch_new_round and set_a_score of an observed
+    Tournament is appended as one json line, so nothing is lost between
+    two saves. Lines are flushed at once but fsync'd in batches
+    (every sync_every records or sync_interval seconds).
+    The journal is replayed after loading the main store and truncated
+    once its content has been saved in it (compaction).
+    Records may come from several threads (see TournamentSession).
+    A save running while tournaments are modified (see AutoSaver) rotates
+    the journal before reading the tournaments, and removes the rotated
+    file once they are written: records made meanwhile stay in the new one.
+    Records are numbered: a save stores the sequence of the last record
+    it contains with the saved objects (see
+    AbstractSerializer.save_journal_sequence), and replay skips the
+    records up to it, so records already in the store (after a crash
+    between a save and the truncation of the journal) are not applied
+    twice.
+
+    :param path: the journal file
+    :param sync_every: number of records between two fsync
+    :param sync_interval: max seconds between two fsync
+    """
+
+    def __init__(self, path='journal.log', sync_every=20, sync_interval=2):
+        self.path = path
+        self.rotated_path = path + '.old'
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        self.lock = threading.Lock()
+        # sequence of the last record, numbers go on after a truncation
+        # (and after the sequence of the store, see replay)
+        self.sequence = 0
+
+    def record(self, tournament, action: str, datas: dict):
+        """append a record, this method is a Tournament observer"""
+        with self.lock:
+            self.sequence += 1
+            entry = {'sequence': self.sequence,
+                     'tournament': tournament.id_in_db,
+                     'action': action,
+                     'datas': datas}
+
+            self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+            self.unsynced += 1
+
+            if self.unsynced >= self.sync_every \
+                    or time.monotonic() - self.last_sync \
+                    >= self.sync_interval:
+                self.sync_unlocked()
+
+    def sync(self):
+        """force written records to disk"""
+        with self.lock:
+            self.sync_unlocked()
+
+    def sync_unlocked(self):
+        if self.unsynced:
+            os.fsync(self.file.fileno())
+            self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def read(self):
+        """yield recorded entries (of the rotated file first), a truncated
+        last line (crash while writing) is ignored"""
+        for path in (self.rotated_path, self.path):
+            if not os.path.exists(path):
+                continue
+
+            with open(path, encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    yield entry
+
+    def replay(self, tournaments: list, players_by_id: dict,
+               hydrate, sequence: int = 0) -> int:
+        """apply recorded entries on loaded tournaments, except the ones
+        already in the main store
+
+        :param tournaments: list of Tournament loaded from the main store
+        :param players_by_id: dict as player_id: Player
+        :param hydrate: function loading details of a not loaded tournament
+        :param sequence: sequence of the last record contained in the main
+                         store (see AbstractSerializer.load_journal_sequence)
+
+        :return the number of replayed entries"""
+        tournaments_by_id = dict()
+        for tournament in tournaments:
+            tournaments_by_id[tournament.id_in_db] = tournament
+
+        nb_replayed = 0
+        self.sequence = max(self.sequence, sequence)
+
+        for entry in self.read():
+            # records made before they were numbered have no 'sequence'
+            entry_sequence = entry.get('sequence')
+            if entry_sequence is not None:
+                self.sequence = max(self.sequence, entry_sequence)
+                if entry_sequence <= sequence:
+                    continue
+
+            tournament = tournaments_by_id.get(entry['tournament'])
+            if tournament is None:
+                continue
+
+            if not tournament.is_loaded:
+                hydrate(tournament)
+
+            datas = entry['datas']
+
+            if entry['action'] == 'add_player':
+                # records made before elos were journaled have no 'elo'
+                tournament.add_player(players_by_id[datas['player']],
+                                      datas.get('elo'))
+            elif entry['action'] == 'launch_new_round':
+                tournament.add_round(Round.deserialize(datas, players_by_id))
+            elif entry['action'] == 'set_a_score':
+                match = tournament.get_last_round().matches[datas['match']]
+                tournament.set_a_score(match,
+                                       datas['score1'],
+                                       datas['score2'])
+            else:
+                continue
+
+            nb_replayed += 1
+
+        return nb_replayed
+
+    def truncate(self):
+        """empty the journal, to be called once its content is saved"""
+        with self.lock:
+            self.file.close()
+            self.file = open(self.path, 'w', encoding='utf-8')
+            self.unsynced = 0
+            self.last_sync = time.monotonic()
+        self.remove_rotated()
+
+    def rotate(self) -> int:
+        """continue the journal in a new file, records of the previous
+        one are kept (and replayed) until remove_rotated
+
+        :return the sequence of the last record of the previous file"""
+        with self.lock:
+            self.sync_unlocked()
+            self.file.close()
+
+            if os.path.exists(self.rotated_path):
+                # the previous rotated records are not saved yet
+                with open(self.path, encoding='utf-8') as file, \
+                        open(self.rotated_path, 'a',
+                             encoding='utf-8') as rotated_file:
+                    rotated_file.write(file.read())
+                    rotated_file.flush()
+                    os.fsync(rotated_file.fileno())
+            else:
+                os.replace(self.path, self.rotated_path)
+
+            self.file = open(self.path, 'w', encoding='utf-8')
+
+            return self.sequence
+
+    def remove_rotated(self):
+        """forget the rotated records, to be called once they are saved"""
+        with self.lock:
+            if os.path.exists(self.rotated_path):
+                os.remove(self.rotated_path)
+
+    def close(self):
+        with self.lock:
+            self.sync_unlocked()
+            self.file.close()
@@ -0,0 +1,156 @@
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from Model.report import Column, Report
+
+
+class Profiler:
+    """Count calls, durations and memory allocations of the hot paths
+
+    enable replaces the methods of the targets (objects given to
+    add_target) by wrappers measuring each call, set as attributes of
+    these objects only (other instances of their classes are never
+    measured), disable removes the wrappers: when the profiler is
+    disabled, nothing is measured and nothing costs.
+    Durations are measured with perf_counter, allocations as the change
+    of the memory traced by tracemalloc (started by enable) during the
+    call. Measures include nested measured calls (create_matches is
+    counted in launch_new_round too) and, for allocations, what other
+    threads allocate meanwhile.
+    Methods bound before enable (like commands given to a view) are not
+    measured.
+
+    :param targets: a list of (object, names of methods) to measure
+    """
+
+    TOURNAMENT_METHODS = ('launch_new_round', 'create_matches',
+                          'record_results', 'set_a_score')
+    SERIALIZER_METHODS = ('save_players', 'save_tournaments', 'flush',
+                          'load_players', 'load_tournaments',
+                          'load_tournament_details')
+    VIEW_METHODS = ('display_table',)
+
+    COLUMNS = (Column("Opération", str),
+               Column("Appels", int),
+               Column("Total (ms)", float),
+               Column("Moyenne (ms)", float),
+               Column("Max (ms)", float),
+               Column("Mémoire (Ko)", float))
+
+    def __init__(self, targets: list = ()):
+        # (object, name of method)
+        self.targets = []
+        # name: [count, total, min, max, memory]
+        self.stats = dict()
+        self.lock = threading.Lock()
+        self.enabled = False
+        self.started_tracemalloc = False
+
+        for target, names in targets:
+            self.add_target(target, names)
+
+    def add_target(self, target, names):
+        """measure the methods names of target (at once if the profiler
+        is enabled), nothing for the ones already measured"""
+        for name in names:
+            if any(other is target and other_name == name
+                   for other, other_name in self.targets):
+                continue
+
+            self.targets.append((target, name))
+            if self.enabled:
+                self.wrap_method(target, name)
+
+    def enable(self):
+        """replace target methods by measured ones"""
+        if self.enabled:
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracemalloc = True
+
+        self.enabled = True
+        for target, name in self.targets:
+            self.wrap_method(target, name)
+
+    def disable(self):
+        """put original methods back"""
+        if not self.enabled:
+            return
+
+        for target, name in self.targets:
+            # the method of the class is visible again
+            delattr(target, name)
+
+        self.enabled = False
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+            self.started_tracemalloc = False
+
+    def wrap_method(self, target, name: str):
+        setattr(target, name, self.wrap(f"{type(target).__name__}.{name}",
+                                        getattr(target, name)))
+
+    def wrap(self, name: str, function):
+        """:return function, measured as name"""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            memory = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start,
+                            tracemalloc.get_traced_memory()[0] - memory)
+
+        return wrapper
+
+    def record(self, name: str, duration: float, memory: int):
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                self.stats[name] = [1, duration, duration, duration, memory]
+            else:
+                stats[0] += 1
+                stats[1] += duration
+                stats[2] = min(stats[2], duration)
+                stats[3] = max(stats[3], duration)
+                stats[4] += memory
+
+    def summarize(self) -> dict:
+        """:return a dict as name: {count, total, mean, min, max (in
+        seconds), memory (net allocated bytes of all calls)}"""
+        with self.lock:
+            stats = {name: list(values)
+                     for name, values in self.stats.items()}
+
+        return {name: {'count': count,
+                       'total': total,
+                       'mean': total / count,
+                       'min': minimum,
+                       'max': maximum,
+                       'memory': memory}
+                for name, (count, total, minimum, maximum, memory)
+                in stats.items()}
+
+    def get_report(self) -> Report:
+        """:return a Report of measured operations, longest first"""
+        summary = sorted(self.summarize().items(),
+                         key=lambda x: x[1]['total'], reverse=True)
+
+        return Report(self.COLUMNS,
+                      ((name,
+                        stats['count'],
+                        round(1000 * stats['total'], 2),
+                        round(1000 * stats['mean'], 3),
+                        round(1000 * stats['max'], 3),
+                        round(stats['memory'] / 1024, 1))
+                       for name, stats in summary))
+
+    def dump(self, path: str):
+        """write the summary in a json file"""
+        with open(path, 'w', encoding='utf-8') as output:
+            json.dump(self.summarize(), output, indent=2)
@@ -0,0 +1,275 @@
+import shlex
+from Model.player import Player
+from Model.tournament import Tournament
+from controller.abstractserializer import AbstractSerializer
+from controller.controller import Controller
+from controller.importer import RatingListImporter
+from controller.store import TournamentStore
+from views.exporters import EXPORTERS, ReportExporter
+
+
+class ScriptError(Exception):
+    """error in a command of a script, with its line number"""
+
+    def __init__(self, message: str, line_number: int = None):
+        if line_number is not None:
+            message = f"Ligne {line_number} : {message}"
+        super().__init__(message)
+
+
+class ScriptRunner:
+    """Run a tournament without console, from a script of commands
+
+    Each line of a script is a command followed by its arguments,
+    separated by spaces (use quotes for arguments containing spaces),
+    empty lines and lines starting with # are ignored:
+
+        tournoi NOM LIEU DATES CONTROLE [NB_ROUNDS] [DESCRIPTION]
+            create a tournament and open it (DATES as 01/06/22,02/06/22,
+            CONTROLE as bullet, blitz, coup rapide or its number)
+        ouvrir TOURNOI
+            open a tournament by its name or its number
+        joueur NOM PRENOM NAISSANCE SEXE ELO
+            create a player (SEXE as 0, 1, 2 or Homme, Femme...)
+            and sign him in the open tournament
+        inscrire ID
+            sign an existing player (by player_id) in the open tournament
+        round
+            launch a new round in the open tournament
+        score N SCORE1 SCORE2
+            record the score of the match N (from 1) of the last round
+        scores SCORE1-SCORE2 SCORE1-SCORE2 ...
+            record the scores of the matches of the last round, in order
+            (elos of players are updated once the last round is ended)
+        elo
+            rate again all ended tournaments, in chronological order
+        importer FICHIER
+            create or update players from a rating list of FIDE or of a
+            federation (csv or xml), players are saved at once
+        sauvegarder
+            save players and tournaments
+        exporter RAPPORT FICHIER
+            write a report of the open tournament (classement, noms,
+            rounds, matchs) or of all players (joueurs) in a csv or html
+            file (according to its extension)
+
+    Models and the TournamentStore are used directly, nothing is
+    displayed except the messages given to log, and nothing is saved
+    without sauvegarder (modifications are not journaled either).
+
+    :param serializer: a storage backend (derived from AbstractSerializer)
+    :param log: a function called with a message after each command
+    """
+
+    REPORTS = ('classement', 'noms', 'rounds', 'matchs', 'joueurs')
+
+    def __init__(self, serializer: AbstractSerializer, log=print):
+        self.log = log
+        self.active_tournament = None
+
+        self.commands = {'tournoi': self.create_tournament,
+                         'ouvrir': self.open_tournament,
+                         'joueur': self.create_player,
+                         'inscrire': self.add_player,
+                         'round': self.launch_new_round,
+                         'score': self.set_score,
+                         'scores': self.set_scores,
+                         'elo': self.recompute_ratings,
+                         'importer': self.import_rating_list,
+                         'sauvegarder': self.save,
+                         'exporter': self.export}
+
+        # applies modifications not saved by the console manager
+        self.store = TournamentStore(serializer, journaled=False)
+        self.store.load()
+
+    def run(self, lines):
+        """run the commands of an iterable of lines (like an open file)
+
+        :return the number of executed commands"""
+        nb_commands = 0
+
+        for line_number, line in enumerate(lines, start=1):
+            try:
+                arguments = shlex.split(line, comments=True)
+            except ValueError as error:
+                raise ScriptError(str(error), line_number)
+
+            if not arguments:
+                continue
+
+            command = self.commands.get(arguments[0].lower())
+            if command is None:
+                raise ScriptError(f"commande inconnue {arguments[0]}",
+                                  line_number)
+
+            try:
+                command(*arguments[1:])
+            except ScriptError as error:
+                raise ScriptError(str(error), line_number)
+            except (TypeError, ValueError) as error:
+                raise ScriptError(f"arguments invalides pour "
+                                  f"{arguments[0]} ({error})", line_number)
+
+            nb_commands += 1
+
+        return nb_commands
+
+    def close(self):
+        self.store.close()
+
+    def get_active_tournament(self) -> Tournament:
+        if self.active_tournament is None:
+            raise ScriptError("aucun tournoi n'est ouvert")
+
+        return self.active_tournament
+
+    def create_tournament(self, name, place, dates, time_control,
+                          nb_rounds='4', description=''):
+        if time_control.isdigit():
+            time_control = int(time_control)
+
+        tournament = Tournament(name, place, dates.split(','), time_control,
+                                int(nb_rounds), description)
+        self.store.tournaments.append(tournament)
+        self.active_tournament = tournament
+
+        self.log(f"Tournoi {tournament.name} créé")
+
+    def open_tournament(self, name):
+        if name.isdigit() and 0 < int(name) <= len(self.store.tournaments):
+            tournament = self.store.tournaments[int(name) - 1]
+        else:
+            for tournament in self.store.tournaments:
+                if tournament.name == name:
+                    break
+            else:
+                raise ScriptError(f"tournoi {name} introuvable")
+
+        self.store.load_tournament_details(tournament)
+        self.active_tournament = tournament
+
+        self.log(f"Tournoi {tournament.name} ouvert")
+
+    def create_player(self, family_name, first_name, birth_date, sex, elo):
+        if sex.isdigit():
+            sex = int(sex)
+        elif sex.title() in Player.TUPLE_SEX:
+            sex = Player.TUPLE_SEX.index(sex.title())
+
+        player = self.store.registry.register(
+            Player(family_name, first_name, birth_date, sex, int(elo)))
+
+        self.log(f"Joueur {player} créé (id {player.player_id})")
+
+        if self.active_tournament is not None:
+            self.active_tournament.add_player(player)
+
+    def add_player(self, player_id):
+        tournament = self.get_active_tournament()
+        player = self.store.registry.get(int(player_id))
+
+        if player is None:
+            raise ScriptError(f"joueur {player_id} introuvable")
+        if player in tournament.points:
+            raise ScriptError(f"{player} est déjà inscrit")
+
+        tournament.add_player(player)
+
+        self.log(f"{player} inscrit au tournoi {tournament.name}")
+
+    def launch_new_round(self):
+        tournament = self.get_active_tournament()
+
+        error = tournament.check_new_round()
+        if error is not None:
+            raise ScriptError(error)
+
+        new_round = tournament.launch_new_round()
+
+        self.log(f"{new_round.name} lancé ({len(new_round.matches)} matchs)")
+
+    def set_score(self, match_number, score1, score2):
+        tournament = self.get_active_tournament()
+        last_round = tournament.get_last_round()
+
+        if last_round is None or last_round.is_ended():
+            raise ScriptError("aucun round n'est en cours")
+        if not 0 < int(match_number) <= len(last_round.matches):
+            raise ScriptError(f"le match {match_number} n'existe pas "
+                              f"dans {last_round.name}")
+
+        rated = tournament.rated
+        tournament.set_a_score(last_round.matches[int(match_number) - 1],
+                               int(score1), int(score2))
+
+        if tournament.rated and not rated:
+            changes = tournament.rating_changes
+            self.store.update_players(list(changes))
+            self.log(f"{tournament.name} terminé, "
+                     f"{len(changes)} classements Elo mis à jour")
+
+    def recompute_ratings(self):
+        nb_games = self.store.recompute_ratings()
+
+        self.log(f"classements Elo recalculés à partir de {nb_games} parties")
+
+    def import_rating_list(self, path):
+        importer = RatingListImporter(self.store.registry,
+                                      self.store.serializer,
+                                      self.store.update_players)
+        try:
+            summary = importer.import_file(path)
+        except (OSError, ValueError) as error:
+            raise ScriptError(f"import impossible ({error})")
+
+        self.log(f"liste importée : {summary}")
+        for error in summary.errors:
+            self.log(f"refusé {error}")
+
+    def set_scores(self, *scores):
+        for match_number, score in enumerate(scores, start=1):
+            score1, score2 = score.split('-')
+            self.set_score(match_number, score1, score2)
+
+        self.log(f"{len(scores)} scores enregistrés")
+
+    def save(self):
+        players_ids, tournaments_ids = self.store.save()
+
+        self.log(f"{len(players_ids)} joueurs et {len(tournaments_ids)} "
+                 f"tournois sauvegardés")
+
+    def export(self, report, path):
+        if report not in self.REPORTS:
+            raise ScriptError(f"rapport inconnu {report}, choisir parmi "
+                              f"{', '.join(self.REPORTS)}")
+
+        exporter = ReportExporter.get_exporter(path)
+        if exporter is None:
+            raise ScriptError(f"format inconnu pour {path}, choisir parmi "
+                              f"{', '.join(EXPORTERS)}")
+
+        if report == 'joueurs':
+            description = "Manager de Tournoi d'Échecs\n"
+            rows = Controller.create_player_dict_list(
+                sorted(self.store.registry.get_players(),
+                       key=lambda x: x.family_name.title()))
+        else:
+            tournament = self.get_active_tournament()
+            description = str(tournament)
+            if report == 'classement':
+                rows = tournament.get_ranking_to_display()
+            elif report == 'noms':
+                rows = tournament.get_ranking_to_display(False)
+            elif report == 'rounds':
+                rows = tournament.get_all_rounds_to_display()
+            else:
+                rows = tournament.get_all_matches_to_display()
+
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            nb_rows = exporter.export(description + f"\nRapport {report}",
+                                      rows, file)
+
+        self.log(f"Rapport {report} exporté dans {path} "
+                 f"({nb_rows} lignes)")
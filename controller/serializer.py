@@ -1,50 +1,169 @@
+import json
+import os
 from tinydb import TinyDB
+from tinydb.table import Document
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import Storage
 from Model.player import Player
 from Model.tournament import Tournament
+from controller.abstractserializer import AbstractSerializer
 
 
-class Serializer:
+class AtomicJSONStorage(Storage):
+    """TinyDB storage writing the whole json file at once: in a temporary
+    file (fsync'd) which replaces the previous one, so a crash during a
+    save can't leave a truncated database
+
+    Each flush encodes and writes the whole database again, even for a
+    single modified match, so its cost grows with the size of the archive
+    (not with the size of the modification). Large archives should use
+    SQLiteSerializer (rows updated in place) or SnapshotSerializer
+    (unmodified blocks copied as they are) instead."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def read(self):
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                content = file.read()
+        except FileNotFoundError:
+            return None
+
+        if not content:
+            return None
+
+        return json.loads(content)
+
+    def write(self, data: dict):
+        temporary_path = self.path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary_path, self.path)
+
+
+class Serializer(AbstractSerializer):
     """This class will help controller to save and load objects Tournament
-    and Players"""
+    and Players in a TinyDB json file
+
+    Only new or modified objects (see Serializable.is_dirty) are serialized
+    on save, existing documents are updated in place and keep their doc_id
+    (the doc_id of a player is his permanent player_id).
+    Writes are cached in memory and written to the json file by flush.
+    """
 
-    def __init__(self):
-        self.db = TinyDB('db.json')
+    def __init__(self, path='db.json'):
+        self.path = path
+        self.db = TinyDB(path, storage=CachingMiddleware(AtomicJSONStorage))
         self.players_table = self.db.table('Players')
         self.tournaments_table = self.db.table('Tournaments')
+        # a single document {'sequence': last journal record saved}
+        self.journal_table = self.db.table('Journal')
 
     def save_players(self, players: list):
-        """save tournaments
-                :param players list of object Player
+        """save new or modified players
+                :param players list of registered Player
 
                 :return a list of ids recorded in db
         """
-
-        serialized_players = []
+        ids = []
+        updated_ids = []
+        updated_documents = []
+        new_documents = []
 
         for player in players:
-            serialized_players.append(player.serialize())
-
-        self.players_table.truncate()
-
-        ids = self.players_table.insert_multiple(serialized_players)
-        for index in range(len(ids)):
-            players[index].id_in_db = ids[index]
+            if player.is_dirty():
+                if self.players_table.contains(doc_id=player.player_id):
+                    updated_ids.append(player.player_id)
+                    updated_documents.append(player.serialize())
+                else:
+                    new_documents.append(Document(player.serialize(),
+                                                  doc_id=player.player_id))
+                player.set_dirty(False)
+                ids.append(player.player_id)
+
+        # each table write rebuilds the whole table: update all at once
+        # (documents exist, so they are updated in the order of their ids)
+        if updated_ids:
+            documents = iter(updated_documents)
+            self.players_table.update(
+                lambda document: document.update(next(documents)),
+                doc_ids=updated_ids)
+        if new_documents:
+            self.players_table.insert_multiple(new_documents)
 
         return ids
 
     def save_tournaments(self, tournaments: list):
-        """save tournaments
+        """save new or modified tournaments
         :param tournaments list of object Tournament
 
         :return a list of ids recorded in db"""
-        serialized_tournaments = []
+        ids = self.save_instances(self.tournaments_table, tournaments)
+
+        return ids
+
+    def save_journal_sequence(self, sequence: int):
+        if sequence == self.load_journal_sequence():
+            return
+
+        if self.journal_table.contains(doc_id=1):
+            self.journal_table.update({'sequence': sequence}, doc_ids=[1])
+        else:
+            self.journal_table.insert(Document({'sequence': sequence},
+                                               doc_id=1))
+
+    def load_journal_sequence(self) -> int:
+        document = self.journal_table.get(doc_id=1)
+        if document is None:
+            return 0
+
+        return document['sequence']
+
+    def flush(self):
+        """write cached writes in the json file"""
+        self.db.storage.flush()
+
+    @staticmethod
+    def save_instances(table, instances: list):
+        """update documents of modified instances
+        and insert new instances in table
+
+        :param table a tinyDB table
+        :param instances list of Serializable objects with id_in_db attribute
+
+        :return a list of ids recorded in db"""
+        ids = []
+        new_instances = []
 
-        for tournament in tournaments:
-            serialized_tournaments.append(tournament.serialize())
+        for instance in instances:
+            if not instance.is_dirty():
+                continue
 
-        self.tournaments_table.truncate()
+            if instance.id_in_db is None:
+                new_instances.append(instance)
+            else:
+                table.update(instance.serialize(),
+                             doc_ids=[instance.id_in_db])
+                ids.append(instance.id_in_db)
+                instance.set_dirty(False)
 
-        return self.tournaments_table.insert_multiple(serialized_tournaments)
+        if new_instances:
+            serialized_instances = []
+            for instance in new_instances:
+                serialized_instances.append(instance.serialize())
+
+            new_ids = table.insert_multiple(serialized_instances)
+            for instance, new_id in zip(new_instances, new_ids):
+                instance.id_in_db = new_id
+                instance.set_dirty(False)
+
+            ids.extend(new_ids)
+
+        return ids
 
     def load_players(self):
         players = []
@@ -59,15 +178,17 @@ class Serializer:
     def load_tournaments(self, players_list):
         tournaments = []
 
-        players_by_id = dict()
-
-        for player in players_list:
-            players_by_id[player.id_in_db] = player
-
         serialized_tournaments = self.tournaments_table.all()
 
         for serialized_tournament in serialized_tournaments:
-            tournaments.append(Tournament.deserialize(serialized_tournament,
-                                                      players_by_id))
+            nb_players = len(serialized_tournament['players'])
+            tournaments.append(Tournament.deserialize_header(
+                serialized_tournament, nb_players))
 
         return tournaments
+
+    def load_tournament_details(self, tournament, players_by_id):
+        serialized_tournament = \
+            self.tournaments_table.get(doc_id=tournament.id_in_db)
+
+        tournament.hydrate(serialized_tournament, players_by_id)
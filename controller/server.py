@@ -0,0 +1,366 @@
+import asyncio
+import json
+from urllib.parse import urlsplit
+from Model.tiebreaks import TieBreaks
+from Model.tournament import Tournament
+from controller.abstractserializer import AbstractSerializer
+from controller.store import TournamentStore
+from controller.session import ConflictError, MatchNotFoundError, \
+    SessionError, TournamentSession
+
+
+class ApiError(Exception):
+    """error returned to the client with an HTTP status
+    (and optional datas added to the json error)"""
+
+    def __init__(self, status: int, message: str, datas: dict = None):
+        super().__init__(message)
+        self.status = status
+        self.datas = datas
+
+
+class ApiServer:
+    """Local HTTP/JSON server giving access to the tournaments
+    (for standings screens and result entry on tablets)
+
+        GET  /tournaments                  list of tournaments
+        GET  /tournaments/N/pairings       matches of the last round
+        GET  /tournaments/N/standings      ranking with tie-breaks
+        POST /tournaments/N/results        {"match": M, "score1": S1,
+                                            "score2": S2, "version": V}
+        POST /tournaments/N/rounds         launch a new round
+        POST /save                         save players and tournaments
+
+    N is the number of the tournament (from 1, as in reports) and M the
+    number of the match in the last round (from 1). V (optional) is the
+    version of the match given by pairings, if the match has been
+    modified since, the score is refused (409) with the current version.
+
+    Requests are read in one asyncio loop, operations on tournaments run
+    in threads through a TournamentSession per tournament (its lock is
+    held by each operation), so a slow operation (loading a tournament,
+    pairing a big open, saving) never blocks polling nor result entry of
+    the other tournaments.
+    GET responses are cached (already encoded) per tournament, the cache
+    of a tournament is cleared by an observer on each modification.
+    Players and tournaments are kept by a TournamentStore, which
+    records modifications in the journal, like in the console, and
+    guards the serializer shared by all the threads (loading of
+    tournaments by sessions, saves).
+    The score ending a tournament rates it (see Tournament.rate), the
+    new elos are then updated in the other tournaments.
+
+    :param serializer: a storage backend (derived from AbstractSerializer)
+    :param host: address to listen on
+    :param port: TCP port to listen on
+    """
+
+    MAX_BODY_SIZE = 65536
+
+    STATUS_TEXTS = {200: "OK", 201: "Created", 400: "Bad Request",
+                    404: "Not Found", 405: "Method Not Allowed",
+                    409: "Conflict", 413: "Payload Too Large"}
+
+    def __init__(self, serializer: AbstractSerializer,
+                 host: str = '127.0.0.1', port: int = 8080, log=print):
+        self.host = host
+        self.port = port
+        self.log = log
+
+        # tournament: {kind of response: encoded body}
+        self.cache = dict()
+        self.sessions = dict()
+
+        self.store = TournamentStore(serializer)
+        self.store.add_observer(self.clear_cache)
+        self.store.load()
+
+        for tournament in self.store.tournaments:
+            self.sessions[tournament] = TournamentSession(
+                tournament, self.store.load_tournament_details)
+
+    def save_locked(self):
+        """save once no tournament is being modified"""
+        with TournamentSession.lock_all(self.sessions.values()):
+            self.store.save()
+
+    def update_rated_players(self, tournament: Tournament):
+        """update the registry and the standings of the other tournaments
+        with the new elos of the players of a tournament which has just
+        been rated (see Tournament.rate)"""
+        players = list(tournament.rating_changes)
+
+        with TournamentSession.lock_all(self.sessions.values()):
+            self.store.update_players(players)
+            for other_tournament in self.store.tournaments:
+                if other_tournament.is_loaded:
+                    # standings show elos
+                    self.cache.pop(other_tournament, None)
+
+    def clear_cache(self, tournament, action: str, datas: dict):
+        """Tournament observer, forget cached responses of tournament"""
+        self.cache.pop(tournament, None)
+
+    async def serve_forever(self):
+        server = await asyncio.start_server(self.handle_client,
+                                            self.host, self.port)
+        self.log(f"Serveur en écoute sur http://{self.host}:{self.port}")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.store.close()
+
+    async def handle_client(self, reader, writer):
+        """read HTTP/1.1 requests of a connection (kept alive)
+        and answer them"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                method, target, version = \
+                    request_line.decode('latin-1').split()
+
+                headers = dict()
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length > self.MAX_BODY_SIZE:
+                    status, body = self.error(413, "Requête trop grande")
+                    keep_alive = False
+                else:
+                    datas = await reader.readexactly(length)
+                    status, body = await self.dispatch(method, target, datas)
+                    keep_alive = version == 'HTTP/1.1' \
+                        and headers.get('connection', '').lower() != 'close'
+
+                writer.write(self.create_response(status, body, keep_alive))
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    def create_response(self, status: int, body: bytes,
+                        keep_alive: bool) -> bytes:
+        head = f"HTTP/1.1 {status} {self.STATUS_TEXTS[status]}\r\n" \
+               f"Content-Type: application/json; charset=utf-8\r\n" \
+               f"Content-Length: {len(body)}\r\n" \
+               f"Access-Control-Allow-Origin: *\r\n" \
+               f"Connection: {'keep-alive' if keep_alive else 'close'}" \
+               f"\r\n\r\n"
+
+        return head.encode('latin-1') + body
+
+    @staticmethod
+    def encode(datas) -> bytes:
+        return json.dumps(datas, ensure_ascii=False).encode('utf-8')
+
+    def error(self, status: int, message: str, datas: dict = None) -> tuple:
+        error = {'error': message}
+        if datas is not None:
+            error.update(datas)
+
+        return status, self.encode(error)
+
+    async def dispatch(self, method: str, target: str, datas: bytes):
+        """:return (status, encoded body) of the response to a request"""
+        path = [part for part in urlsplit(target).path.split('/') if part]
+
+        try:
+            if path == ['tournaments']:
+                self.check_method(method, 'GET')
+                return 200, self.encode(self.get_tournaments())
+
+            if path == ['save']:
+                self.check_method(method, 'POST')
+                return 200, self.encode(await self.save_all())
+
+            if len(path) != 3 or path[0] != 'tournaments':
+                raise ApiError(404, "Adresse inconnue")
+
+            tournament = self.get_tournament(path[1])
+
+            if path[2] in ('pairings', 'standings'):
+                self.check_method(method, 'GET')
+                return 200, await self.get_cached(tournament, path[2])
+            if path[2] == 'results':
+                self.check_method(method, 'POST')
+                return 200, self.encode(await self.set_a_score(
+                    tournament, self.decode(datas)))
+            if path[2] == 'rounds':
+                self.check_method(method, 'POST')
+                return 201, self.encode(
+                    await self.launch_new_round(tournament))
+
+            raise ApiError(404, "Adresse inconnue")
+
+        except ApiError as error:
+            return self.error(error.status, str(error), error.datas)
+
+    @staticmethod
+    def check_method(method: str, allowed_method: str):
+        if method != allowed_method:
+            raise ApiError(405, f"Seule la méthode {allowed_method} "
+                                f"est acceptée")
+
+    @staticmethod
+    def decode(datas: bytes) -> dict:
+        try:
+            decoded_datas = json.loads(datas)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ApiError(400, "Le corps de la requête doit être du json")
+
+        if not isinstance(decoded_datas, dict):
+            raise ApiError(400, "Le corps de la requête doit être un objet")
+
+        return decoded_datas
+
+    def get_tournament(self, number: str) -> Tournament:
+        if not number.isdigit() \
+                or not 0 < int(number) <= len(self.store.tournaments):
+            raise ApiError(404, f"Le tournoi {number} n'existe pas")
+
+        return self.store.tournaments[int(number) - 1]
+
+    @staticmethod
+    async def run_in_thread(function, *args):
+        """run a function which may wait for a lock
+        without blocking the loop"""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, function, *args)
+
+    def get_tournaments(self) -> list:
+        tournaments = []
+        for number, tournament in enumerate(self.store.tournaments, start=1):
+            tournaments.append({
+                'number': number,
+                'name': tournament.name,
+                'place': tournament.place,
+                'dates': [day.strftime('%d/%m/%y')
+                          for day in tournament.dates],
+                'time_control': tournament.time_control,
+                'nb_rounds': tournament.nb_rounds,
+                'nb_players': tournament.get_nb_players()})
+
+        return tournaments
+
+    async def get_cached(self, tournament: Tournament, kind: str) -> bytes:
+        """:return the encoded pairings or standings of tournament,
+        from the cache if it has not been modified since"""
+        cached = self.cache.get(tournament, {}).get(kind)
+        if cached is not None:
+            return cached
+
+        return await self.run_in_thread(self.sessions[tournament].read,
+                                        self.create_cached, kind)
+
+    def create_cached(self, tournament: Tournament, kind: str) -> bytes:
+        """encode and cache a response (inside the tournament lock,
+        so the observer can't clear the cache meanwhile)"""
+        if kind == 'pairings':
+            body = self.encode(self.get_pairings(tournament))
+        else:
+            body = self.encode(self.get_standings(tournament))
+
+        self.cache.setdefault(tournament, dict())[kind] = body
+
+        return body
+
+    @staticmethod
+    def get_pairings(tournament: Tournament) -> dict:
+        last_round = tournament.get_last_round()
+        if last_round is None:
+            return {'round': None, 'ended': False, 'matches': []}
+
+        matches = []
+        for number, match in enumerate(last_round.matches, start=1):
+            player1, player2 = match.get_players()
+            matches.append({'number': number,
+                            'player1': repr(player1),
+                            'player1_id': player1.player_id,
+                            'player2': repr(player2),
+                            'player2_id': player2.player_id,
+                            'score1': match.score1,
+                            'score2': match.score2,
+                            'version': match.version})
+
+        return {'round': last_round.name,
+                'ended': last_round.is_ended(),
+                'matches': matches}
+
+    @staticmethod
+    def get_standings(tournament: Tournament) -> list:
+        standings = []
+        for row in tournament.get_ranking_to_display():
+            player = row['Joueur']
+            standings.append({
+                'rank': row['N°'],
+                'player': repr(player),
+                'player_id': player.player_id,
+                'elo': row['ELO'],
+                'points': row['Points'],
+                'tie_breaks': {name: row[name] for name in TieBreaks.NAMES}})
+
+        return standings
+
+    async def set_a_score(self, tournament: Tournament, datas: dict) -> dict:
+        try:
+            number = int(datas['match'])
+            score1 = int(datas['score1'])
+            score2 = int(datas['score2'])
+            version = datas.get('version')
+            if version is not None:
+                version = int(version)
+        except (KeyError, TypeError, ValueError):
+            raise ApiError(400, "match, score1, score2 (et version) "
+                                "doivent être des entiers")
+
+        try:
+            match, round_ended = await self.run_in_thread(
+                self.sessions[tournament].set_a_score,
+                number, score1, score2, version)
+        except ConflictError as error:
+            raise ApiError(409, str(error),
+                           {'score1': error.match.score1,
+                            'score2': error.match.score2,
+                            'version': error.match.version})
+        except MatchNotFoundError as error:
+            raise ApiError(404, str(error))
+        except SessionError as error:
+            raise ApiError(409, str(error))
+
+        if round_ended and tournament.is_ended():
+            # this score ended the tournament, which is now rated
+            await self.run_in_thread(self.update_rated_players, tournament)
+
+        return {'match': number,
+                'score': match.get_score(),
+                'version': match.version,
+                'round_ended': round_ended}
+
+    async def launch_new_round(self, tournament: Tournament) -> dict:
+        try:
+            new_round = await self.run_in_thread(
+                self.sessions[tournament].launch_new_round)
+        except SessionError as error:
+            raise ApiError(409, str(error))
+
+        return {'round': new_round.name, 'nb_matches': len(new_round.matches)}
+
+    async def save_all(self) -> dict:
+        await self.run_in_thread(self.save_locked)
+
+        return {'saved': True}
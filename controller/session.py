@@ -0,0 +1,118 @@
+from contextlib import contextmanager, ExitStack
+import threading
+from Model.match import Match
+from Model.player import Player
+from Model.round import Round
+from Model.tournament import Tournament
+
+
+class SessionError(Exception):
+    """an operation refused by a TournamentSession"""
+    pass
+
+
+class MatchNotFoundError(SessionError):
+    """the match does not exist in the last round"""
+    pass
+
+
+class ConflictError(SessionError):
+    """a match has been modified since the version known by the caller
+
+    :param match: the match, with its current score and version
+    """
+
+    def __init__(self, match: Match):
+        super().__init__(f"Le match {repr(match)} a été modifié entre-temps "
+                         f"(score actuel : {match.get_score()})")
+        self.match = match
+
+
+class TournamentSession:
+    """Thread-safe access to a tournament modified by several arbiters
+    at once (threads, or asyncio tasks through run_in_executor)
+
+    Each tournament has its own lock, held by every operation, so
+    arbiters of different tournaments never wait for each other and
+    operations on a tournament are short (scores and results are
+    recorded incrementally).
+    Scores may be given with the version of the match seen by the
+    arbiter (optimistic check): if someone else gave a score meanwhile,
+    a ConflictError is raised instead of overwriting it.
+    Results of a round are recorded by the score which ends it, inside
+    the lock, so they can't be recorded twice.
+
+    :param tournament: the Tournament
+    :param load: function loading details of a not loaded tournament
+    """
+
+    def __init__(self, tournament: Tournament, load=None):
+        self.tournament = tournament
+        self.load = load
+        self.lock = threading.Lock()
+
+    def check_loaded(self):
+        """load the tournament if needed (the lock must be held)"""
+        if not self.tournament.is_loaded:
+            self.load(self.tournament)
+
+    def read(self, function, *args):
+        """:return function(tournament, *args), called inside the lock"""
+        with self.lock:
+            self.check_loaded()
+            return function(self.tournament, *args)
+
+    def add_player(self, player: Player):
+        with self.lock:
+            self.check_loaded()
+            if player in self.tournament.points:
+                raise SessionError(f"{player} est déjà inscrit")
+            self.tournament.add_player(player)
+
+    def launch_new_round(self) -> Round:
+        with self.lock:
+            self.check_loaded()
+
+            error = self.tournament.check_new_round()
+            if error is not None:
+                raise SessionError(error)
+
+            return self.tournament.launch_new_round()
+
+    def set_a_score(self, match_number: int, score1: int, score2: int,
+                    version: int = None) -> tuple:
+        """give a score to a match of the last round
+
+        :param match_number: number of the match (from 1)
+        :param version: version of the match known by the caller,
+                        None to skip the check
+
+        :return (match, True if this score ended the round)"""
+        with self.lock:
+            self.check_loaded()
+
+            last_round = self.tournament.get_last_round()
+            if last_round is None or last_round.is_ended():
+                raise SessionError("Il n'y a pas de round en cours.")
+            if not 0 < match_number <= len(last_round.matches):
+                raise MatchNotFoundError(f"Le match {match_number} n'existe "
+                                         f"pas dans {last_round.name}")
+
+            match = last_round.matches[match_number - 1]
+            if version is not None and version != match.version:
+                raise ConflictError(match)
+
+            self.tournament.set_a_score(match, score1, score2)
+
+            return match, last_round.is_ended()
+
+    @staticmethod
+    @contextmanager
+    def lock_all(sessions):
+        """hold the locks of all sessions (to save them), locks are always
+        taken in the order of sessions, so callers must give them in
+        the same order"""
+        with ExitStack() as stack:
+            for session in sessions:
+                stack.enter_context(session.lock)
+            yield
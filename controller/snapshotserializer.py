@@ -0,0 +1,612 @@
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+import mmap
+import os
+import struct
+from Model.player import Player
+from Model.tournament import Tournament
+from controller.abstractserializer import AbstractSerializer
+
+
+class StringTable:
+    """Strings (utf-8) and packed integers written one after the other,
+    referenced by (offset, size) from fixed-width records, identical
+    strings are written once"""
+
+    def __init__(self):
+        self.datas = bytearray()
+        self.references = dict()
+
+    def add(self, datas: bytes) -> tuple:
+        reference = self.references.get(datas)
+        if reference is None:
+            reference = (len(self.datas), len(datas))
+            self.datas += datas
+            self.references[datas] = reference
+
+        return reference
+
+    def add_text(self, text: str) -> tuple:
+        return self.add(text.encode('utf-8'))
+
+
+class BlockWriter:
+    """Write blocks one after the other in a file, a block being bytes or
+    the (offset, size) of a block of source (the mmap of the previous
+    file): consecutive blocks of source are copied at once
+
+    :param file: the file written
+    :param source: a mmap (or None)
+    """
+
+    CHUNK_SIZE = 1 << 24
+
+    def __init__(self, file, source):
+        self.file = file
+        self.source = source
+        self.offset = 0
+        # [start, end] in source of the blocks not copied yet
+        self.run = None
+
+    def write(self, block) -> tuple:
+        """:return the (offset, size) of block in the file"""
+        if isinstance(block, tuple):
+            start, size = block
+            if self.run is not None and self.run[1] == start:
+                self.run[1] = start + size
+            else:
+                self.copy_run()
+                self.run = [start, start + size]
+        else:
+            self.copy_run()
+            self.file.write(block)
+            size = len(block)
+
+        reference = (self.offset, size)
+        self.offset += size
+
+        return reference
+
+    def copy_run(self):
+        """copy the blocks of source not copied yet"""
+        if self.run is None:
+            return
+
+        start, end = self.run
+        for chunk_start in range(start, end, self.CHUNK_SIZE):
+            self.file.write(
+                self.source[chunk_start:min(end,
+                                            chunk_start + self.CHUNK_SIZE)])
+        self.run = None
+
+
+class SnapshotSerializer(AbstractSerializer):
+    """This class will help controller to save and load objects Tournament
+    and Players in a compact binary snapshot, read through mmap
+
+    The file is made of little-endian blocks, each one independent of its
+    position in the file:
+        HEADER (with the sequence of the last journal record contained
+        in the snapshot), then a block per player: PLAYER, his names
+        (utf-8) and nb_ratings RATING (his rating history), then a block
+        per tournament: TOURNAMENT, its name, place and description (utf-8)
+        and its dates, followed by its details: DETAILS, nb_players
+        TOURNAMENT_PLAYER, nb_rounds ROUND, nb_matches MATCH (round by
+        round) and a local string table.
+    Dates are ordinals (date.toordinal) and datetimes are seconds since
+    EPOCH, so nothing is parsed with strptime at load.
+
+    Players and tournament headers are decoded at load, the details of
+    a tournament are only decoded by load_tournament_details.
+    Save methods only take the values of new or modified objects, flush
+    encodes them once (whatever the number of saves since the previous
+    flush) and writes a new snapshot in a temporary file which replaces
+    the previous one. Blocks of objects not modified since (like details
+    of tournaments not opened) are copied as they are from the previous
+    one, so only modified objects are encoded, and objects are not read
+    while the snapshot is encoded and written.
+    """
+
+    MAGIC = b'P4TS'
+    VERSION = 1
+
+    HEADER = struct.Struct('<4sHIIQQ')
+    PLAYER = struct.Struct('<IIIIBiII')
+    RATING = struct.Struct('<Iiii')
+    TOURNAMENT = struct.Struct('<IIIIBBHHIQ')
+    DETAILS = struct.Struct('<IIII')
+    TOURNAMENT_PLAYER = struct.Struct('<Idi')
+    ROUND = struct.Struct('<IIqqI')
+    MATCH = struct.Struct('<IIiiI')
+
+    EPOCH = datetime(1970, 1, 1)
+    NO_DATETIME = -2 ** 63
+    NO_SCORE = -2 ** 31
+    NO_FIDE_ID = 0
+    NO_BIRTH_DATE = 0
+
+    def __init__(self, path='db.snapshot'):
+        self.path = path
+        self.file = None
+        self.mmap = None
+
+        # blocks of all saved or loaded objects, each flush writes all of
+        # them, a block is bytes (encoded by flush) or its (offset, size)
+        # in self.mmap: player_id: block of the player
+        self.players = dict()
+        # id_in_db: [block of the header, block of the details]
+        self.tournaments = dict()
+        self.last_tournament_id = 0
+        self.journal_sequence = 0
+
+        # values taken by save methods, encoded by flush
+        # player_id: values (see get_player_values)
+        self.pending_players = dict()
+        # id_in_db: (values of the header (see get_header_values),
+        # values of the details (see get_details_values) or None if the
+        # tournament is not loaded)
+        self.pending_tournaments = dict()
+        self.pending_journal_sequence = None
+
+        self.open()
+
+    def open(self):
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            self.file = open(self.path, 'rb')
+            self.mmap = mmap.mmap(self.file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+
+            magic, version, _, _, _, journal_sequence = \
+                self.HEADER.unpack_from(self.mmap)
+            if magic != self.MAGIC or version != self.VERSION:
+                self.close()
+                raise ValueError(f"{self.path} n'est pas un snapshot "
+                                 f"(version {self.VERSION})")
+            self.journal_sequence = journal_sequence
+
+    def close(self):
+        if self.mmap is not None:
+            self.mmap.close()
+            self.file.close()
+        self.mmap = None
+        self.file = None
+
+    def save_players(self, players: list):
+        ids = []
+        for player in players:
+            if player.is_dirty():
+                self.pending_players[player.player_id] = \
+                    self.get_player_values(player)
+                ids.append(player.player_id)
+                player.set_dirty(False)
+
+        return ids
+
+    def save_tournaments(self, tournaments: list):
+        ids = []
+        for tournament in tournaments:
+            if not tournament.is_dirty():
+                continue
+
+            if tournament.id_in_db is None:
+                self.last_tournament_id += 1
+                tournament.id_in_db = self.last_tournament_id
+
+            # details of a not loaded tournament are not modified
+            details = None
+            if tournament.is_loaded:
+                details = self.get_details_values(tournament)
+            self.pending_tournaments[tournament.id_in_db] = \
+                (self.get_header_values(tournament), details)
+
+            ids.append(tournament.id_in_db)
+            tournament.set_dirty(False)
+
+        return ids
+
+    def save_journal_sequence(self, sequence: int):
+        if sequence != self.load_journal_sequence():
+            self.pending_journal_sequence = sequence
+
+    def load_journal_sequence(self) -> int:
+        if self.pending_journal_sequence is not None:
+            return self.pending_journal_sequence
+
+        return self.journal_sequence
+
+    @staticmethod
+    def get_player_values(player: Player) -> tuple:
+        """:return values of player written in the snapshot"""
+        return (player.player_id,
+                player.family_name,
+                player.first_name,
+                player.birth_date.toordinal()
+                if player.birth_date is not None
+                else SnapshotSerializer.NO_BIRTH_DATE,
+                player.sex,
+                player.elo,
+                player.fide_id,
+                tuple(player.rating_history))
+
+    @staticmethod
+    def get_header_values(tournament: Tournament) -> tuple:
+        """:return values of the header of tournament written in the
+        snapshot"""
+        return (tournament.id_in_db,
+                tournament.name,
+                tournament.place,
+                tuple(day.toordinal() for day in tournament.dates),
+                Tournament.time_control_types.index(tournament.time_control),
+                tournament.rated,
+                tournament.nb_rounds,
+                tournament.description,
+                tournament.get_nb_players())
+
+    @staticmethod
+    def get_details_values(tournament: Tournament) -> tuple:
+        """:return values of the details of a loaded tournament written
+        in the snapshot, as (list of (player_id, points, elo), list of
+        (name, start, end, list of (player1_id, player2_id, score1,
+        score2, version)) of rounds)"""
+        return ([(player.player_id, tournament.points[player],
+                  tournament.elos[player])
+                 for player in tournament.players],
+                [(a_round.name, a_round.start, a_round.end,
+                  [(match.player1.player_id, match.player2.player_id,
+                    match.score1, match.score2, match.version)
+                   for match in a_round.matches])
+                 for a_round in tournament.rounds])
+
+    def encode(self):
+        """encode the blocks of objects saved since the previous flush"""
+        for player_id, values in self.pending_players.items():
+            self.players[player_id] = self.encode_player(*values)
+
+        for tournament_id, (header, details) \
+                in self.pending_tournaments.items():
+            blocks = self.tournaments.setdefault(tournament_id, [None, None])
+            if details is not None:
+                blocks[1] = self.encode_details(*details)
+            blocks[0] = self.encode_header(*header,
+                                           self.get_size(blocks[1]))
+
+        if self.pending_journal_sequence is not None:
+            self.journal_sequence = self.pending_journal_sequence
+
+        self.pending_players = dict()
+        self.pending_tournaments = dict()
+        self.pending_journal_sequence = None
+
+    @staticmethod
+    def get_size(block) -> int:
+        if isinstance(block, tuple):
+            return block[1]
+
+        return len(block)
+
+    def flush(self):
+        """encode objects saved since the previous flush and write a new
+        snapshot, if any"""
+        if not self.pending_players and not self.pending_tournaments \
+                and self.pending_journal_sequence is None:
+            return
+
+        self.encode()
+
+        tournaments_offset = self.HEADER.size + sum(
+            self.get_size(block) for block in self.players.values())
+        new_players = dict()
+        new_tournaments = dict()
+
+        temporary_path = self.path + '.tmp'
+        with open(temporary_path, 'wb') as file:
+            writer = BlockWriter(file, self.mmap)
+            writer.write(self.HEADER.pack(self.MAGIC, self.VERSION,
+                                          len(self.players),
+                                          len(self.tournaments),
+                                          tournaments_offset,
+                                          self.journal_sequence))
+            for player_id, block in self.players.items():
+                new_players[player_id] = writer.write(block)
+            for tournament_id, (header, details) in self.tournaments.items():
+                new_tournaments[tournament_id] = [writer.write(header),
+                                                  writer.write(details)]
+            writer.copy_run()
+            file.flush()
+            os.fsync(file.fileno())
+
+        # the previous snapshot can't be replaced while it is mapped
+        self.close()
+        os.replace(temporary_path, self.path)
+        # encoded blocks are forgotten, they are in the new mmap
+        self.players = new_players
+        self.tournaments = new_tournaments
+        self.open()
+
+    def encode_player(self, player_id: int, family_name: str,
+                      first_name: str, birth_date: int, sex: int, elo: int,
+                      fide_id: int, rating_history: tuple) -> bytes:
+        """:return the block of a player (values as given by
+        get_player_values)"""
+        family_name = family_name.encode('utf-8')
+        first_name = first_name.encode('utf-8')
+
+        return b''.join((
+            self.PLAYER.pack(player_id,
+                             birth_date,
+                             len(family_name),
+                             len(first_name),
+                             sex,
+                             elo,
+                             self.NO_FIDE_ID if fide_id is None else fide_id,
+                             len(rating_history)),
+            family_name,
+            first_name,
+            *(self.RATING.pack(self.encode_date(change.date),
+                               change.elo_before,
+                               change.elo_after,
+                               change.nb_games)
+              for change in rating_history)))
+
+    def encode_header(self, tournament_id: int, name: str, place: str,
+                      dates: tuple, time_control: int, rated: bool,
+                      nb_rounds: int, description: str, nb_players: int,
+                      details_size: int) -> bytes:
+        """:return the block of the header of a tournament (values as
+        given by get_header_values, and the size of its details)"""
+        name = name.encode('utf-8')
+        place = place.encode('utf-8')
+        description = description.encode('utf-8')
+
+        return b''.join((
+            self.TOURNAMENT.pack(tournament_id,
+                                 len(name),
+                                 len(place),
+                                 len(description),
+                                 time_control,
+                                 rated,
+                                 nb_rounds,
+                                 len(dates),
+                                 nb_players,
+                                 details_size),
+            name,
+            place,
+            description,
+            struct.pack(f'<{len(dates)}I', *dates)))
+
+    def encode_details(self, players: list, rounds: list) -> bytes:
+        """:return details of a tournament (players, points, rounds and
+        matches, values as given by get_details_values) as a block
+        independent of its position in the file"""
+        strings = StringTable()
+        round_records = []
+        match_records = []
+
+        for name, start, end, matches in rounds:
+            round_records.append(self.ROUND.pack(
+                *strings.add_text(name),
+                self.encode_datetime(start),
+                self.encode_datetime(end),
+                len(matches)))
+
+            for player1_id, player2_id, score1, score2, version \
+                    in matches:
+                match_records.append(self.MATCH.pack(
+                    player1_id,
+                    player2_id,
+                    self.NO_SCORE if score1 is None else score1,
+                    self.NO_SCORE if score2 is None else score2,
+                    version))
+
+        return b''.join((
+            self.DETAILS.pack(len(players), len(round_records),
+                              len(match_records), len(strings.datas)),
+            *(self.TOURNAMENT_PLAYER.pack(*player) for player in players),
+            *round_records,
+            *match_records,
+            strings.datas))
+
+    def encode_datetime(self, a_datetime) -> int:
+        if a_datetime is None:
+            return self.NO_DATETIME
+
+        return int((a_datetime - self.EPOCH).total_seconds())
+
+    def decode_datetime(self, seconds: int):
+        if seconds == self.NO_DATETIME:
+            return None
+
+        return self.EPOCH + timedelta(seconds=seconds)
+
+    def get_text(self, offset: int, size: int) -> str:
+        return str(self.mmap[offset:offset + size], 'utf-8')
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def encode_date(text: str) -> int:
+        """:return the ordinal of a date of rating history (dd/mm/yy),
+        dates are repeated for all players of a tournament, so they are
+        parsed once"""
+        return datetime.strptime(text, '%d/%m/%y').toordinal()
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def decode_date(ordinal: int) -> str:
+        """:return a date of rating history (dd/mm/yy) from its ordinal"""
+        return date.fromordinal(ordinal).strftime('%d/%m/%y')
+
+    def load_players(self):
+        players = []
+        self.players = dict()
+        if self.mmap is None:
+            return players
+
+        _, _, nb_players, _, _, _ = self.HEADER.unpack_from(self.mmap)
+        offset = self.HEADER.size
+
+        for _ in range(nb_players):
+            player_id, birth_date, family_size, first_size, sex, elo, \
+                fide_id, nb_ratings = self.PLAYER.unpack_from(self.mmap,
+                                                              offset)
+            position = offset + self.PLAYER.size
+            family_name = self.get_text(position, family_size)
+            position += family_size
+            first_name = self.get_text(position, first_size)
+            position += first_size
+
+            end = position + nb_ratings * self.RATING.size
+            rating_history = [(self.decode_date(ordinal), elo_before,
+                               elo_after, nb_games)
+                              for ordinal, elo_before, elo_after, nb_games
+                              in self.RATING.iter_unpack(
+                                  self.mmap[position:end])]
+
+            player = Player(family_name,
+                            first_name,
+                            date.fromordinal(birth_date)
+                            if birth_date != self.NO_BIRTH_DATE else None,
+                            sex,
+                            elo,
+                            player_id,
+                            rating_history,
+                            fide_id if fide_id != self.NO_FIDE_ID else None)
+            player.set_dirty(False)
+            self.players[player_id] = (offset, end - offset)
+            players.append(player)
+            offset = end
+
+        return players
+
+    def load_tournaments(self, players_list):
+        tournaments = []
+        self.tournaments = dict()
+        if self.mmap is None:
+            return tournaments
+
+        _, _, _, nb_tournaments, offset, _ = self.HEADER.unpack_from(self.mmap)
+
+        for _ in range(nb_tournaments):
+            tournament_id, name_size, place_size, description_size, \
+                time_control, rated, nb_rounds, nb_dates, nb_players, \
+                details_size = self.TOURNAMENT.unpack_from(self.mmap, offset)
+            position = offset + self.TOURNAMENT.size
+            name = self.get_text(position, name_size)
+            position += name_size
+            place = self.get_text(position, place_size)
+            position += place_size
+            description = self.get_text(position, description_size)
+            position += description_size
+            dates = struct.unpack_from(f'<{nb_dates}I', self.mmap, position)
+            position += 4 * nb_dates
+
+            serialized_header = {
+                'name': name,
+                'place': place,
+                'dates': [date.fromordinal(ordinal) for ordinal in dates],
+                'time_control': time_control,
+                'nb_rounds': nb_rounds,
+                'description': description,
+                'rated': bool(rated)}
+            tournament = Tournament.deserialize_header(serialized_header,
+                                                       nb_players)
+            tournament.id_in_db = tournament_id
+            self.tournaments[tournament_id] = [(offset, position - offset),
+                                               (position, details_size)]
+            self.last_tournament_id = max(self.last_tournament_id,
+                                          tournament_id)
+            tournaments.append(tournament)
+            offset = position + details_size
+
+        return tournaments
+
+    def load_tournament_details(self, tournament, players_by_id):
+        """decode the details block of tournament from the mmap,
+        then hydrate the tournament"""
+        offset, size = self.tournaments[tournament.id_in_db][1]
+        details = self.mmap[offset:offset + size]
+
+        nb_players, nb_rounds, nb_matches, _ = \
+            self.DETAILS.unpack_from(details)
+        players_offset = self.DETAILS.size
+        rounds_offset = players_offset \
+            + nb_players * self.TOURNAMENT_PLAYER.size
+        matches_offset = rounds_offset + nb_rounds * self.ROUND.size
+        strings_offset = matches_offset + nb_matches * self.MATCH.size
+
+        serialized_tournament = {'players': [],
+                                 'rounds': [],
+                                 'points': dict(),
+                                 'elos': dict(),
+                                 'already_played': dict()}
+
+        for player_id, points, elo in self.TOURNAMENT_PLAYER.iter_unpack(
+                details[players_offset:rounds_offset]):
+            serialized_tournament['players'].append(player_id)
+            serialized_tournament['points'][player_id] = \
+                int(points) if points.is_integer() else points
+            serialized_tournament['elos'][player_id] = elo
+            serialized_tournament['already_played'][player_id] = []
+
+        already_played = serialized_tournament['already_played']
+        matches = self.MATCH.iter_unpack(
+            details[matches_offset:strings_offset])
+
+        for name_offset, name_size, start, end, nb_round_matches \
+                in self.ROUND.iter_unpack(
+                    details[rounds_offset:matches_offset]):
+            name_offset += strings_offset
+            serialized_round = {
+                'name': str(details[name_offset:name_offset + name_size],
+                            'utf-8'),
+                'matches': [],
+                'start': self.decode_datetime(start),
+                'end': self.decode_datetime(end)}
+            serialized_tournament['rounds'].append(serialized_round)
+
+            for _ in range(nb_round_matches):
+                player1, player2, score1, score2, version = next(matches)
+                serialized_round['matches'].append({
+                    'player1': player1,
+                    'player2': player2,
+                    'score1': None if score1 == self.NO_SCORE else score1,
+                    'score2': None if score2 == self.NO_SCORE else score2,
+                    'version': version})
+
+                # results are recorded when the round is ended
+                if serialized_round['end'] is not None:
+                    already_played[player1].append(player2)
+                    already_played[player2].append(player1)
+
+        tournament.hydrate(serialized_tournament, players_by_id)
+
+    @staticmethod
+    def convert(source: AbstractSerializer, path: str):
+        """write all players and tournaments of source in a new snapshot
+        (tournaments get new ids, so the new snapshot starts with an empty
+        journal)
+
+        :return the SnapshotSerializer of the new snapshot"""
+        players = source.load_players()
+        players_by_id = {player.player_id: player for player in players}
+        tournaments = source.load_tournaments(players)
+        for tournament in tournaments:
+            source.load_tournament_details(tournament, players_by_id)
+            tournament.id_in_db = None
+            tournament.set_dirty()
+        for player in players:
+            player.set_dirty()
+
+        if os.path.exists(path):
+            os.remove(path)
+
+        snapshot = SnapshotSerializer(path)
+        # the journal of a replaced snapshot (and its rotated file)
+        journal_path = snapshot.get_journal_path()
+        for old_path in (journal_path, journal_path + '.old'):
+            if os.path.exists(old_path):
+                os.remove(old_path)
+        snapshot.save_players(players)
+        snapshot.save_tournaments(tournaments)
+        snapshot.flush()
+
+        return snapshot
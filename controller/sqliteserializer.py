@@ -0,0 +1,404 @@
+import sqlite3
+from Model.player import Player
+from Model.tournament import Tournament
+from controller.abstractserializer import AbstractSerializer
+
+
+class SQLiteSerializer(AbstractSerializer):
+    """This class will help controller to save and load objects Tournament
+    and Players in an indexed SQLite database
+
+    Players, tournaments, rounds and matches are stored in normalized
+    tables, clustered by tournament so that loading the header of all
+    tournaments is cheap and a single tournament is hydrated with a few
+    range scans. Save methods only collect the rows of new or modified
+    objects (and of the modified rounds of a tournament), flush writes
+    them in one transaction, so objects are not read during the disk
+    I/O. Queries are parameterized constants, so sqlite3 keeps them
+    prepared in its statement cache.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS players (
+            id INTEGER PRIMARY KEY,
+            family_name TEXT NOT NULL,
+            first_name TEXT NOT NULL,
+            birthdate TEXT NOT NULL,
+            sex INTEGER NOT NULL,
+            elo INTEGER NOT NULL,
+            fide_id INTEGER);
+
+        CREATE TABLE IF NOT EXISTS rating_history (
+            player_id INTEGER NOT NULL REFERENCES players(id),
+            position INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            elo_before INTEGER NOT NULL,
+            elo_after INTEGER NOT NULL,
+            nb_games INTEGER NOT NULL,
+            PRIMARY KEY (player_id, position)) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS tournaments (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            place TEXT NOT NULL,
+            dates TEXT NOT NULL,
+            time_control TEXT NOT NULL,
+            nb_rounds INTEGER NOT NULL,
+            description TEXT NOT NULL,
+            rated INTEGER NOT NULL DEFAULT 0);
+
+        CREATE TABLE IF NOT EXISTS tournament_players (
+            tournament_id INTEGER NOT NULL REFERENCES tournaments(id),
+            position INTEGER NOT NULL,
+            player_id INTEGER NOT NULL REFERENCES players(id),
+            points NUMERIC NOT NULL,
+            elo INTEGER,
+            PRIMARY KEY (tournament_id, position)) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS rounds (
+            tournament_id INTEGER NOT NULL REFERENCES tournaments(id),
+            number INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            start TEXT NOT NULL,
+            end TEXT,
+            PRIMARY KEY (tournament_id, number)) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS matches (
+            tournament_id INTEGER NOT NULL,
+            round_number INTEGER NOT NULL,
+            number INTEGER NOT NULL,
+            player1 INTEGER NOT NULL REFERENCES players(id),
+            player2 INTEGER NOT NULL REFERENCES players(id),
+            score1 INTEGER,
+            score2 INTEGER,
+            version INTEGER,
+            PRIMARY KEY (tournament_id, round_number, number)) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS journal (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            sequence INTEGER NOT NULL);
+
+        CREATE INDEX IF NOT EXISTS idx_tournament_players_player
+            ON tournament_players (player_id);
+        CREATE INDEX IF NOT EXISTS idx_matches_player1
+            ON matches (player1);
+        CREATE INDEX IF NOT EXISTS idx_matches_player2
+            ON matches (player2);
+        """
+
+    # columns missing in databases created before them, as
+    # (table, column, statement adding it)
+    MIGRATIONS = (('players', 'fide_id',
+                   "ALTER TABLE players ADD COLUMN fide_id INTEGER"),
+                  ('tournaments', 'rated',
+                   "ALTER TABLE tournaments "
+                   "ADD COLUMN rated INTEGER NOT NULL DEFAULT 0"),
+                  ('tournament_players', 'elo',
+                   "ALTER TABLE tournament_players ADD COLUMN elo INTEGER"),
+                  ('matches', 'version',
+                   "ALTER TABLE matches ADD COLUMN version INTEGER"))
+
+    UPSERT_PLAYER = "INSERT INTO players " \
+                    "(id, family_name, first_name, birthdate, sex, elo, " \
+                    "fide_id) VALUES (?, ?, ?, ?, ?, ?, ?) " \
+                    "ON CONFLICT (id) DO UPDATE " \
+                    "SET family_name = excluded.family_name, " \
+                    "first_name = excluded.first_name, " \
+                    "birthdate = excluded.birthdate, " \
+                    "sex = excluded.sex, elo = excluded.elo, " \
+                    "fide_id = excluded.fide_id"
+    SELECT_PLAYERS = "SELECT id, family_name, first_name, birthdate, " \
+                     "sex, elo, fide_id FROM players ORDER BY id"
+
+    DELETE_RATING_HISTORY = "DELETE FROM rating_history WHERE player_id = ?"
+    INSERT_RATING_CHANGE = "INSERT INTO rating_history " \
+                           "(player_id, position, date, elo_before, " \
+                           "elo_after, nb_games) VALUES (?, ?, ?, ?, ?, ?)"
+    SELECT_RATING_HISTORY = "SELECT player_id, date, elo_before, " \
+                            "elo_after, nb_games FROM rating_history " \
+                            "ORDER BY player_id, position"
+
+    UPSERT_TOURNAMENT = "INSERT INTO tournaments (id, name, place, " \
+                        "dates, time_control, nb_rounds, description, " \
+                        "rated) VALUES (?, ?, ?, ?, ?, ?, ?, ?) " \
+                        "ON CONFLICT (id) DO UPDATE " \
+                        "SET name = excluded.name, " \
+                        "place = excluded.place, " \
+                        "dates = excluded.dates, " \
+                        "time_control = excluded.time_control, " \
+                        "nb_rounds = excluded.nb_rounds, " \
+                        "description = excluded.description, " \
+                        "rated = excluded.rated"
+    SELECT_LAST_TOURNAMENT_ID = "SELECT COALESCE(MAX(id), 0) " \
+                                "FROM tournaments"
+    SELECT_TOURNAMENT_HEADERS = "SELECT id, name, place, dates, " \
+                                "time_control, nb_rounds, description, " \
+                                "rated, " \
+                                "(SELECT COUNT(*) FROM tournament_players " \
+                                "WHERE tournament_id = tournaments.id) " \
+                                "FROM tournaments ORDER BY id"
+
+    DELETE_TOURNAMENT_PLAYERS = "DELETE FROM tournament_players " \
+                                "WHERE tournament_id = ?"
+    INSERT_TOURNAMENT_PLAYER = "INSERT INTO tournament_players " \
+                               "(tournament_id, position, player_id, " \
+                               "points, elo) VALUES (?, ?, ?, ?, ?)"
+    SELECT_TOURNAMENT_PLAYERS = "SELECT player_id, points, elo " \
+                                "FROM tournament_players " \
+                                "WHERE tournament_id = ? ORDER BY position"
+
+    REPLACE_ROUND = "INSERT OR REPLACE INTO rounds " \
+                    "(tournament_id, number, name, start, end) " \
+                    "VALUES (?, ?, ?, ?, ?)"
+    SELECT_ROUNDS = "SELECT name, start, end FROM rounds " \
+                    "WHERE tournament_id = ? ORDER BY number"
+
+    REPLACE_MATCH = "INSERT OR REPLACE INTO matches " \
+                    "(tournament_id, round_number, number, " \
+                    "player1, player2, score1, score2, version) " \
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    SELECT_MATCHES = "SELECT round_number, player1, player2, " \
+                     "score1, score2, version FROM matches " \
+                     "WHERE tournament_id = ? ORDER BY round_number, number"
+
+    REPLACE_JOURNAL_SEQUENCE = "INSERT OR REPLACE INTO journal " \
+                               "(id, sequence) VALUES (0, ?)"
+    SELECT_JOURNAL_SEQUENCE = "SELECT COALESCE(MAX(sequence), 0) " \
+                              "FROM journal"
+
+    def __init__(self, path='db.sqlite'):
+        self.path = path
+        # may be used by worker threads (see ApiServer), never at once
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(self.SCHEMA)
+
+        for table, column, statement in self.MIGRATIONS:
+            columns = [row[1] for row in self.connection.execute(
+                f"PRAGMA table_info({table})")]
+            if column not in columns:
+                with self.connection:
+                    self.connection.execute(statement)
+
+        # ids are given by save_tournaments, before rows are written
+        self.last_tournament_id = self.connection.execute(
+            self.SELECT_LAST_TOURNAMENT_ID).fetchone()[0]
+
+        # rows collected by save methods, written by flush
+        # player_id: (player row, rating history rows)
+        self.pending_players = dict()
+        # id_in_db: [tournament row, players rows, {number: round rows}]
+        self.pending_tournaments = dict()
+        # sequence of the last journal record of collected objects
+        self.pending_journal_sequence = None
+
+    def save_players(self, players: list):
+        ids = []
+
+        for player in players:
+            if not player.is_dirty():
+                continue
+
+            serialized_player = player.serialize()
+            self.pending_players[player.player_id] = (
+                (player.player_id,
+                 serialized_player['family_name'],
+                 serialized_player['first_name'],
+                 serialized_player['birthdate'],
+                 serialized_player['sex'],
+                 serialized_player['elo'],
+                 serialized_player['fide_id']),
+                [(player.player_id, position, *change)
+                 for position, change
+                 in enumerate(serialized_player['rating_history'])])
+
+            ids.append(player.player_id)
+            player.set_dirty(False)
+
+        return ids
+
+    def save_tournaments(self, tournaments: list):
+        ids = []
+
+        for tournament in tournaments:
+            if tournament.is_dirty():
+                self.collect_tournament(tournament)
+                ids.append(tournament.id_in_db)
+                tournament.set_dirty(False)
+
+        return ids
+
+    def collect_tournament(self, tournament: Tournament):
+        """collect rows of a tournament, its players and its modified
+        rounds (a new tournament gets its id)"""
+        if tournament.id_in_db is None:
+            self.last_tournament_id += 1
+            tournament.id_in_db = self.last_tournament_id
+        tournament_id = tournament.id_in_db
+
+        row = (tournament_id,
+               tournament.name,
+               tournament.place,
+               ",".join(day.strftime('%d/%m/%y') for day in tournament.dates),
+               tournament.time_control,
+               tournament.nb_rounds,
+               tournament.description,
+               tournament.rated)
+        players_rows = [(tournament_id, position, player.player_id,
+                         tournament.points[player], tournament.elos[player])
+                        for position, player in enumerate(tournament.players)]
+
+        # rounds collected by a previous save and not written yet are kept
+        pending = self.pending_tournaments.setdefault(
+            tournament_id, [row, players_rows, dict()])
+        pending[0] = row
+        pending[1] = players_rows
+
+        for number, a_round in enumerate(tournament.rounds):
+            if not a_round.is_dirty():
+                continue
+
+            serialized_round = a_round.serialize()
+            pending[2][number] = (
+                (tournament_id,
+                 number,
+                 serialized_round['name'],
+                 serialized_round['start'],
+                 serialized_round['end']),
+                [(tournament_id, number, match_number,
+                  match['player1'], match['player2'],
+                  match['score1'], match['score2'], match['version'])
+                 for match_number, match
+                 in enumerate(serialized_round['matches'])])
+
+    def save_journal_sequence(self, sequence: int):
+        if sequence != self.load_journal_sequence():
+            self.pending_journal_sequence = sequence
+
+    def load_journal_sequence(self) -> int:
+        if self.pending_journal_sequence is not None:
+            return self.pending_journal_sequence
+
+        return self.connection.execute(
+            self.SELECT_JOURNAL_SEQUENCE).fetchone()[0]
+
+    def flush(self):
+        """write collected rows in one transaction"""
+        if not self.pending_players and not self.pending_tournaments \
+                and self.pending_journal_sequence is None:
+            return
+
+        with self.connection:
+            for player_row, rating_rows in self.pending_players.values():
+                self.connection.execute(self.UPSERT_PLAYER, player_row)
+                self.connection.execute(self.DELETE_RATING_HISTORY,
+                                        (player_row[0],))
+                self.connection.executemany(self.INSERT_RATING_CHANGE,
+                                            rating_rows)
+
+            for tournament_row, players_rows, rounds \
+                    in self.pending_tournaments.values():
+                self.connection.execute(self.UPSERT_TOURNAMENT,
+                                        tournament_row)
+                self.connection.execute(self.DELETE_TOURNAMENT_PLAYERS,
+                                        (tournament_row[0],))
+                self.connection.executemany(self.INSERT_TOURNAMENT_PLAYER,
+                                            players_rows)
+
+                for round_row, matches_rows in rounds.values():
+                    self.connection.execute(self.REPLACE_ROUND, round_row)
+                    self.connection.executemany(self.REPLACE_MATCH,
+                                                matches_rows)
+
+            if self.pending_journal_sequence is not None:
+                self.connection.execute(self.REPLACE_JOURNAL_SEQUENCE,
+                                        (self.pending_journal_sequence,))
+
+        # kept if the transaction failed, to be written by the next flush
+        self.pending_players = dict()
+        self.pending_tournaments = dict()
+        self.pending_journal_sequence = None
+
+    def load_players(self):
+        players = []
+
+        rating_histories = dict()
+        for player_id, *change in self.connection.execute(
+                self.SELECT_RATING_HISTORY):
+            rating_histories.setdefault(player_id, []).append(change)
+
+        for row in self.connection.execute(self.SELECT_PLAYERS):
+            serialized_player = {'family_name': row[1],
+                                 'first_name': row[2],
+                                 'birthdate': row[3],
+                                 'sex': row[4],
+                                 'elo': row[5],
+                                 'fide_id': row[6],
+                                 'rating_history':
+                                     rating_histories.get(row[0])}
+            player = Player.deserialize(serialized_player)
+            player.player_id = row[0]
+            players.append(player)
+
+        return players
+
+    def load_tournaments(self, players_list):
+        tournaments = []
+
+        for row in self.connection.execute(self.SELECT_TOURNAMENT_HEADERS):
+            serialized_header = {'name': row[1],
+                                 'place': row[2],
+                                 'dates': row[3].split(","),
+                                 'time_control': row[4],
+                                 'nb_rounds': row[5],
+                                 'description': row[6],
+                                 'rated': bool(row[7])}
+            tournament = Tournament.deserialize_header(serialized_header,
+                                                       row[8])
+            tournament.id_in_db = row[0]
+            tournaments.append(tournament)
+
+        return tournaments
+
+    def load_tournament_details(self, tournament, players_by_id):
+        """rebuild the serialized tournament with one indexed range query
+        per table, then hydrate the tournament"""
+        parameters = (tournament.id_in_db,)
+        serialized_tournament = {'players': [],
+                                 'rounds': [],
+                                 'points': dict(),
+                                 'elos': dict(),
+                                 'already_played': dict()}
+
+        # elo is NULL for players signed in before elos were stored
+        for player_id, points, elo in self.connection.execute(
+                self.SELECT_TOURNAMENT_PLAYERS, parameters):
+            serialized_tournament['players'].append(player_id)
+            serialized_tournament['points'][player_id] = points
+            serialized_tournament['elos'][player_id] = elo
+            serialized_tournament['already_played'][player_id] = []
+
+        for name, start, end in self.connection.execute(self.SELECT_ROUNDS,
+                                                        parameters):
+            serialized_tournament['rounds'].append(
+                {'name': name, 'matches': [], 'start': start, 'end': end})
+
+        already_played = serialized_tournament['already_played']
+
+        # version is NULL for matches saved before versions were stored
+        for round_number, player1, player2, score1, score2, version \
+                in self.connection.execute(self.SELECT_MATCHES, parameters):
+            serialized_round = serialized_tournament['rounds'][round_number]
+            serialized_round['matches'].append({'player1': player1,
+                                                'player2': player2,
+                                                'score1': score1,
+                                                'score2': score2,
+                                                'version': version})
+
+            # results are recorded when the round is ended
+            if serialized_round['end'] is not None:
+                already_played[player1].append(player2)
+                already_played[player2].append(player1)
+
+        tournament.hydrate(serialized_tournament, players_by_id)
@@ -0,0 +1,183 @@
+import threading
+from Model.player import Player
+from Model.rating import EloRating
+from Model.registry import PlayerRegistry
+from Model.tournament import Tournament
+from controller.abstractserializer import AbstractSerializer
+from controller.journal import Journal
+
+
+class TournamentStore:
+    """Players and tournaments of a storage backend, shared by the
+    console Controller, the ScriptRunner and the ApiServer
+
+    load reads them and applies the modifications recorded in the
+    journal since the last save, update_player(s) keeps indexes and
+    standings up to date after a modification of players, save writes
+    them and empties the journal.
+    The store may be used by several threads: lock is held while players
+    and tournaments are modified or read to be saved, serializer_lock
+    while the serializer is used (always taken before lock), so two
+    tournaments are never loaded at the same time.
+
+    :param serializer: a storage backend (derived from AbstractSerializer)
+    :param journaled: if False, modifications of tournaments are not
+                      recorded in the journal (it is still replayed by
+                      load)
+
+    :attributes :
+        registry : a PlayerRegistry of all players
+        tournaments : a list of Tournaments
+        journal : a Journal recording each tournament modification
+                  between two saves
+        rating : the EloRating rating again all ended tournaments
+        observers : functions added as observers to each tournament
+                    (see Tournament.add_observer)
+    """
+
+    def __init__(self, serializer: AbstractSerializer,
+                 journaled: bool = True):
+        self.serializer = serializer
+        self.journal = Journal(self.serializer.get_journal_path())
+        self.registry = PlayerRegistry()
+        self.tournaments = []
+        self.rating = EloRating()
+        self.lock = threading.RLock()
+        self.serializer_lock = threading.RLock()
+
+        self.observers = []
+        if journaled:
+            self.observers.append(self.journal.record)
+
+    def add_observer(self, observer):
+        """add observer to the tournaments loaded or added from now on"""
+        self.observers.append(observer)
+
+    def observe(self, tournament: Tournament):
+        for observer in self.observers:
+            tournament.add_observer(observer)
+
+    def load(self) -> int:
+        """load all players and tournaments (only their header datas),
+        then apply and save the modifications recorded in the journal
+
+        :return the number of replayed modifications"""
+        with self.serializer_lock, self.lock:
+            self.registry = PlayerRegistry(self.serializer.load_players())
+            self.tournaments = self.serializer.load_tournaments(
+                self.registry.get_players())
+
+            nb_replayed = self.journal.replay(
+                self.tournaments, self.registry.players_by_id,
+                self.load_tournament_details,
+                self.serializer.load_journal_sequence())
+            if nb_replayed:
+                # tournaments ended by replayed scores are rated by replay
+                self.update_players(
+                    [player for tournament in self.tournaments
+                     for player in tournament.rating_changes])
+                self.save()
+
+            for tournament in self.tournaments:
+                self.observe(tournament)
+
+        return nb_replayed
+
+    def load_tournament_details(self, tournament: Tournament):
+        """load rounds, matches, points... of a tournament
+        for which only header datas are loaded"""
+        if not tournament.is_loaded:
+            with self.serializer_lock, self.lock:
+                # another thread may have loaded it meanwhile
+                if not tournament.is_loaded:
+                    self.serializer.load_tournament_details(
+                        tournament, self.registry.players_by_id)
+
+    def add_tournament(self, tournament: Tournament):
+        """add a new tournament, saved at once as it needs an id in DB
+        to be journaled"""
+        with self.serializer_lock, self.lock:
+            self.tournaments.append(tournament)
+            self.serializer.save_tournaments([tournament])
+            self.serializer.flush()
+
+        self.observe(tournament)
+
+    def register_player(self, player: Player) -> Player:
+        """register a new player, saved at once as he needs an id in DB
+        to be journaled
+
+        :return the registered player"""
+        with self.serializer_lock, self.lock:
+            player = self.registry.register(player)
+            self.serializer.save_players([player])
+            self.serializer.flush()
+
+        return player
+
+    def save(self) -> tuple:
+        """save new or modified players and tournaments and empty the
+        journal
+
+        :return the ids of saved players and of saved tournaments"""
+        with self.serializer_lock, self.lock:
+            players_ids = self.serializer.save_players(
+                self.registry.get_players())
+            tournaments_ids = self.serializer.save_tournaments(
+                self.tournaments)
+            self.serializer.save_journal_sequence(self.journal.sequence)
+            self.serializer.flush()
+            self.journal.truncate()
+
+        return players_ids, tournaments_ids
+
+    def save_in_background(self):
+        """save modifications (from another thread): players and
+        tournaments are only locked while they are read, not while they
+        are written to disk"""
+        with self.serializer_lock:
+            with self.lock:
+                # records made from now on are not in this save
+                sequence = self.journal.rotate()
+                self.serializer.save_players(self.registry.get_players())
+                self.serializer.save_tournaments(self.tournaments)
+                self.serializer.save_journal_sequence(sequence)
+
+            self.serializer.flush()
+            self.journal.remove_rotated()
+
+    def update_player(self, player: Player):
+        """update indexes and standings after a modification of player"""
+        with self.lock:
+            self.registry.update(player)
+
+            for tournament in self.tournaments:
+                if tournament.is_loaded:
+                    tournament.update_player(player)
+
+    def update_players(self, players: list):
+        """update indexes and standings after a modification of players
+        (faster than update_player for many players)"""
+        with self.lock:
+            self.registry.update_many(players)
+
+            for tournament in self.tournaments:
+                if tournament.is_loaded:
+                    for player in players:
+                        tournament.update_player(player)
+
+    def recompute_ratings(self) -> int:
+        """rate again all ended tournaments, in chronological order
+
+        :return the number of rated games"""
+        for tournament in self.tournaments:
+            self.load_tournament_details(tournament)
+
+        with self.lock:
+            nb_games = self.rating.recompute(self.tournaments)
+            self.update_players(self.registry.get_players())
+
+        return nb_games
+
+    def close(self):
+        self.journal.close()
@@ -1,6 +1,94 @@
+import argparse
+import asyncio
+import sys
 from controller.controller import Controller
+from controller.script import ScriptError, ScriptRunner
+from controller.serializer import Serializer
+from controller.server import ApiServer
+from controller.snapshotserializer import SnapshotSerializer
+from controller.sqliteserializer import SQLiteSerializer
 from views.consoleview import ConsoleView
 
 
-console = ConsoleView()
-controller = Controller(console)
+parser = argparse.ArgumentParser(description="Manager de Tournoi d'échecs")
+parser.add_argument('--sqlite', metavar='FICHIER',
+                    help="utiliser une base SQLite au lieu de db.json")
+parser.add_argument('--snapshot', metavar='FICHIER',
+                    help="utiliser un snapshot binaire (chargement rapide "
+                         "des grosses archives) au lieu de db.json")
+parser.add_argument('--to-snapshot', metavar='FICHIER',
+                    help="copier toute la base dans un snapshot binaire "
+                         "puis quitter")
+parser.add_argument('--script', metavar='FICHIER',
+                    help="exécuter les commandes d'un script sans console "
+                         "(- pour l'entrée standard)")
+parser.add_argument('--serve', metavar='PORT', type=int,
+                    help="servir les tournois en HTTP/JSON sur ce port "
+                         "au lieu d'ouvrir la console")
+parser.add_argument('--host', default='127.0.0.1',
+                    help="adresse d'écoute du serveur (défaut : 127.0.0.1)")
+parser.add_argument('--autosave', metavar='SECONDES', type=float, default=5,
+                    help="sauvegarder automatiquement les modifications "
+                         "après SECONDES secondes (défaut : 5, "
+                         "0 pour ne sauvegarder qu'à la demande)")
+parser.add_argument('--profile', metavar='FICHIER',
+                    help="mesurer les performances dès le démarrage et "
+                         "enregistrer les mesures dans ce fichier json "
+                         "(/STATS pour les afficher)")
+parser.add_argument('--page-size', metavar='LIGNES', type=int,
+                    help="afficher les rapports par pages de LIGNES lignes")
+
+
+def main():
+    arguments = parser.parse_args()
+
+    serializer = None
+    if arguments.sqlite is not None:
+        serializer = SQLiteSerializer(arguments.sqlite)
+    elif arguments.snapshot is not None:
+        serializer = SnapshotSerializer(arguments.snapshot)
+
+    if arguments.to_snapshot is not None:
+        if serializer is None:
+            serializer = Serializer()
+
+        snapshot = SnapshotSerializer.convert(serializer,
+                                              arguments.to_snapshot)
+        snapshot.close()
+        print(f"Snapshot {arguments.to_snapshot} écrit")
+        return
+
+    if arguments.script is not None:
+        if serializer is None:
+            serializer = Serializer()
+
+        runner = ScriptRunner(serializer)
+        try:
+            if arguments.script == '-':
+                runner.run(sys.stdin)
+            else:
+                with open(arguments.script, encoding='utf-8') as script:
+                    runner.run(script)
+        except ScriptError as error:
+            sys.exit(f"Erreur : {error}")
+        finally:
+            runner.close()
+    elif arguments.serve is not None:
+        if serializer is None:
+            serializer = Serializer()
+
+        server = ApiServer(serializer, arguments.host, arguments.serve)
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+    else:
+        console = ConsoleView(arguments.page_size)
+        controller = Controller(console, serializer, arguments.autosave,
+                                arguments.profile)
+        controller.run()
+
+
+# worker processes (see TournamentSimulator) import this module too
+if __name__ == '__main__':
+    main()
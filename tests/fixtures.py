@@ -0,0 +1,32 @@
+from Model.player import Player
+from Model.registry import PlayerRegistry
+from Model.tournament import Tournament
+from controller.serializer import Serializer
+from controller.snapshotserializer import SnapshotSerializer
+from controller.sqliteserializer import SQLiteSerializer
+
+# storage backends, as (serializer class, name of its file)
+BACKENDS = ((Serializer, 'db.json'),
+            (SQLiteSerializer, 'db.sqlite'),
+            (SnapshotSerializer, 'db.snapshot'))
+
+
+def create_players(registry: PlayerRegistry, nb_players: int,
+                   first_elo: int = 1500, elo_step: int = 10) -> list:
+    """register players Nom0, Nom1... with elos first_elo,
+    first_elo + elo_step...
+
+    :return the list of registered players"""
+    return [registry.register(Player(f"Nom{index}", "Pre", "01/01/90", 0,
+                                     first_elo + elo_step * index))
+            for index in range(nb_players)]
+
+
+def create_tournament(players: list = (), nb_rounds: int = 2) \
+        -> Tournament:
+    """:return a new Tournament with players signed in"""
+    tournament = Tournament("Test", "Paris", ["01/01/22"], 0, nb_rounds)
+    for player in players:
+        tournament.add_player(player)
+
+    return tournament
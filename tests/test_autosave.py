@@ -0,0 +1,85 @@
+import os
+import tempfile
+import threading
+import unittest
+from controller.autosave import AutoSaver
+from controller.serializer import Serializer
+from controller.store import TournamentStore
+from tests.fixtures import create_players, create_tournament
+
+
+class AutoSaverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.saves = []
+        self.saved = threading.Event()
+        self.messages = []
+
+    def save(self):
+        self.saves.append(1)
+        self.saved.set()
+
+    def start(self, save_function) -> AutoSaver:
+        auto_saver = AutoSaver(save_function, 0.05, self.messages.append)
+        auto_saver.start()
+        self.addCleanup(auto_saver.stop)
+
+        return auto_saver
+
+    def test_burst_saved_once(self):
+        auto_saver = self.start(self.save)
+        for _ in range(100):
+            auto_saver.notify(None, 'score', {})
+
+        self.assertTrue(self.saved.wait(5))
+        auto_saver.stop()
+        self.assertEqual(len(self.saves), 1)
+
+    def test_saved_when_stopped(self):
+        auto_saver = AutoSaver(self.save, 60)
+        auto_saver.start()
+        auto_saver.notify()
+        auto_saver.stop()
+
+        self.assertEqual(len(self.saves), 1)
+        self.assertFalse(auto_saver.thread.is_alive())
+
+    def test_failed_save_retried(self):
+        def save():
+            if not self.messages:
+                raise OSError("disque plein")
+            self.save()
+
+        auto_saver = self.start(save)
+        auto_saver.notify()
+
+        self.assertTrue(self.saved.wait(5))
+        self.assertEqual(len(self.messages), 1)
+        self.assertIn("disque plein", self.messages[0])
+
+
+class SaveInBackgroundTest(unittest.TestCase):
+
+    def test_saved_and_journal_emptied(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'db.json')
+
+        store = TournamentStore(Serializer(path))
+        self.addCleanup(store.close)
+        tournament = create_tournament(create_players(store.registry, 4))
+        store.add_tournament(tournament)
+        a_round = tournament.launch_new_round()
+        tournament.set_a_score(a_round.matches[0], 1, 0)
+
+        store.save_in_background()
+        self.assertEqual(os.path.getsize(store.journal.path), 0)
+        self.assertFalse(os.path.exists(store.journal.rotated_path))
+
+        loaded_store = TournamentStore(Serializer(path))
+        self.addCleanup(loaded_store.close)
+        self.assertEqual(loaded_store.load(), 0)
+        loaded = loaded_store.tournaments[0]
+        loaded_store.load_tournament_details(loaded)
+        self.assertEqual(loaded.get_last_round().matches[0].get_score(),
+                         "1 - 0")
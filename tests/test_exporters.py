@@ -0,0 +1,58 @@
+import csv
+import io
+import unittest
+from Model.report import Column, Report
+from views.exporters import CsvExporter, HtmlExporter, ReportExporter
+
+COLUMNS = (Column('N°', int), Column('Nom', str), Column('Points', float))
+
+
+class ReportExporterTest(unittest.TestCase):
+
+    @staticmethod
+    def generate_rows(nb_rows: int):
+        for index in range(1, nb_rows + 1):
+            yield index, f"Joueur <{index}>", index / 2
+
+    def test_csv(self):
+        file = io.StringIO(newline='')
+        nb_rows = CsvExporter().export("Test", Report(
+            COLUMNS, self.generate_rows(3)), file)
+
+        self.assertEqual(nb_rows, 3)
+        file.seek(0)
+        self.assertEqual(list(csv.reader(file, delimiter=';')),
+                         [['N°', 'Nom', 'Points'],
+                          ['1', 'Joueur <1>', '0.5'],
+                          ['2', 'Joueur <2>', '1.0'],
+                          ['3', 'Joueur <3>', '1.5']])
+
+    def test_html(self):
+        file = io.StringIO(newline='')
+        nb_rows = HtmlExporter().export("Tournoi\nClassement", Report(
+            COLUMNS, self.generate_rows(2)), file)
+        page = file.getvalue()
+
+        self.assertEqual(nb_rows, 2)
+        self.assertIn("<title>Classement</title>", page)
+        self.assertIn('<tr><td class="number">1</td><td>Joueur &lt;1&gt;'
+                      '</td><td class="number">0.5</td></tr>', page)
+        self.assertTrue(page.endswith("</html>\n"))
+
+    def test_streamed(self):
+        """rows are written while they are generated"""
+        file = io.StringIO(newline='')
+
+        def generate_rows():
+            for row in self.generate_rows(3):
+                yield row
+                self.assertIn(row[1], file.getvalue())
+
+        CsvExporter().export("Test", Report(COLUMNS, generate_rows()), file)
+
+    def test_get_exporter(self):
+        self.assertIsInstance(ReportExporter.get_exporter("a.CSV"),
+                              CsvExporter)
+        self.assertIsInstance(ReportExporter.get_exporter("b.html"),
+                              HtmlExporter)
+        self.assertIsNone(ReportExporter.get_exporter("c.pdf"))
@@ -0,0 +1,63 @@
+import unittest
+from Model.history import OpponentHistory
+from Model.registry import PlayerRegistry
+from Model.tournament import Tournament
+from tests.fixtures import create_players, create_tournament
+
+
+class OpponentHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.players = create_players(PlayerRegistry(), 5)
+        self.history = OpponentHistory()
+        for player in self.players:
+            self.history.add_player(player)
+
+    def test_matches(self):
+        first, second, third, *_ = self.players
+        self.history.add_match(first, second)
+        self.history.add_match(third, first)
+
+        self.assertTrue(self.history.have_met(second, first))
+        self.assertFalse(self.history.have_met(second, third))
+        self.assertEqual(self.history.get_opponents(first), [second, third])
+        self.assertEqual(self.history.get_opponents(self.players[4]), [])
+
+    def test_eligible_mask(self):
+        first, second, third, fourth, _ = self.players
+        self.history.add_match(first, second)
+        mask = self.history.get_mask([first, second, third, fourth])
+
+        # neither himself nor an opponent already met
+        self.assertEqual(self.history.get_players(
+            self.history.get_eligible_mask(first, mask)), [third, fourth])
+        self.assertEqual(self.history.get_players(
+            self.history.get_eligible_mask(third, mask)),
+            [first, second, fourth])
+
+    def test_copy(self):
+        first, second, third, *_ = self.players
+        history = self.history.copy()
+        history.add_match(first, second)
+
+        self.assertFalse(self.history.have_met(first, second))
+        self.assertTrue(history.have_met(first, second))
+        self.assertEqual(history.add_player(third),
+                         self.history.get_index(third))
+
+    def test_saved_with_tournament(self):
+        tournament = create_tournament(self.players, 3)
+        while tournament.check_new_round() is None:
+            for match in tournament.launch_new_round().get_pending_matches():
+                tournament.set_a_score(match, 1, 0)
+
+        loaded = Tournament.deserialize(
+            tournament.serialize(),
+            {player.player_id: player for player in self.players})
+        for player in self.players:
+            self.assertEqual(loaded.history.get_opponents(player),
+                             tournament.history.get_opponents(player))
+            self.assertEqual(len(tournament.history.get_opponents(player)),
+                             sum(1 for a_round in tournament.rounds
+                                 for match in a_round.matches
+                                 if player in match.get_players()))
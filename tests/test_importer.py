@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from Model.player import Player
+from Model.registry import PlayerRegistry
+from controller.importer import RatingListImporter
+from controller.serializer import Serializer
+
+CSV = """ID Number;Name;Sex;SRtng;B-day
+1001;Dupont, Jean;M;1850;1990
+1002;Martin, Anne;F;2010;0000
+1003;Durand, Paul;M;1720;
+0;Sans, Identifiant;M;1500;1990
+1004;Sans, Elo;M;;1990
+1005;Mauvaise, Date;M;1600;1990-13-01
+"""
+
+XML = """<?xml version="1.0" encoding="utf-8"?>
+<playerslist>
+<player><fideid>1001</fideid><name>Dupont, Jean</name><sex>M</sex>
+<rating>1900</rating><birthday>1990</birthday></player>
+<player><fideid>1006</fideid><name>Lejeune, Éric</name><sex>M</sex>
+<rating>1650</rating><birthday></birthday></player>
+</playerslist>
+"""
+
+
+class RatingListImporterTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.registry = PlayerRegistry()
+        self.serializer = Serializer(os.path.join(self.directory,
+                                                  'db.json'))
+
+    def import_text(self, text: str, extension: str, **options):
+        path = os.path.join(self.directory, 'liste.' + extension)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+
+        return RatingListImporter(self.registry, self.serializer,
+                                  **options).import_file(path)
+
+    def test_csv(self):
+        summary = self.import_text(CSV, 'csv')
+
+        self.assertEqual((summary.created, summary.rejected), (3, 3))
+        self.assertEqual(len(summary.errors), 3)
+        player = self.registry.get_by_fide_id(1001)
+        self.assertEqual((player.family_name, player.first_name,
+                          player.sex, player.elo),
+                         ("Dupont", "Jean", Player.MALE, 1850))
+        self.assertEqual(player.birth_date.year, 1990)
+
+    def test_unknown_birth_date(self):
+        self.import_text(CSV, 'csv')
+
+        for fide_id in (1002, 1003):
+            player = self.registry.get_by_fide_id(fide_id)
+            self.assertIsNone(player.birth_date)
+            self.assertEqual(player.get_birth_date(), "Non-renseignée")
+
+        loaded = {player.fide_id: player
+                  for player in self.serializer.load_players()}
+        self.assertIsNone(loaded[1002].birth_date)
+
+    def test_xml_updates_known_players(self):
+        self.import_text(CSV, 'csv')
+        summary = self.import_text(XML, 'xml', batch_size=1)
+
+        self.assertEqual((summary.created, summary.updated), (1, 1))
+        self.assertEqual(self.registry.get_by_fide_id(1001).elo, 1900)
+        self.assertEqual(self.registry.search("eric")[1], 1)
+        self.assertEqual(len(self.serializer.load_players()), 4)
+
+        summary = self.import_text(XML, 'xml')
+        self.assertEqual(summary.unchanged, 2)
+
+    def test_invalid_file(self):
+        with self.assertRaises(ValueError):
+            self.import_text(XML[:-20], 'xml')
+        with self.assertRaises(ValueError):
+            self.import_text(CSV, 'pdf')
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+from Model.registry import PlayerRegistry
+from controller.journal import Journal
+from controller.serializer import Serializer
+from controller.snapshotserializer import SnapshotSerializer
+from controller.sqliteserializer import SQLiteSerializer
+from tests.fixtures import BACKENDS, create_players, create_tournament
+
+
+class ReplayTest(unittest.TestCase):
+    """records already in the store are not replayed again, when the
+    journal was not truncated after a save (crash)"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def play(self, serializer, journal: Journal):
+        """sign in players and play the 2 rounds of a tournament, save it
+        after the first round and at the end, without truncating the
+        journal"""
+        registry = PlayerRegistry()
+        players = create_players(registry, 4)
+        tournament = create_tournament()
+        serializer.save_players(players)
+        serializer.save_tournaments([tournament])
+        tournament.add_observer(journal.record)
+
+        for player in players:
+            tournament.add_player(player)
+        while tournament.check_new_round() is None:
+            a_round = tournament.launch_new_round()
+            for match in a_round.get_pending_matches():
+                tournament.set_a_score(match, 1, 0)
+
+            serializer.save_players(registry.get_players())
+            serializer.save_tournaments([tournament])
+            serializer.save_journal_sequence(journal.sequence)
+            serializer.flush()
+
+        return tournament.serialize()
+
+    def load(self, serializer, journal: Journal) -> tuple:
+        """:return the serialized tournament loaded and replayed, and the
+        number of replayed records"""
+        registry = PlayerRegistry(serializer.load_players())
+        tournaments = serializer.load_tournaments(registry.get_players())
+
+        def hydrate(tournament):
+            serializer.load_tournament_details(tournament,
+                                               registry.players_by_id)
+
+        nb_replayed = journal.replay(tournaments, registry.players_by_id,
+                                     hydrate,
+                                     serializer.load_journal_sequence())
+        hydrate(tournaments[0])
+
+        return tournaments[0].serialize(), nb_replayed
+
+    def test_saved_records_skipped(self):
+        for backend, name in BACKENDS:
+            with self.subTest(backend=backend.__name__):
+                path = os.path.join(self.directory.name, name)
+                serializer = backend(path)
+
+                journal = Journal(serializer.get_journal_path())
+                serialized_tournament = self.play(serializer, journal)
+                journal.close()
+
+                serializer = backend(path)
+                journal = Journal(serializer.get_journal_path())
+                serialized, nb_replayed = self.load(serializer, journal)
+                journal.close()
+                self.assertEqual(nb_replayed, 0)
+                self.assertEqual(serialized, serialized_tournament)
+                self.assertEqual(journal.sequence, 4 + 2 * (1 + 2))
+
+    def test_numbers_go_on(self):
+        path = os.path.join(self.directory.name, 'db.sqlite')
+        journal_path = SQLiteSerializer(path).get_journal_path()
+
+        journal = Journal(journal_path)
+        self.play(SQLiteSerializer(path), journal)
+        journal.truncate()
+        journal.close()
+
+        # records of the emptied journal are numbered after the saved ones
+        journal = Journal(journal_path)
+        self.load(SQLiteSerializer(path), journal)
+        self.assertEqual(journal.sequence, 10)
+        journal.close()
+
+    def test_journal_of_store(self):
+        path = os.path.join(self.directory.name, 'db.json')
+        source = Serializer(path)
+        journal = Journal(source.get_journal_path())
+        self.play(source, journal)
+        journal.close()
+
+        # each store has its own journal, a converted snapshot has an
+        # empty one (tournaments get new ids)
+        snapshot_path = os.path.join(self.directory.name, 'db.snapshot')
+        with open(snapshot_path + '.log', 'w', encoding='utf-8') as file:
+            file.write('{"sequence": 1, "tournament": 1, '
+                       '"action": "add_player", "datas": {"player": 1}}\n')
+        snapshot = SnapshotSerializer.convert(source, snapshot_path)
+        self.assertNotEqual(snapshot.get_journal_path(),
+                            source.get_journal_path())
+        self.assertFalse(os.path.exists(snapshot.get_journal_path()))
+        snapshot.close()
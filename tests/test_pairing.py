@@ -0,0 +1,73 @@
+import unittest
+from Model.pairing import BlossomPairing
+from Model.registry import PlayerRegistry
+from Model.tournament import Tournament
+from tests.fixtures import create_players, create_tournament
+
+
+class OddFieldTest(unittest.TestCase):
+    """pairings of tournaments with an odd number of players"""
+
+    def create_tournament(self, nb_players: int, nb_rounds: int,
+                          min_block: int = 40) -> Tournament:
+        tournament = create_tournament(
+            create_players(PlayerRegistry(), nb_players), nb_rounds)
+        tournament.pairing_engine = BlossomPairing(min_block)
+
+        return tournament
+
+    def play(self, tournament: Tournament) -> list:
+        """play all rounds (better ranked player wins, or draws every
+        third match)
+
+        :return the list of pairs of each round"""
+        rounds_pairs = []
+        while tournament.check_new_round() is None:
+            a_round = tournament.launch_new_round()
+            rounds_pairs.append([frozenset(match.get_players())
+                                 for match in a_round.matches])
+            for number, match in enumerate(a_round.get_pending_matches()):
+                if number % 3 == 2:
+                    tournament.set_a_score(match, 1, 1)
+                else:
+                    tournament.set_a_score(match, 1, 0)
+
+        return rounds_pairs
+
+    def assert_fair_byes(self, tournament: Tournament):
+        byes = BlossomPairing.count_byes(tournament)
+        if max(byes.values()) > 1:
+            self.assertNotIn(0, byes.values())
+
+    def assert_no_avoidable_rematch(self, rounds_pairs: list):
+        played = set()
+        for pairs in rounds_pairs:
+            self.assertFalse(played.intersection(pairs))
+            played.update(pairs)
+
+    def test_byes_rotate(self):
+        tournament = self.create_tournament(5, 5)
+        rounds_pairs = self.play(tournament)
+
+        self.assertEqual(len(rounds_pairs), 5)
+        self.assertEqual(set(BlossomPairing.count_byes(tournament)
+                             .values()), {1})
+        self.assert_no_avoidable_rematch(rounds_pairs)
+
+    def test_three_players_without_rematch(self):
+        tournament = self.create_tournament(3, 3)
+        rounds_pairs = self.play(tournament)
+
+        self.assert_fair_byes(tournament)
+        self.assert_no_avoidable_rematch(rounds_pairs)
+
+    def test_byes_with_blocks(self):
+        tournament = self.create_tournament(11, 5, min_block=2)
+        rounds_pairs = self.play(tournament)
+
+        self.assert_fair_byes(tournament)
+        self.assert_no_avoidable_rematch(rounds_pairs)
+
+
+if __name__ == '__main__':
+    unittest.main()
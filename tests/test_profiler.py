@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+from Model.registry import PlayerRegistry
+from controller.profiler import Profiler
+from tests.fixtures import create_players, create_tournament
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        players = create_players(PlayerRegistry(), 4)
+        self.measured = create_tournament(players)
+        self.other = create_tournament(players)
+        self.profiler = Profiler([(self.measured,
+                                   Profiler.TOURNAMENT_METHODS)])
+        self.addCleanup(self.profiler.disable)
+
+    def test_only_targets_measured(self):
+        self.profiler.enable()
+        self.measured.launch_new_round()
+        self.other.launch_new_round()
+
+        summary = self.profiler.summarize()
+        self.assertEqual(summary['Tournament.launch_new_round']['count'], 1)
+        self.assertEqual(summary['Tournament.create_matches']['count'], 1)
+        self.assertNotIn('set_a_score', vars(self.other))
+
+    def test_disabled(self):
+        self.profiler.enable()
+        self.profiler.disable()
+        self.measured.launch_new_round()
+
+        self.assertEqual(self.profiler.summarize(), {})
+        self.assertNotIn('launch_new_round', vars(self.measured))
+
+    def test_target_added_once(self):
+        self.profiler.enable()
+        self.profiler.add_target(self.measured, ('launch_new_round',))
+        self.profiler.add_target(self.other, ('launch_new_round',))
+        self.measured.launch_new_round()
+        self.other.launch_new_round()
+
+        summary = self.profiler.summarize()
+        self.assertEqual(summary['Tournament.launch_new_round']['count'], 2)
+
+    def test_report_and_dump(self):
+        self.profiler.enable()
+        a_round = self.measured.launch_new_round()
+        for match in a_round.matches:
+            self.measured.set_a_score(match, 1, 0)
+
+        rows = {row['Opération']: row for row in self.profiler.get_report()}
+        self.assertEqual(rows['Tournament.set_a_score']['Appels'], 2)
+        self.assertEqual(rows['Tournament.record_results']['Appels'], 1)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'profil.json')
+        self.profiler.dump(path)
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual(json.load(file)['Tournament.set_a_score']
+                             ['count'], 2)
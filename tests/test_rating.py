@@ -0,0 +1,136 @@
+import unittest
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from Model.rating import EloRating
+from Model.registry import PlayerRegistry
+from Model.tournament import Tournament
+from tests.fixtures import create_players, create_tournament
+
+
+class TournamentRatingTest(unittest.TestCase):
+    """elos are updated once, by the score ending the tournament"""
+
+    def setUp(self):
+        registry = PlayerRegistry()
+        self.players = create_players(registry, 4)
+        self.players_by_id = registry.players_by_id
+        self.tournament = create_tournament(self.players)
+
+    def play_round(self, tournament: Tournament):
+        a_round = tournament.launch_new_round()
+        for match in a_round.get_pending_matches():
+            tournament.set_a_score(match, 1, 0)
+
+    def test_rated_when_ended(self):
+        self.play_round(self.tournament)
+        self.assertFalse(self.tournament.rated)
+        self.assertTrue(all(not player.rating_history
+                            for player in self.players))
+
+        self.play_round(self.tournament)
+        self.assertTrue(self.tournament.rated)
+        self.assertEqual(set(self.tournament.rating_changes),
+                         set(self.players))
+        for player in self.players:
+            self.assertEqual(len(player.rating_history), 1)
+            self.assertEqual(player.elo, player.rating_history[0].elo_after)
+
+    def test_not_rated_twice(self):
+        self.play_round(self.tournament)
+        self.play_round(self.tournament)
+        elos = [player.elo for player in self.players]
+
+        # a saved tournament is not rated again once loaded
+        tournament = Tournament.deserialize(self.tournament.serialize(),
+                                            self.players_by_id)
+        self.assertTrue(tournament.rated)
+        tournament.record_results()
+        self.assertEqual([player.elo for player in self.players], elos)
+        self.assertTrue(all(len(player.rating_history) == 1
+                            for player in self.players))
+
+    def test_not_rated_without_rating(self):
+        self.tournament.rating = None
+        self.play_round(self.tournament)
+        self.play_round(self.tournament)
+        self.assertFalse(self.tournament.rated)
+        self.assertEqual([player.elo for player in self.players],
+                         [1500, 1510, 1520, 1530])
+
+    def get_changes(self, updated_elo: bool) -> dict:
+        """play a new tournament with the same elos, the elo of a player
+        being updated between the rounds (by a rating list) if
+        updated_elo
+
+        :return a dict as family name: change of elo"""
+        self.setUp()
+        self.play_round(self.tournament)
+        if updated_elo:
+            self.players[0].elo += 100
+        self.play_round(self.tournament)
+
+        return {player.family_name: change.elo_after - change.elo_before
+                for player, change in self.tournament.rating_changes.items()}
+
+    def test_rated_from_start_elos(self):
+        changes = self.get_changes(False)
+        # the elo updated during the tournament does not change the rating,
+        # the change is added to it
+        self.assertEqual(self.get_changes(True), changes)
+        self.assertEqual(self.players[0].elo, 1600 + changes["Nom0"])
+
+    def test_recompute_keeps_later_elo(self):
+        self.play_round(self.tournament)
+        self.play_round(self.tournament)
+        rating = EloRating()
+
+        # recomputing gives the same elos
+        elos = [player.elo for player in self.players]
+        self.assertEqual(rating.recompute([self.tournament]), 4)
+        self.assertEqual([player.elo for player in self.players], elos)
+
+        # an elo given by a rating list after the tournament is kept
+        self.players[0].elo = 1700
+        rating.recompute([self.tournament])
+        self.assertEqual(self.players[0].elo, 1700)
+        self.assertEqual(len(self.players[0].rating_history), 1)
+        self.assertEqual([player.elo for player in self.players[1:]],
+                         elos[1:])
+
+
+class RecomputeTest(unittest.TestCase):
+    """the archive is rated again in chronological order"""
+
+    def setUp(self):
+        self.players = create_players(PlayerRegistry(), 6, 1500, 97)
+        self.tournaments = []
+        for index, date in enumerate(("01/01/22", "01/02/22", "01/03/22")):
+            tournament = Tournament(f"Test{index}", "Paris", [date], 0, 3)
+            for player in self.players:
+                tournament.add_player(player)
+            while tournament.check_new_round() is None:
+                a_round = tournament.launch_new_round()
+                for match in a_round.get_pending_matches():
+                    tournament.set_a_score(match, index % 2, 1)
+            self.tournaments.append(tournament)
+
+    def test_same_elos_in_any_order(self):
+        elos = [player.elo for player in self.players]
+        histories = [list(player.rating_history) for player in self.players]
+
+        self.assertEqual(EloRating().recompute(self.tournaments[::-1]), 27)
+        self.assertEqual([player.elo for player in self.players], elos)
+        self.assertEqual([player.rating_history for player in self.players],
+                         histories)
+
+    @unittest.skipIf(numpy is None, "numpy n'est pas installé")
+    def test_numpy_same_elos(self):
+        games = EloRating.get_games(self.tournaments[0])
+        elos = [1500 + 97 * index for index in range(6)]
+        k_factors = [40, 20, 20, 10, 40, 20]
+
+        self.assertEqual(
+            EloRating(True).compute(elos, k_factors, *games),
+            EloRating(False).compute(elos, k_factors, *games))
@@ -0,0 +1,50 @@
+import unittest
+from Model.player import Player
+from Model.registry import PlayerRegistry
+from tests.fixtures import create_players
+
+
+class PlayerRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = PlayerRegistry()
+        self.players = create_players(self.registry, 3)
+
+    def test_permanent_ids(self):
+        self.assertEqual([player.player_id for player in self.players],
+                         [1, 2, 3])
+        self.assertIs(self.registry.get(2), self.players[1])
+
+        # ids given by the DB are kept, new ids follow them
+        loaded = Player("Loaded", "Pre", "01/01/90", 0, 1500, player_id=10)
+        self.assertIs(self.registry.register(loaded), loaded)
+        self.assertEqual(self.registry.register(
+            Player("New", "Pre", "01/01/90", 0, 1500)).player_id, 11)
+
+    def test_known_player_interned(self):
+        copy = Player("Autre", "Pre", "01/01/90", 0, 1500,
+                      player_id=self.players[0].player_id)
+
+        self.assertIs(self.registry.register(copy), self.players[0])
+        self.assertEqual(self.registry.register_many([copy]),
+                         [self.players[0]])
+        self.assertEqual(len(self.registry), 3)
+
+    def test_identity_kept_when_renamed(self):
+        player = self.players[0]
+        players_set = {player}
+        player.family_name = "Renamed"
+        self.registry.update(player)
+
+        self.assertIn(player, players_set)
+        self.assertEqual(self.registry.find_by_name("Nom0", "Pre"), [])
+        self.assertEqual(self.registry.find_by_name("RENAMED", "pre"),
+                         [player])
+
+    def test_homonyms(self):
+        homonym = self.registry.register(
+            Player("Nom0", "Pre", "02/02/92", 0, 1600))
+
+        self.assertNotEqual(homonym, self.players[0])
+        self.assertEqual(self.registry.find_by_name("Nom0", "Pre"),
+                         [self.players[0], homonym])
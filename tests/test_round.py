@@ -0,0 +1,48 @@
+import unittest
+from Model.match import Match
+from Model.registry import PlayerRegistry
+from Model.round import Round
+from tests.fixtures import create_players
+
+
+class RoundTest(unittest.TestCase):
+    """scores are recorded and the end of the round is detected without
+    scanning the matches"""
+
+    def setUp(self):
+        players = create_players(PlayerRegistry(), 6)
+        self.matches = [Match(players[index], players[index + 3])
+                        for index in range(3)]
+        self.round = Round("Round n°1", self.matches)
+
+    def test_end_detected_by_last_score(self):
+        self.assertEqual(self.round.set_score(self.matches[1], 1, 0), False)
+        self.assertEqual(self.round.get_pending_matches(),
+                         [self.matches[0], self.matches[2]])
+        self.assertFalse(self.round.is_ended())
+
+        # a corrected score does not end the round
+        self.assertEqual(self.round.set_score(self.matches[1], 0, 1), False)
+        self.round.set_score(self.matches[2], 1, 1)
+        self.assertEqual(self.round.set_score(self.matches[0], 0, 0), True)
+        self.assertTrue(self.round.is_ended())
+        self.assertEqual(self.round.get_pending_matches(), [])
+
+    def test_positions(self):
+        for position, match in enumerate(self.matches):
+            self.assertEqual(self.round.get_match_position(match), position)
+
+        players = create_players(PlayerRegistry(), 2)
+        with self.assertRaises(Exception):
+            self.round.set_score(Match(*players), 1, 0)
+
+    def test_loaded_round(self):
+        self.round.set_score(self.matches[0], 1, 0)
+        players_by_id = {player.player_id: player
+                         for match in self.matches
+                         for player in match.get_players()}
+        loaded = Round.deserialize(self.round.serialize(), players_by_id)
+
+        self.assertEqual(len(loaded.get_pending_matches()), 2)
+        self.assertEqual(loaded.set_score(loaded.matches[1], 1, 0), False)
+        self.assertEqual(loaded.set_score(loaded.matches[2], 1, 0), True)
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from controller.script import ScriptError, ScriptRunner
+from tests.fixtures import BACKENDS
+
+SCRIPT = """# tournoi de test
+tournoi Test Paris 01/01/22 blitz 2 "tournoi de test"
+joueur Nom0 Pre 01/01/90 Homme 1500
+joueur Nom1 Pre 01/01/90 Femme 1510
+joueur Nom2 Pre 01/01/90 0 1520
+joueur Nom3 Pre 01/01/90 1 1530
+
+round
+scores 1-0 0-1
+round
+score 1 1 0
+score 2 1 1
+sauvegarder
+"""
+
+
+class ScriptRunnerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.messages = []
+
+    def create_runner(self, backend, name) -> ScriptRunner:
+        runner = ScriptRunner(
+            backend(os.path.join(self.directory.name, name)),
+            self.messages.append)
+        self.addCleanup(runner.close)
+
+        return runner
+
+    def test_tournament_played_and_saved(self):
+        for backend, name in BACKENDS:
+            with self.subTest(backend=backend.__name__):
+                runner = self.create_runner(backend, name)
+                self.assertEqual(runner.run(SCRIPT.splitlines()), 11)
+
+                runner = self.create_runner(backend, name)
+                runner.run(["ouvrir Test"])
+                tournament = runner.active_tournament
+                self.assertEqual(len(tournament.rounds), 2)
+                self.assertTrue(tournament.rated)
+                self.assertEqual(sum(tournament.points.values()), 4)
+                self.assertEqual(
+                    len(runner.store.registry.find_by_name("Nom3", "Pre")),
+                    1)
+
+    def test_errors_with_line_number(self):
+        backend, name = BACKENDS[0]
+        runner = self.create_runner(backend, name)
+
+        for lines, message in (
+                (["", "inconnue"], "Ligne 2 : commande inconnue"),
+                (["round"], "Ligne 1 : aucun tournoi"),
+                (["tournoi Test Paris 01/01/22 blitz deux"],
+                 "Ligne 1 : arguments invalides pour tournoi"),
+                (['joueur "Nom Pre'], "Ligne 1 : No closing quotation")):
+            with self.subTest(lines=lines):
+                with self.assertRaises(ScriptError) as context:
+                    runner.run(lines)
+                self.assertTrue(str(context.exception).startswith(message),
+                                str(context.exception))
+
+    def test_export(self):
+        backend, name = BACKENDS[0]
+        runner = self.create_runner(backend, name)
+        runner.run(SCRIPT.splitlines())
+        path = os.path.join(self.directory.name, 'classement.csv')
+
+        runner.run([f"exporter classement {path}"])
+        with open(path, encoding='utf-8') as file:
+            lines = file.read().splitlines()
+        self.assertEqual(len(lines), 5)
+
+        with self.assertRaises(ScriptError):
+            runner.run([f"exporter classement {path}.pdf"])
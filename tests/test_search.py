@@ -0,0 +1,67 @@
+import unittest
+from Model.player import Player
+from Model.registry import PlayerRegistry
+
+
+class PlayerSearchTest(unittest.TestCase):
+
+    NAMES = (("Dupont", "Jean", 1500), ("Dupré", "Jérôme", 1720),
+             ("Martin", "Éric", 1850), ("Lejeune", "Anne", 1610),
+             ("Durand", "Jeanne", 2010))
+
+    def setUp(self):
+        self.registry = PlayerRegistry()
+        self.players = self.registry.register_many(
+            [Player(family_name, first_name, "01/01/90", 0, elo)
+             for family_name, first_name, elo in self.NAMES])
+
+    def search(self, query: str, **options) -> list:
+        """:return family names of the found players"""
+        players, nb_results = self.registry.search(query, **options)
+        self.assertEqual(len(players), nb_results)
+
+        return [player.family_name for player in players]
+
+    def test_words(self):
+        # anywhere in names, case and accents ignored
+        self.assertEqual(self.search("JEAN"), ["Dupont", "Durand"])
+        self.assertEqual(self.search("dupre"), ["Dupré"])
+        self.assertEqual(self.search("eric"), ["Martin"])
+        # short words are the beginning of a word
+        self.assertEqual(self.search("du j"), ["Dupont", "Dupré", "Durand"])
+        self.assertEqual(self.search("ne"), [])
+
+    def test_elo_range(self):
+        self.assertEqual(self.search("1600-1900"),
+                         ["Dupré", "Lejeune", "Martin"])
+        self.assertEqual(self.search("du 1700-"), ["Dupré", "Durand"])
+        self.assertEqual(self.search("-1500"), ["Dupont"])
+
+    def test_include_exclude_and_pages(self):
+        self.assertEqual(self.search("jean", include=self.players[:2]),
+                         ["Dupont"])
+        self.assertEqual(self.search("", exclude=self.players[:2]),
+                         ["Durand", "Lejeune", "Martin"])
+
+        players, nb_results = self.registry.search("", offset=1, limit=2)
+        self.assertEqual(nb_results, 5)
+        self.assertEqual([player.family_name for player in players],
+                         ["Dupré", "Durand"])
+
+    def test_updated_player(self):
+        player = self.players[0]
+        player.family_name = "Bernard"
+        player.elo = 2200
+        self.registry.update(player)
+
+        self.assertEqual(self.search("dupont"), [])
+        self.assertEqual(self.search("bern 2100-"), ["Bernard"])
+
+        new_players = [self.registry.register(
+            Player(f"Nom{index}", "Pre", "01/01/90", 0, 1000))
+            for index in range(200)]
+        for new_player in new_players:
+            new_player.elo = 3000
+        self.registry.update_many(new_players)
+        players, nb_results = self.registry.search("nom 3000-")
+        self.assertEqual((len(players), nb_results), (20, 200))
@@ -0,0 +1,149 @@
+import os
+import tempfile
+import unittest
+from Model.registry import PlayerRegistry
+from controller.serializer import Serializer
+from tests.fixtures import BACKENDS, create_players, create_tournament
+
+
+class MatchVersionTest(unittest.TestCase):
+    """versions of matches are saved, so a score displayed before a
+    restart can't overwrite the ones given since"""
+
+    def test_versions_saved(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        for backend, name in BACKENDS:
+            with self.subTest(backend=backend.__name__):
+                path = os.path.join(directory.name, name)
+                registry = PlayerRegistry()
+                tournament = create_tournament(
+                    create_players(registry, 4, elo_step=0))
+                match = tournament.launch_new_round().matches[0]
+                # a corrected score
+                tournament.set_a_score(match, 1, 0)
+                tournament.set_a_score(match, 0, 1)
+
+                serializer = backend(path)
+                serializer.save_players(registry.get_players())
+                serializer.save_tournaments([tournament])
+                serializer.flush()
+
+                serializer = backend(path)
+                registry = PlayerRegistry(serializer.load_players())
+                loaded = serializer.load_tournaments(registry.get_players())
+                serializer.load_tournament_details(loaded[0],
+                                                   registry.players_by_id)
+                matches = loaded[0].get_last_round().matches
+                self.assertEqual([match.version for match in matches],
+                                 [2, 0])
+
+
+class RoundTripTest(unittest.TestCase):
+    """every backend gives back what was saved, tournaments being loaded
+    without their details until load_tournament_details"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def create_store(self, backend, name: str):
+        """save new players, an ended tournament and a not started one
+        in a new store
+
+        :return the path of the store"""
+        self.registry = PlayerRegistry()
+        self.tournament = create_tournament(
+            create_players(self.registry, 5), 3)
+        while self.tournament.check_new_round() is None:
+            a_round = self.tournament.launch_new_round()
+            for number, match in enumerate(a_round.get_pending_matches()):
+                self.tournament.set_a_score(match, number % 2, 1)
+        self.empty_tournament = create_tournament(nb_rounds=4)
+
+        path = os.path.join(self.directory.name, name)
+        self.serializer = backend(path)
+        self.serializer.save_players(self.registry.get_players())
+        self.serializer.save_tournaments([self.tournament,
+                                          self.empty_tournament])
+        self.serializer.flush()
+
+        return path
+
+    def test_round_trip(self):
+        for backend, name in BACKENDS:
+            with self.subTest(backend=backend.__name__):
+                serializer = backend(self.create_store(backend, name))
+                registry = PlayerRegistry(serializer.load_players())
+                self.assertEqual(
+                    [player.serialize() for player in registry.get_players()],
+                    [player.serialize()
+                     for player in self.registry.get_players()])
+
+                loaded = serializer.load_tournaments(registry.get_players())
+                self.assertEqual(len(loaded), 2)
+                self.assertFalse(loaded[0].is_loaded)
+                self.assertEqual(loaded[0].get_nb_players(), 5)
+
+                for tournament, saved in zip(loaded, (self.tournament,
+                                                      self.empty_tournament)):
+                    serializer.load_tournament_details(
+                        tournament, registry.players_by_id)
+                    self.assertTrue(tournament.is_loaded)
+                    self.assertEqual(tournament.serialize(),
+                                     saved.serialize())
+
+    def test_only_modified_saved(self):
+        for backend, name in BACKENDS:
+            with self.subTest(backend=backend.__name__):
+                self.create_store(backend, name)
+
+                # nothing modified, nothing saved
+                self.assertEqual(self.serializer.save_players(
+                    self.registry.get_players()), [])
+                self.assertEqual(self.serializer.save_tournaments(
+                    [self.tournament, self.empty_tournament]), [])
+
+                player = self.registry.get_players()[0]
+                player.elo += 1
+                player.set_dirty()
+                self.assertEqual(self.serializer.save_players(
+                    self.registry.get_players()), [player.player_id])
+
+
+class TinyDBSaveTest(unittest.TestCase):
+    """the json file is replaced at once, documents are updated in place
+    and keep their doc_id"""
+
+    def test_updated_in_place(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'db.json')
+
+        registry = PlayerRegistry()
+        players = create_players(registry, 3)
+        tournament = create_tournament(players)
+        serializer = Serializer(path)
+        serializer.save_players(players)
+        serializer.save_tournaments([tournament])
+        serializer.flush()
+        tournament_id = tournament.id_in_db
+
+        players[1].elo = 1600
+        players[1].set_dirty()
+        tournament.launch_new_round()
+        self.assertEqual(serializer.save_players(players),
+                         [players[1].player_id])
+        self.assertEqual(serializer.save_tournaments([tournament]),
+                         [tournament_id])
+        serializer.flush()
+        self.assertFalse(os.path.exists(path + '.tmp'))
+
+        serializer = Serializer(path)
+        loaded = PlayerRegistry(serializer.load_players())
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(loaded.get(players[1].player_id).elo, 1600)
+        tournaments = serializer.load_tournaments(loaded.get_players())
+        self.assertEqual([tournament.id_in_db for tournament in tournaments],
+                         [tournament_id])
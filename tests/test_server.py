@@ -0,0 +1,134 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from controller.server import ApiServer
+from controller.serializer import Serializer
+from controller.store import TournamentStore
+from tests.fixtures import create_players, create_tournament
+
+
+class ApiServerTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'db.json')
+
+        store = TournamentStore(Serializer(self.path))
+        tournament = create_tournament(create_players(store.registry, 4))
+        store.tournaments.append(tournament)
+        store.save()
+        store.close()
+
+        self.server = self.create_server()
+
+    def create_server(self) -> ApiServer:
+        server = ApiServer(Serializer(self.path), log=lambda message: None)
+        self.addCleanup(server.store.close)
+
+        return server
+
+    def request(self, method: str, target: str, datas=None) -> tuple:
+        """:return (status, decoded body) of the response"""
+        body = b'' if datas is None else json.dumps(datas).encode()
+        status, body = asyncio.run(self.server.dispatch(method, target,
+                                                        body))
+
+        return status, json.loads(body)
+
+    def test_tournament_played(self):
+        status, tournaments = self.request('GET', '/tournaments')
+        self.assertEqual(status, 200)
+        self.assertEqual(tournaments[0]['nb_players'], 4)
+
+        while True:
+            status, datas = self.request('POST', '/tournaments/1/rounds')
+            if status != 201:
+                break
+            status, pairings = self.request('GET',
+                                            '/tournaments/1/pairings')
+            for match in pairings['matches']:
+                status, datas = self.request(
+                    'POST', '/tournaments/1/results',
+                    {'match': match['number'], 'score1': 1, 'score2': 0})
+                self.assertEqual(status, 200)
+
+        # the last round ended the tournament
+        self.assertEqual(status, 409)
+        status, standings = self.request('GET', '/tournaments/1/standings')
+        self.assertEqual(sum(row['points'] for row in standings), 4)
+
+        # scores were journaled, then saved
+        self.request('POST', '/save')
+        self.server = self.create_server()
+        status, standings = self.request('GET', '/tournaments/1/standings')
+        self.assertEqual(sum(row['points'] for row in standings), 4)
+
+    def test_cache_cleared(self):
+        status, pairings = self.request('GET', '/tournaments/1/pairings')
+        self.assertIsNone(pairings['round'])
+
+        self.request('POST', '/tournaments/1/rounds')
+        status, pairings = self.request('GET', '/tournaments/1/pairings')
+        self.assertEqual(len(pairings['matches']), 2)
+
+    def test_version_conflict(self):
+        self.request('POST', '/tournaments/1/rounds')
+        status, pairings = self.request('GET', '/tournaments/1/pairings')
+        version = pairings['matches'][0]['version']
+        score = {'match': 1, 'score1': 1, 'score2': 0, 'version': version}
+
+        status, datas = self.request('POST', '/tournaments/1/results', score)
+        self.assertEqual(status, 200)
+
+        # another arbiter saw the same version
+        status, datas = self.request('POST', '/tournaments/1/results',
+                                     dict(score, score1=0, score2=1))
+        self.assertEqual(status, 409)
+        self.assertEqual((datas['score1'], datas['score2']), (1, 0))
+
+        status, datas = self.request('POST', '/tournaments/1/results',
+                                     dict(score, score1=0, score2=1,
+                                          version=datas['version']))
+        self.assertEqual(status, 200)
+        self.assertEqual(datas['score'], "0 - 1")
+
+    def test_errors(self):
+        for method, target, datas, expected_status in (
+                ('GET', '/inconnue', None, 404),
+                ('GET', '/tournaments/2/pairings', None, 404),
+                ('POST', '/tournaments/1/pairings', None, 405),
+                ('POST', '/tournaments/1/results', [1], 400),
+                ('POST', '/tournaments/1/results', {'match': 1}, 400),
+                ('POST', '/tournaments/1/results',
+                 {'match': 1, 'score1': 1, 'score2': 0}, 409)):
+            with self.subTest(target=target, datas=datas):
+                status, body = self.request(method, target, datas)
+                self.assertEqual(status, expected_status)
+                self.assertIn('error', body)
+
+    def test_tournament_loaded_once(self):
+        """threads of several sessions load a tournament only once"""
+        store = self.server.store
+        tournament = store.tournaments[0]
+        serializer_load = store.serializer.load_tournament_details
+        nb_loads = []
+
+        def load(*args):
+            nb_loads.append(1)
+            serializer_load(*args)
+
+        store.serializer.load_tournament_details = load
+        threads = [threading.Thread(target=store.load_tournament_details,
+                                    args=(tournament,))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(tournament.is_loaded)
+        self.assertEqual(len(nb_loads), 1)
@@ -0,0 +1,66 @@
+import threading
+import unittest
+from Model.registry import PlayerRegistry
+from controller.session import ConflictError, MatchNotFoundError, \
+    SessionError, TournamentSession
+from tests.fixtures import create_players, create_tournament
+
+
+class TournamentSessionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.players = create_players(PlayerRegistry(), 8)
+        self.tournament = create_tournament(self.players)
+        self.session = TournamentSession(self.tournament)
+
+    def test_concurrent_scores(self):
+        """arbiters seeing the same version of a match: only the first
+        score is recorded, the round results only once"""
+        a_round = self.session.launch_new_round()
+        versions = [match.version for match in a_round.matches]
+        results = []
+
+        def set_scores(score1, score2):
+            for number, version in enumerate(versions, start=1):
+                try:
+                    self.session.set_a_score(number, score1, score2,
+                                             version)
+                    results.append(number)
+                except SessionError:
+                    # modified meanwhile or round already ended
+                    pass
+
+        threads = [threading.Thread(target=set_scores, args=scores)
+                   for scores in ((1, 0), (0, 1), (1, 1)) * 3]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(results), [1, 2, 3, 4])
+        self.assertTrue(a_round.is_ended())
+        self.assertEqual(sum(self.tournament.points.values()), 4)
+
+    def test_corrected_score(self):
+        self.session.launch_new_round()
+        match, round_ended = self.session.set_a_score(1, 1, 0)
+        self.assertFalse(round_ended)
+
+        with self.assertRaises(ConflictError) as context:
+            self.session.set_a_score(1, 0, 1, match.version - 1)
+        self.assertIs(context.exception.match, match)
+
+        self.session.set_a_score(1, 0, 1, match.version)
+        self.assertEqual(match.get_score(), "0 - 1")
+
+    def test_errors(self):
+        with self.assertRaises(SessionError):
+            self.session.set_a_score(1, 1, 0)
+
+        self.session.launch_new_round()
+        with self.assertRaises(MatchNotFoundError):
+            self.session.set_a_score(5, 1, 0)
+        with self.assertRaises(SessionError):
+            self.session.add_player(self.players[0])
+        with self.assertRaises(SessionError):
+            self.session.launch_new_round()
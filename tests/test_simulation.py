@@ -0,0 +1,93 @@
+import random
+import unittest
+from Model.pairing import BlossomPairing, GreedyPairing
+from Model.registry import PlayerRegistry
+from Model.simulation import SimulatedTournament, TournamentSimulator
+from benchmark.generator import TournamentGenerator
+
+
+class SimulatedTournamentTest(unittest.TestCase):
+    """simulated runs play as the Tournament would"""
+
+    def setUp(self):
+        generator = TournamentGenerator(5)
+        self.tournament = generator.create_tournament(
+            generator.create_players(PlayerRegistry(), 21), 6)
+        for _ in range(2):
+            a_round = self.tournament.launch_new_round()
+            for match in a_round.get_pending_matches():
+                self.tournament.set_a_score(
+                    match, *TournamentSimulator.get_scores(
+                        match, generator.random))
+        # a pending round with one score given
+        a_round = self.tournament.launch_new_round()
+        self.tournament.set_a_score(a_round.get_pending_matches()[0], 1, 0)
+
+    def test_same_as_tournament(self):
+        state = SimulatedTournament(self.tournament).copy()
+        state.play(self.tournament.pairing_engine, random.Random(1))
+
+        # same draws on the Tournament itself
+        random_generator = random.Random(1)
+        while True:
+            for match in self.tournament.get_last_round() \
+                    .get_pending_matches():
+                self.tournament.set_a_score(
+                    match, *TournamentSimulator.get_scores(
+                        match, random_generator))
+            if self.tournament.check_new_round() is not None:
+                break
+            self.tournament.launch_new_round()
+
+        self.assertEqual(state.get_players_ranked(),
+                         self.tournament.get_players_ranked())
+        self.assertEqual(state.points, self.tournament.points)
+
+    def test_runs_independent(self):
+        serialized = self.tournament.serialize()
+        simulator = TournamentSimulator(1)
+        prediction = simulator.simulate(self.tournament, 20, 3)
+        self.assertEqual(self.tournament.serialize(), serialized)
+        # runs don't share their state, a seed gives the same prediction
+        self.assertEqual(simulator.simulate(self.tournament, 20, 3).places,
+                         prediction.places)
+
+    def test_pairing_sensitivity(self):
+        simulator = TournamentSimulator(1)
+        simulator.pairing_engine = BlossomPairing()
+        self.assertEqual(simulator.get_pairing_sensitivity(
+            self.tournament, 20, 3, BlossomPairing()), 0)
+
+
+class GreedyPairingTest(unittest.TestCase):
+
+    def play(self, nb_players: int, nb_rounds: int, check_round):
+        """play a tournament paired by GreedyPairing, calling
+        check_round(tournament, ranked_players, a_round) once each round
+        is paired (ranked_players as given to the pairing engine)"""
+        generator = TournamentGenerator(2)
+        tournament = generator.create_tournament(
+            generator.create_players(PlayerRegistry(), nb_players),
+            nb_rounds)
+        tournament.pairing_engine = GreedyPairing()
+        while tournament.check_new_round() is None:
+            ranked_players = tournament.get_players_ranked()
+            a_round = tournament.launch_new_round()
+            check_round(tournament, ranked_players, a_round)
+            for match in a_round.get_pending_matches():
+                tournament.set_a_score(match, 1, 0)
+
+        return tournament
+
+    def test_same_pairs_without_rematch(self):
+        def check_round(tournament, ranked_players, a_round):
+            self.assertEqual(
+                [match.get_players() for match in a_round.matches],
+                BlossomPairing().create_pairs(tournament, ranked_players))
+
+        self.play(20, 3, check_round)
+
+    def test_fair_byes(self):
+        tournament = self.play(9, 5, lambda *_: None)
+        self.assertEqual(
+            max(GreedyPairing.count_byes(tournament).values()), 1)
@@ -0,0 +1,36 @@
+import random
+import unittest
+from Model.standings import Standings
+
+
+class UpdateManyTest(unittest.TestCase):
+    """update_many gives the ranking of a full sort, whether few or most
+    keys changed"""
+
+    def setUp(self):
+        self.random = random.Random(7)
+        self.points = {player: 0 for player in range(200)}
+        self.standings = Standings(self.get_key)
+        for player in self.points:
+            self.standings.add(player)
+
+    def get_key(self, player) -> tuple:
+        return -self.points[player], player
+
+    def check(self, nb_changed: int):
+        for player in self.random.sample(list(self.points), nb_changed):
+            self.points[player] += self.random.choice((0.5, 1))
+        self.standings.update_many(self.points)
+
+        expected = sorted(self.points, key=self.get_key)
+        self.assertEqual(self.standings.get_ranked(), expected)
+        for rank, player in enumerate(expected, start=1):
+            self.assertEqual(self.standings.get_rank(player), rank)
+
+    def test_few_changed(self):
+        for _ in range(5):
+            self.check(10)
+
+    def test_most_changed(self):
+        for _ in range(5):
+            self.check(150)
@@ -0,0 +1,50 @@
+import io
+import unittest
+from Model.report import Column, Report
+from views.tablerenderer import TableRenderer
+
+
+class TableRendererTest(unittest.TestCase):
+
+    @staticmethod
+    def create_report(names: list) -> Report:
+        return Report((Column('N°', int), Column('Nom', str, 10)),
+                      enumerate(names, start=1))
+
+    def render(self, rows, chunk_size: int = 2, **options) -> list:
+        """:return the written lines"""
+        output = io.StringIO()
+        TableRenderer(output, 0, chunk_size).render(rows, **options)
+
+        return output.getvalue().splitlines()
+
+    def test_widths_fixed_by_first_chunk(self):
+        lines = self.render([{'Nom': "Court"}, {'Nom': "Moyen"},
+                             {'Nom': "Beaucoup plus long"}])
+
+        self.assertEqual(lines[1:4], ["|  Court |", "|  Moyen |",
+                                      "|  Beau… |"])
+
+    def test_max_widths(self):
+        lines = self.render(self.create_report(
+            ["Court", "Assez long pour être coupé", "Un autre nom long"]))
+
+        self.assertEqual(lines[2], "|  2  |  Assez lon… |")
+        self.assertEqual(lines[3], "|  3  |  Un autre … |")
+
+    def test_pages(self):
+        pages = []
+        lines = self.render(self.create_report(["A", "B", "C", "D", "E"]),
+                            page_size=2,
+                            next_page=lambda: pages.append(1) or True)
+
+        self.assertEqual(len(pages), 2)
+        # a header and a bottom line by page
+        self.assertEqual(len(lines), 5 + 3 * 2 + 1)
+
+        lines = self.render(self.create_report(["A", "B", "C"]),
+                            page_size=2, next_page=lambda: False)
+        self.assertEqual(len(lines), 2 + 2 + 1)
+
+    def test_empty(self):
+        self.assertEqual(self.render([]), ["Rien à Afficher", ""])
@@ -0,0 +1,55 @@
+import unittest
+from Model.registry import PlayerRegistry
+from Model.tournament import Tournament
+from tests.fixtures import create_players, create_tournament
+
+
+class StartEloTest(unittest.TestCase):
+    """tie-breaks use the elos of players at the start of the
+    tournament, not the ones updated since"""
+
+    def setUp(self):
+        registry = PlayerRegistry()
+        self.players = create_players(registry, 6, 1400, 97)
+        self.players_by_id = registry.players_by_id
+        self.tournament = create_tournament(self.players, 3)
+
+        while self.tournament.check_new_round() is None:
+            a_round = self.tournament.launch_new_round()
+            for number, match in enumerate(a_round.get_pending_matches()):
+                if number == 1:
+                    self.tournament.set_a_score(match, 1, 1)
+                else:
+                    self.tournament.set_a_score(match, 0, 1)
+
+    def get_ranking(self, tournament: Tournament) -> list:
+        return list(tournament.generate_ranking(
+            tournament.get_players_ranked()))
+
+    def test_rated_tournament(self):
+        # the tournament is rated by its last score
+        self.assertTrue(self.tournament.rated)
+        self.assertNotEqual([player.elo for player in self.players],
+                            [1400 + 97 * index for index in range(6)])
+
+        ranking = self.get_ranking(self.tournament)
+        self.assertEqual(sorted(row[2] for row in ranking),
+                         [1400 + 97 * index for index in range(6)])
+
+        tournament = Tournament.deserialize(self.tournament.serialize(),
+                                            self.players_by_id)
+        self.assertEqual(self.get_ranking(tournament), ranking)
+
+    def test_elo_at_sign_in(self):
+        player = self.players[0]
+        tournament = create_tournament([player], 3)
+        player.elo = 1500
+        tournament.update_player(player)
+        # elo is updated until the first round
+        self.assertEqual(tournament.elos[player], 1500)
+
+        tournament.add_player(self.players[1])
+        tournament.launch_new_round()
+        player.elo = 1600
+        tournament.update_player(player)
+        self.assertEqual(tournament.elos[player], 1500)
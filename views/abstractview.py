@@ -1,11 +1,22 @@
 from abc import ABC, abstractmethod
 
 
+class AbortPrompt(Exception):
+    """Raised by a view when a highest level command asks to abandon
+    the current prompt (like exit), the controller loop catches it
+    and displays the current menu again"""
+    pass
+
+
 class AbstractView(ABC):
     """
     This abstract class define all mandatory methods to display listing
     and menu needed by the tournament manager controller
 
+    The controller calls display methods from its loop (Controller.run),
+    each of them returns once the user has answered and the callback has
+    been called, a view must never call back a menu itself.
+
     :parameter
         controller : the tournament manager Controller
     """
@@ -20,6 +31,8 @@ class AbstractView(ABC):
              'label': "pour sauvegarder les données en cours d'utilisation",
              ->a full sentence (for a tooltip for instance)
              'function': self.save -> a callback function
+             'abort': True -> (optional) the current prompt is abandoned
+                              after the callback (see AbortPrompt)
              },
         """
         pass
@@ -55,7 +68,8 @@ class AbstractView(ABC):
         """display a table, with description and headers
 
         :param description: a string to display to introduce table
-        :param dict_list: a list of dict, keys will be used as headers of table
+        :param dict_list: a list (or any iterable, like a generator) of dict,
+                          keys will be used as headers of table
         """
         pass
 
@@ -1,30 +1,41 @@
-from views.abstractview import AbstractView
+from views.abstractview import AbortPrompt, AbstractView
+from views.tablerenderer import TableRenderer
 from datetime import date, datetime
 
 
 class ConsoleView(AbstractView):
     """A view class to display the Tournament Manager in a console
     It creates meta-commands available on each input to quit/save/load
+
+    Prompts are loops (an invalid answer or a meta-command asks again),
+    a meta-command with 'abort' abandons the prompt by raising AbortPrompt
+
+    :param page_size: number of rows of a table displayed before asking
+                      to continue (None to display whole tables)
     """
 
-    def __init__(self):
+    def __init__(self, page_size: int = None):
         for i in range(5):
             print()
 
         print("Manager de Tournoi d'échecs")
 
         self.meta_commands = dict()
+        self.page_size = page_size
+        self.table_renderer = TableRenderer()
 
     def display_highest_level_menu(self, list_commands):
         for command in list_commands:
             shortcut = command['short'].upper()
             self.meta_commands["/" + str(shortcut)] = \
                 {'label': command['label'],
-                 'function': command['function']}
+                 'function': command['function'],
+                 'abort': command.get('abort', False)}
 
         self.meta_commands["/HELP"] = \
             {'label': "pour revoir les commandes magiques",
-             'function': self.prompt_help}
+             'function': self.prompt_help,
+             'abort': False}
 
         self.prompt_help()
 
@@ -62,60 +73,19 @@ class ConsoleView(AbstractView):
                 print(str(index) + ": " + str(item))
 
     def display_table(self, description, dict_list):
-        """method to display as a table a list of dict given in parameter"""
+        """method to display as a table a list (or any iterable) of dict
+        given in parameter, page by page if page_size is set"""
         print(description)
 
-        if not dict_list:
-            print("Rien à Afficher\n")
-            return
-
-        # table can't be less width than 50 chars
-        min_width = 50
-        keys = dict_list[0].keys()
-        nb_column = len(keys)
-
-        # search for the max length of each column
-        max_widths = dict()
-        for key in keys:
-            max_widths[key] = self.get_max_width(key, dict_list)
-
-        # then calculate the new minimum width of the table
-        width_sum = 0
-        for width in max_widths.values():
-            width_sum += int(width)
-
-        # if width sum is lower than min width give extra width to each column
-        width_more = round(max(0, (min_width - width_sum))/nb_column)
-
-        widths = dict()
-        for key in keys:
-            widths[key] = max_widths[key] + width_more
-
-        # print keys line
-        for key in keys:
-            unused_width = widths[key] - len(key)
-            # fill unused width with - (header)
-            print("- " + key + " "
-                  + self.get_variable_length_string(unused_width, "-"),
-                  end='')
-
-        print()
-
-        for obj in dict_list:
-            for key in keys:
-                unused_width = widths[key] - len(str(obj[key]))
-                # fill unused width with " " (normal line)
-                print("|  " + str(obj[key]) +
-                      self.get_variable_length_string(unused_width),
-                      end='')
-            print("|")
+        self.table_renderer.render(dict_list, self.page_size,
+                                   self.ask_for_next_page)
 
-        # fill all column with "-" (table bottom)
-        for key in keys:
-            print(self.get_variable_length_string(widths[key]+3, "-"),
-                  end='')
+    def ask_for_next_page(self) -> bool:
+        """:return False if user wants to stop displaying a table"""
+        answer = self.prompt("ENTREE pour la page suivante, "
+                             "F pour finir : ")
 
-        print("\n")
+        return answer is None or answer.upper() != "F"
 
     def prompt_choice(self, options_list, question="Quel est votre choix ?")\
             -> int:
@@ -127,14 +97,16 @@ class ConsoleView(AbstractView):
 
         :return int corresponding to the chosen option in list
         """
-        print(question)
+        while True:
+            print(question)
 
-        self.display_list(options_list)
+            self.display_list(options_list)
 
-        answer = input("Tapez votre réponse: ")
-        print()
+            answer = self.prompt("Tapez votre réponse: ")
+
+            if answer is None:
+                continue
 
-        if not self.check_meta_commands(answer):
             try:
                 int_answer = int(answer)
                 if int_answer not in range(len(options_list)):
@@ -145,11 +117,20 @@ class ConsoleView(AbstractView):
                 print(f"'{answer}' n'est pas une réponse valide")
                 print("Les réponses valides sont :", end=" ")
                 print(*range(len(options_list)), sep=', ')
-                return self.prompt_choice(options_list, question)
 
-        else:
+    def prompt(self, label: str):
+        """input() acting meta-commands
+
+        :return the answer or None if it was a meta-command
+                (a meta-command may also raise AbortPrompt)"""
+        answer = input(label)
+        print()
+
+        if self.check_meta_commands(answer):
             self.act_meta_commands(answer)
-            return self.prompt_choice(options_list, question)
+            return None
+
+        return answer
 
     def prompt_action_choice(self,
                              options_list,
@@ -191,7 +172,11 @@ class ConsoleView(AbstractView):
             return False
 
     def act_meta_commands(self, answer):
-        self.meta_commands[answer]['function']()
+        meta_command = self.meta_commands[answer]
+        meta_command['function']()
+
+        if meta_command['abort']:
+            raise AbortPrompt()
 
     def display_form(self, needed_infos: tuple, return_function):
         """this method collect datas from user
@@ -226,32 +211,34 @@ class ConsoleView(AbstractView):
 
         return_function(collected_infos)
 
-    @staticmethod
-    def ask_for_str(label: str, default=None):
+    def ask_for_str(self, label: str, default=None):
         """Method to display a input to collect a string value"""
         if default is not None:
-            value = input(label
-                          + " (ENTREE pour confirmer "
-                            "la valeur par défaut qui est : "
-                          + str(default) + " ) : ")
-            if value == '':
-                value = default
+            label += " (ENTREE pour confirmer " \
+                     "la valeur par défaut qui est : " \
+                     + str(default) + " ) : "
         else:
-            value = input(label + " : ")
-        print()
+            label += " : "
+
+        value = None
+        while value is None:
+            value = self.prompt(label)
+
+        if value == '' and default is not None:
+            value = default
+
         return value
 
     def ask_for_int(self, label: str, default=None):
         """Same as ask_for_str but accepts only int values"""
+        while True:
+            value = self.ask_for_str(label, default)
 
-        value = self.ask_for_str(label, default)
-
-        try:
-            retour = int(value)
-            return retour
-        except ValueError:
-            print("Veuillez rentrer un nombre")
-            return self.ask_for_int(value, default)
+            try:
+                retour = int(value)
+                return retour
+            except ValueError:
+                print("Veuillez rentrer un nombre")
 
     def ask_for_date_list(self, label: str):
         values = []
@@ -273,45 +260,23 @@ class ConsoleView(AbstractView):
         return values
 
     def ask_for_date(self, label: str):
-        print("Écrivez la date au format JJ/MM/AA")
+        while True:
+            print("Écrivez la date au format JJ/MM/AA")
 
-        value = input(label + " : ")
-        print()
+            value = self.prompt(label + " : ")
+
+            if value is None:
+                continue
 
-        if value == '':
-            return value
+            if value == '':
+                return value
 
-        try:
-            # check that format is DD/MM/YY and return a formatted string
-            new_date = datetime.strptime(value, '%d/%m/%y')
-            return new_date
-        except ValueError:
-            print("Le format n'est pas le bon")
-            return self.ask_for_date(label)
+            try:
+                # check that format is DD/MM/YY and return a formatted string
+                new_date = datetime.strptime(value, '%d/%m/%y')
+                return new_date
+            except ValueError:
+                print("Le format n'est pas le bon")
 
     def log(self, message: str):
         print(message)
-
-    @staticmethod
-    def get_variable_length_string(length: int, string=" "):
-        """return a string of needed length, full with string parameter"""
-
-        result = string
-
-        for i in range(length):
-            result += string
-
-        return result
-
-    @staticmethod
-    def get_max_width(key, item_list):
-        """This function return the max length of values in a list of dict
-
-        :param key the key to be checked on each object
-        :param item_list the list of object
-        """
-        max_value = len(key)
-        for item in item_list:
-            max_value = max(max_value, len(str(item[key])))
-
-        return max_value
@@ -0,0 +1,92 @@
+from abc import ABC, abstractmethod
+import csv
+import html
+from Model.report import Report
+
+
+class ReportExporter(ABC):
+    """This abstract class define how a Report is written in a file,
+    rows are written while they are generated (constant memory)"""
+
+    @abstractmethod
+    def export(self, description: str, report: Report, file) -> int:
+        """write report in file
+
+        :param description: a string to introduce the report
+        :param report: a Report
+        :param file: a text file opened with newline=''
+
+        :return the number of written rows"""
+        pass
+
+    @staticmethod
+    def get_exporter(path: str):
+        """:return the ReportExporter matching the extension of path
+        or None"""
+        extension = path.rsplit('.', 1)[-1].lower()
+        exporter_class = EXPORTERS.get(extension)
+
+        return None if exporter_class is None else exporter_class()
+
+
+class CsvExporter(ReportExporter):
+    """csv with ; as delimiter (opens in a french spreadsheet),
+    description is not written"""
+
+    def export(self, description: str, report: Report, file) -> int:
+        writer = csv.writer(file, delimiter=';')
+        writer.writerow(report.get_names())
+
+        nb_rows = 0
+        for values in report.iter_values():
+            writer.writerow(values)
+            nb_rows += 1
+
+        return nb_rows
+
+
+class HtmlExporter(ReportExporter):
+    """a standalone html page, numbers are right aligned"""
+
+    HEAD = '<!DOCTYPE html>\n<html lang="fr">\n<head>\n' \
+           '<meta charset="utf-8">\n<title>{title}</title>\n' \
+           '<style>\n' \
+           'table {{border-collapse: collapse;}}\n' \
+           'th, td {{border: 1px solid #999; padding: 2px 8px;}}\n' \
+           '.number {{text-align: right;}}\n' \
+           '</style>\n</head>\n<body>\n'
+    TAIL = '</tbody>\n</table>\n</body>\n</html>\n'
+
+    def export(self, description: str, report: Report, file) -> int:
+        lines = [line for line in description.splitlines() if line]
+        title = lines[-1] if lines else ""
+
+        file.write(self.HEAD.format(title=html.escape(title)))
+        for line in lines:
+            file.write(f"<p>{html.escape(line)}</p>\n")
+
+        file.write("<table>\n<thead>\n<tr>")
+        for name in report.get_names():
+            file.write(f"<th>{html.escape(name)}</th>")
+        file.write("</tr>\n</thead>\n<tbody>\n")
+
+        # cell start tags are built once
+        starts = ['<td class="number">' if column.type in (int, float)
+                  else '<td>' for column in report.columns]
+
+        nb_rows = 0
+        for values in report.iter_values():
+            file.write("<tr>"
+                       + "".join(start + html.escape(str(value)) + "</td>"
+                                 for start, value in zip(starts, values))
+                       + "</tr>\n")
+            nb_rows += 1
+
+        file.write(self.TAIL)
+
+        return nb_rows
+
+
+# exporters by file extension
+EXPORTERS = {'csv': CsvExporter,
+             'html': HtmlExporter}
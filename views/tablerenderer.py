@@ -0,0 +1,131 @@
+from itertools import islice
+import sys
+from Model.report import Report
+
+
+class TableRenderer:
+    """Render rows (dict with the same keys) as a text table
+
+    Rows are read from any iterable (a list or a generator) and rendered
+    by chunks, each chunk being written at once. The widths of the
+    columns are computed from the first chunk (up to the maximum widths
+    of the columns of a Report), then fixed for the whole table, so
+    each row is formatted with a format string built once and all pages
+    are aligned. Longer values of the next chunks are cut.
+    With paging, a chunk is a page and next_page is called between pages.
+
+    :param output: a text file (sys.stdout by default)
+    :param min_width: the table can't be less wide than min_width chars
+    :param chunk_size: number of rows rendered at once (without paging)
+    """
+
+    def __init__(self, output=None, min_width: int = 50,
+                 chunk_size: int = 1000):
+        self.output = output
+        self.min_width = min_width
+        self.chunk_size = chunk_size
+
+    def render(self, rows, page_size: int = None, next_page=None) -> int:
+        """write rows as a table
+
+        :param rows: an iterable of dict, keys are the headers of table
+                     (a Report gives the maximum widths of its columns)
+        :param page_size: number of rows by page (None for no paging)
+        :param next_page: function called between two pages,
+                          returning False to stop the rendering
+
+        :return the number of written rows"""
+        output = self.output if self.output is not None else sys.stdout
+        max_widths = rows.get_max_widths() \
+            if isinstance(rows, Report) else None
+        rows = iter(rows)
+        chunk_size = page_size if page_size is not None else self.chunk_size
+
+        keys = None
+        widths = None
+        nb_rows = 0
+
+        chunk = list(islice(rows, chunk_size))
+
+        while chunk:
+            if keys is None:
+                keys = list(chunk[0])
+
+            values = [[str(row[key]) for key in keys] for row in chunk]
+            if widths is None:
+                widths = self.get_widths(keys, values, max_widths)
+                row_format = self.get_row_format(widths)
+
+            lines = []
+            if nb_rows == 0 or page_size is not None:
+                lines.append(self.get_header(keys, widths))
+
+            for row_values in values:
+                lines.append(row_format.format(
+                    *self.cut(row_values, widths)))
+
+            nb_rows += len(chunk)
+            chunk = list(islice(rows, chunk_size))
+
+            if page_size is not None or not chunk:
+                lines.append(self.get_bottom(widths))
+
+            output.write("\n".join(lines) + "\n")
+
+            if chunk and page_size is not None and next_page is not None:
+                output.flush()
+                if not next_page():
+                    break
+
+        if nb_rows:
+            output.write("\n")
+        else:
+            output.write("Rien à Afficher\n\n")
+
+        return nb_rows
+
+    def get_widths(self, keys: list, values: list,
+                   max_widths: list = None) -> list:
+        """:return widths of columns, large enough for keys and values
+        (but not more than max_widths), with extra width if table is too
+        narrow"""
+        widths = [len(key) for key in keys]
+        for row_values in values:
+            for column, value in enumerate(row_values):
+                if len(value) > widths[column]:
+                    widths[column] = len(value)
+
+        if max_widths is not None:
+            widths = [width if max_width is None
+                      else max(len(key), min(width, max_width))
+                      for key, width, max_width
+                      in zip(keys, widths, max_widths)]
+
+        width_more = round(max(0, self.min_width - sum(widths))
+                           / len(widths))
+
+        return [width + width_more for width in widths]
+
+    @staticmethod
+    def cut(row_values: list, widths: list) -> list:
+        """:return values, cut with … if they are longer than widths"""
+        return [value if len(value) <= width else value[:width - 1] + "…"
+                for value, width in zip(row_values, widths)]
+
+    @staticmethod
+    def get_header(keys: list, widths: list) -> str:
+        """header line, unused width filled with -"""
+        return "".join("- " + key + " " + "-" * (width - len(key) + 1)
+                       for key, width in zip(keys, widths))
+
+    @staticmethod
+    def get_row_format(widths: list) -> str:
+        """:return a format string of a row, unused width filled with " "
+        """
+        return "".join("|  {:<" + str(width + 1) + "}" for width in widths) \
+            + "|"
+
+    @staticmethod
+    def get_bottom(widths: list) -> str:
+        """table bottom line, all columns filled with -"""
+        return "".join("-" * (width + 4) for width in widths)